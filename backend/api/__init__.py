@@ -7,6 +7,7 @@ from backend.api.server import router as server_router
 from backend.api.volume import router as volume_router
 from backend.api.flavor import router as flavor_router
 from backend.api.image import router as image_router
+from backend.api.metrics import router as metrics_router
 
 api_router = APIRouter(prefix='/api')
 
@@ -17,3 +18,4 @@ api_router.include_router(server_router)
 api_router.include_router(volume_router)
 api_router.include_router(flavor_router)
 api_router.include_router(image_router)
+api_router.include_router(metrics_router)
@@ -1,19 +1,24 @@
 from typing import List
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from backend.core.dependency import get_token_or_raise
 from backend.schema.server import FlavorDto
 from backend.service.flavor import FlavorService
+from backend.core.stream import stream_json_array
 
 router = APIRouter(prefix="/flavors", tags=["flavor"])
 
 
 @router.get("/", response_model=List[FlavorDto], status_code=status.HTTP_200_OK)
-async def get_flavors(token: str = Depends(get_token_or_raise), service: FlavorService = Depends()):
+async def get_flavors(stream: bool = Query(default=False, description='페이지를 받는 대로 응답 (대용량 목록)'),
+                      token: str = Depends(get_token_or_raise), service: FlavorService = Depends()):
     """
     [API] - Get Flaovr List
+    :param stream: true인 경우, openstack에서 페이지를 받는 대로 응답 body를 내보낸다
     :param token: 인증토큰
     :return: 200 - flavor list
     :raises 401: 인증 오류
     """
+    if stream:
+        return await stream_json_array(service.stream_flavors(token))
     return await service.get_flavors(token)
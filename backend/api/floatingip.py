@@ -1,26 +1,50 @@
-from fastapi import APIRouter, Depends, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Response, status, BackgroundTasks
 from uuid import UUID
 
-from backend.core.dependency import get_token_or_raise
+from backend.core.dependency import get_token_or_raise, get_freshness
 from backend.schema.floatingip import (FloatingipCreateRequest, FloatingipUpdateRequest,
                                        FloatingipUpdatePortRequest, FloatingipQuery)
-from backend.schema.response import FloatingipResponse
+from backend.schema.response import Freshness, FloatingipResponse
 from backend.service.floatingip import FloatingipService
+from backend.util.constant import NEXT_CURSOR_HEADER_FIELD, TOTAL_COUNT_HEADER_FIELD
 
 router = APIRouter(prefix="/floatingips", tags=["floatingip"])
 
 
 @router.get("/", response_model=list[FloatingipResponse], status_code=status.HTTP_200_OK)
-async def get_floatingips(queryInput: FloatingipQuery = Depends(), token: str = Depends(get_token_or_raise),
+async def get_floatingips(response: Response, queryInput: FloatingipQuery = Depends(),
+                          token: str = Depends(get_token_or_raise),
+                          freshness: Freshness = Depends(get_freshness),
                           service: FloatingipService = Depends()):
     """
     [API] - Get Floatingip List
     :param token: 인증 토큰
-    :return: 200 - list[FloatingipResponse]
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
+    :param cursor: (optional) cursor pagination (첫 페이지는 빈 값, 다음 페이지는 X-Next-Cursor 헤더 값)
+    :return: 200 - list[FloatingipResponse] (다음 페이지가 있다면 X-Next-Cursor 헤더 포함)
+    :param include_total: (optional) exact/estimate, X-Total-Count 헤더에 전체 수 포함
+    :raises 400: 올바르지 않은 cursor
     :raises 401: 인증 오류
     """
     floatingip_list = await service.get_floatingips_by_query(queryInput)
-    return await FloatingipResponse.mapper(el=floatingip_list, token=token)
+    if queryInput.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER_FIELD] = queryInput.next_cursor
+    if queryInput.include_total:
+        response.headers[TOTAL_COUNT_HEADER_FIELD] = str(await service.count_floatingips_by_query(queryInput))
+    return await FloatingipResponse.mapper(el=floatingip_list, token=token, freshness=freshness)
+
+
+@router.head("/", status_code=status.HTTP_200_OK)
+async def count_floatingips(queryInput: FloatingipQuery = Depends(), token: str = Depends(get_token_or_raise),
+                            service: FloatingipService = Depends()):
+    """
+    [API] - Count Floatingip List (openstack 요청 없이 DB만 조회)
+    :param include_total: exact(default)/estimate
+    :return: 200 - X-Total-Count 헤더 (body 없음)
+    :raises 401: 인증 오류
+    """
+    count = await service.count_floatingips_by_query(queryInput)
+    return Response(headers={TOTAL_COUNT_HEADER_FIELD: str(count)})
 
 
 @router.post("/", response_model=FloatingipResponse, status_code=status.HTTP_201_CREATED)
@@ -41,17 +65,19 @@ async def create_floatingip(floatingipCreateRequest: FloatingipCreateRequest, to
 
 @router.get("/{floatingip_id}/", response_model=FloatingipResponse, status_code=status.HTTP_200_OK)
 async def get_floatingip_by_id(floatingip_id: UUID, token: str = Depends(get_token_or_raise),
+                               freshness: Freshness = Depends(get_freshness),
                                service: FloatingipService = Depends()):
     """
     [API] - Get Floatingip
     :param floatingip_id: id
     :param token: 인증 토큰
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
     :return: 200 - FloatingipResponse
     :raises 401: 인증 오류
     :raises 404: 해당하는 floatingip 없는 경우
     """
     floatingip = await service.get_floatingip_by_id(floatingip_id)
-    return await FloatingipResponse.mapper(el=floatingip, token=token)
+    return await FloatingipResponse.mapper(el=floatingip, token=token, freshness=freshness)
 
 
 @router.patch("/{floatingip_id}/", response_model=FloatingipResponse, status_code=status.HTTP_200_OK)
@@ -1,12 +1,15 @@
+import logging
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from backend.client.base import BaseClient
+from backend.client import keystone_client, ALL_CLIENTS
 from backend.core.db import db
 from backend.schema.oa_base import OpenstackBaseRequest
+from backend.util.breaker import CircuitState
 
 router = APIRouter(prefix="/healthcheck", tags=["healthcheck"])
+logger = logging.getLogger(__name__)
 
 
 @router.get('/')
@@ -14,10 +17,21 @@ async def health_check(session: AsyncSession = Depends(db.get_db)):
     """
     perform health check
     1. db session
-    2. openstack api
+    2. openstack component별 circuit breaker 상태 (closed가 아닌 component가 있다면 degraded)
+    3. openstack api (keystone 요청이 실패하면 degraded)
     """
     response = await session.scalar(text('SELECT SQL_NO_CACHE 1;'))
     assert response == 1
-    oa_request = OpenstackBaseRequest(url='/identity/v3')
-    await BaseClient().request_openstack('GET', oa_request)
-    return {'status': 'ok'}
+    # keystone 요청 결과가 breaker 상태를 바꾸기 전에 수집
+    circuit_breakers = {client.COMPONENT_URL: client.breaker.state.value for client in ALL_CLIENTS}
+    try:
+        oa_request = OpenstackBaseRequest(url=keystone_client.COMPONENT_URL)
+        await keystone_client.request_openstack('GET', oa_request)
+        keystone = 'ok'
+    except Exception as e:
+        logger.warning(f'healthcheck keystone request failed : {e!r}')
+        keystone = 'error'
+    healthy = keystone == 'ok' and all(state == CircuitState.CLOSED for state in circuit_breakers.values())
+    return {'status': 'ok' if healthy else 'degraded',
+            'keystone': keystone,
+            'circuit_breakers': circuit_breakers}
@@ -1,20 +1,25 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from backend.core.dependency import get_token_or_raise
 from backend.schema.server import ImageDto
 from backend.service.image import ImageService
+from backend.core.stream import stream_json_array
 
 router = APIRouter(prefix="/images", tags=["image"])
 
 
 @router.get("/", response_model=List[ImageDto], status_code=status.HTTP_200_OK)
-async def get_images(token: str = Depends(get_token_or_raise), service: ImageService = Depends()):
+async def get_images(stream: bool = Query(default=False, description='페이지를 받는 대로 응답 (대용량 목록)'),
+                     token: str = Depends(get_token_or_raise), service: ImageService = Depends()):
     """
     [API] - Get Image List
+    :param stream: true인 경우, openstack에서 페이지를 받는 대로 응답 body를 내보낸다
     :param token: 인증토큰
     :return: 200 - image list
     :raises 401: 인증 오류
     """
+    if stream:
+        return await stream_json_array(service.stream_images(token))
     return await service.get_images(token)
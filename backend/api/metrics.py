@@ -0,0 +1,18 @@
+from typing import Dict
+from fastapi import APIRouter, Depends, status
+
+from backend.core.dependency import get_token_or_raise
+from backend.core.metrics import metrics
+
+# 내부 상태(openstack component 주소 등)가 노출되지 않도록 인증된 요청만 허용
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(get_token_or_raise)])
+
+
+@router.get('/', status_code=status.HTTP_200_OK)
+async def get_metrics() -> Dict[str, float]:
+    """
+    [API] - Get Metrics
+    :return: 200 - 프로세스 내부 counter/gauge (ex. openstack 요청 single-flight hit/miss)
+    :raises 401: 인증 오류
+    """
+    return metrics.snapshot()
@@ -1,32 +1,55 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, status, Depends, BackgroundTasks
+from fastapi import APIRouter, Response, status, Depends
 
-from backend.core.dependency import get_token_or_raise
+from backend.core.dependency import get_token_or_raise, get_freshness
 from backend.schema.server import (ServerQuery, ServerCreateRequest, FlavorDto, ServerUpdateInfoRequest,
                                    ServerPowerUpdateRequest, ServerVolumeUpdateRequest)
-from backend.schema.response import ServerResponse
+from backend.schema.response import Freshness, ServerResponse
 from backend.service.server import ServerService
+from backend.util.constant import NEXT_CURSOR_HEADER_FIELD, TOTAL_COUNT_HEADER_FIELD
 
 router = APIRouter(prefix="/servers", tags=["server"])
 
 
 @router.get("/", response_model=List[ServerResponse], status_code=status.HTTP_200_OK)
-async def get_servers(queryInput: ServerQuery = Depends(), token: str = Depends(get_token_or_raise),
+async def get_servers(response: Response, queryInput: ServerQuery = Depends(),
+                      token: str = Depends(get_token_or_raise),
+                      freshness: Freshness = Depends(get_freshness),
                       service: ServerService = Depends()):
     """
     [API] - Get Server List
     :param token 인증 토큰
-    :return: 200 - list[ServerResponse]
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
+    :param cursor: (optional) cursor pagination (첫 페이지는 빈 값, 다음 페이지는 X-Next-Cursor 헤더 값)
+    :return: 200 - list[ServerResponse] (다음 페이지가 있다면 X-Next-Cursor 헤더 포함)
+    :param include_total: (optional) exact/estimate, X-Total-Count 헤더에 전체 수 포함
+    :raises 400: 올바르지 않은 cursor
     :raises 401: 인증 오류
     """
     server_list = await service.get_servers_by_query(queryInput)
-    return await ServerResponse.mapper(el=server_list, token=token)
+    if queryInput.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER_FIELD] = queryInput.next_cursor
+    if queryInput.include_total:
+        response.headers[TOTAL_COUNT_HEADER_FIELD] = str(await service.count_servers_by_query(queryInput))
+    return await ServerResponse.mapper(el=server_list, token=token, freshness=freshness)
+
+
+@router.head("/", status_code=status.HTTP_200_OK)
+async def count_servers(queryInput: ServerQuery = Depends(), token: str = Depends(get_token_or_raise),
+                        service: ServerService = Depends()):
+    """
+    [API] - Count Server List (openstack 요청 없이 DB만 조회)
+    :param include_total: exact(default)/estimate
+    :return: 200 - X-Total-Count 헤더 (body 없음)
+    :raises 401: 인증 오류
+    """
+    count = await service.count_servers_by_query(queryInput)
+    return Response(headers={TOTAL_COUNT_HEADER_FIELD: str(count)})
 
 
 @router.post("/", response_model=ServerResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_server_with_root_volume(serverCreateRequest: ServerCreateRequest,
-                                         bg_task: BackgroundTasks,
                                          token: str = Depends(get_token_or_raise),
                                          service: ServerService = Depends()):
     """
@@ -39,24 +62,25 @@ async def create_server_with_root_volume(serverCreateRequest: ServerCreateReques
     :raises 404: 해당 image/flavor 없음
     :raises 409: 서버/볼륨 이름 이미 존재, quota 부족, 볼륨 크기~이미지 크기 제약
     """
-    new_server = await service.create_server_with_root_volume(serverCreateRequest=serverCreateRequest, token=token,
-                                                              bg_task=bg_task)
+    new_server = await service.create_server_with_root_volume(serverCreateRequest=serverCreateRequest, token=token)
     return await ServerResponse.mapper(el=new_server, token=token)
 
 
 @router.get("/{id}/", response_model=ServerResponse, status_code=status.HTTP_200_OK)
 async def get_server_by_id(id: UUID, token: str = Depends(get_token_or_raise),
+                           freshness: Freshness = Depends(get_freshness),
                            service: ServerService = Depends()):
     """
     [API] - Get Server
     :param id: id
     :param token: 인증 토큰
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
     :return: 200 - list[ServerResponse]
     :raises 401: 인증 오류
     :raises 404: not found
     """
     server = await service.get_server_by_id(id)
-    return await ServerResponse.mapper(el=server, token=token)
+    return await ServerResponse.mapper(el=server, token=token, freshness=freshness)
 
 
 @router.patch("/{id}/", response_model=ServerResponse, status_code=status.HTTP_200_OK)
@@ -95,7 +119,6 @@ async def delete_server_by_id(id: UUID, token: str = Depends(get_token_or_raise)
 
 @router.post("/{id}/volumes/", status_code=status.HTTP_202_ACCEPTED)
 async def attach_volume_by_id(id: UUID, serverVolumeUpdateRequest: ServerVolumeUpdateRequest,
-                              bg_task: BackgroundTasks,
                               token: str = Depends(get_token_or_raise),
                               service: ServerService = Depends()):
     """
@@ -110,13 +133,12 @@ async def attach_volume_by_id(id: UUID, serverVolumeUpdateRequest: ServerVolumeU
     :raises 409 : 이미 해당 볼륨은 다른 서버와 연결되어 있음 / 볼륨(available)이나 서버의 상태 제약
     """
     server = await service.attach_volume_by_id(id=id, serverVolumeUpdateRequest=serverVolumeUpdateRequest,
-                                               bg_task=bg_task, token=token)
+                                               token=token)
     return await ServerResponse.mapper(el=server, token=token)
 
 
 @router.delete("/{id}/volumes/", status_code=status.HTTP_202_ACCEPTED)
 async def detach_volume_by_id(id: UUID, serverVolumeUpdateRequest: ServerVolumeUpdateRequest,
-                              bg_task: BackgroundTasks,
                               token: str = Depends(get_token_or_raise),
                               service: ServerService = Depends()):
     """
@@ -131,7 +153,7 @@ async def detach_volume_by_id(id: UUID, serverVolumeUpdateRequest: ServerVolumeU
     :raises: 409: 해당 볼륨이 서버와 연결되어 있지 않음 / 볼륨(in-use)이나 서버의 상태 제약
     """
     server = await service.detach_volume_by_id(id=id, serverVolumeUpdateRequest=serverVolumeUpdateRequest,
-                                               bg_task=bg_task, token=token)
+                                               token=token)
     return await ServerResponse.mapper(el=server, token=token)
 
 
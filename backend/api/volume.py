@@ -1,32 +1,57 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, status, Depends, BackgroundTasks
+from fastapi import APIRouter, Response, status, Depends
 
-from backend.core.dependency import get_token_or_raise
-from backend.schema.response import VolumeResponse
+from backend.core.dependency import get_token_or_raise, get_freshness
+from backend.schema.response import Freshness, VolumeResponse
 from backend.schema.volume import VolumeCreateRequest, VolumeQuery, VolumeUpdateInfoRequest, VolumeSizeUpdateRequest
 from backend.service.volume import VolumeService
+from backend.util.constant import NEXT_CURSOR_HEADER_FIELD, TOTAL_COUNT_HEADER_FIELD
 
 router = APIRouter(prefix="/volumes", tags=["volume"])
 
 
 @router.get("/", response_model=List[VolumeResponse], status_code=status.HTTP_200_OK)
-async def get_volumes(queryInput: VolumeQuery = Depends(), token: str = Depends(get_token_or_raise),
+async def get_volumes(response: Response, queryInput: VolumeQuery = Depends(),
+                      token: str = Depends(get_token_or_raise),
+                      freshness: Freshness = Depends(get_freshness),
                       service: VolumeService = Depends()):
     """
     [API] - Get Volume List
     :param token: 인증 토큰
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
     :param sort_by: created_at/ name
     :param order_by: asc(default)/desc
     :param page: int (default : 1)
     :param per_page: int (default : 10)
+    :param cursor: (optional) cursor pagination (첫 페이지는 빈 값, 다음 페이지는 X-Next-Cursor 헤더 값)
     :param volume_id: [eq/in/not]:[value]
     :param name: [eq/like]:[value]
-    :return: 200 - List[VolumeResponse]
+    :param created_at: [eq/gt/lt/gte/lte]:[ISO 8601] (';'로 범위 지정)
+    :return: 200 - List[VolumeResponse] (다음 페이지가 있다면 X-Next-Cursor 헤더 포함)
+    :param include_total: (optional) exact/estimate, X-Total-Count 헤더에 전체 수 포함
+    :raises 400: 올바르지 않은 cursor
     :raises 401: 인증 오류
     """
     volume_list = await service.get_volumes_by_query(queryInput)
-    return await VolumeResponse.mapper(el=volume_list, token=token)
+    if queryInput.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER_FIELD] = queryInput.next_cursor
+    if queryInput.include_total:
+        response.headers[TOTAL_COUNT_HEADER_FIELD] = str(await service.count_volumes_by_query(queryInput))
+    return await VolumeResponse.mapper(el=volume_list, token=token, freshness=freshness)
+
+
+@router.head("/", status_code=status.HTTP_200_OK)
+async def count_volumes(queryInput: VolumeQuery = Depends(), token: str = Depends(get_token_or_raise),
+                        service: VolumeService = Depends()):
+    """
+    [API] - Count Volume List (openstack 요청 없이 DB만 조회)
+    :param include_total: exact(default)/estimate
+    :return: 200 - X-Total-Count 헤더 (body 없음)
+    :raises 401: 인증 오류
+    """
+    count = await service.count_volumes_by_query(queryInput)
+    return Response(headers={TOTAL_COUNT_HEADER_FIELD: str(count)})
 
 
 @router.post("/", response_model=VolumeResponse, status_code=status.HTTP_202_ACCEPTED)
@@ -47,17 +72,19 @@ async def create_volume(volumeCreateRequest: VolumeCreateRequest, token: str = D
 
 @router.get("/{id}/", response_model=VolumeResponse, status_code=status.HTTP_200_OK)
 async def get_volume_by_id(id: UUID, token: str = Depends(get_token_or_raise),
+                           freshness: Freshness = Depends(get_freshness),
                            service: VolumeService = Depends()):
     """
     [API] - Get Volume
     :param id: id
     :param token: 인증 토큰
+    :param freshness: db(DB에 기록된 상태) / live(openstack 조회) (기본 RESPONSE_DEFAULT_FRESHNESS)
     :return: 200 - VolumeResponse
     :raises 401: 인증 오류
     :raises 404: 해당하는 volume 없는 경우
     """
     volume = await service.get_volume_by_id(id=id)
-    return await VolumeResponse.mapper(el=volume, token=token)
+    return await VolumeResponse.mapper(el=volume, token=token, freshness=freshness)
 
 
 @router.patch("/{id}/", response_model=VolumeResponse, status_code=status.HTTP_200_OK)
@@ -95,7 +122,7 @@ async def delete_volume_by_id(id: UUID, token: str = Depends(get_token_or_raise)
 
 
 @router.patch("/{id}/size/", response_model=VolumeResponse, status_code=status.HTTP_202_ACCEPTED)
-async def extend_volume_size_by_id(id: UUID, volumeSizeUpdateRequest: VolumeSizeUpdateRequest, bg_task: BackgroundTasks,
+async def extend_volume_size_by_id(id: UUID, volumeSizeUpdateRequest: VolumeSizeUpdateRequest,
                                    token: str = Depends(get_token_or_raise), service: VolumeService = Depends()):
     """
     [API] - Upgrade Volume Size
@@ -107,6 +134,5 @@ async def extend_volume_size_by_id(id: UUID, volumeSizeUpdateRequest: VolumeSize
     :raises 404: 해당 volume 없는 경우
     :raises 409: 현재보다 작거나 같은 크기로 변경하는 경우, 볼륨 상태가 available 아닌 경우, quota 부족한 경우
     """
-    volume = await service.extend_volume_size_by_id(id=id, token=token, volumeSizeUpdateRequest=volumeSizeUpdateRequest,
-                                                    bg_task=bg_task)
+    volume = await service.extend_volume_size_by_id(id=id, token=token, volumeSizeUpdateRequest=volumeSizeUpdateRequest)
     return await VolumeResponse.mapper(el=volume, token=token)
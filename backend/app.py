@@ -4,18 +4,33 @@ import yaml
 
 from backend.core.config import get_setting
 from backend.core.exception_handler import register_error_handlers
-from backend.core.db import Base, db
+from backend.core.middleware import register_middlewares
+from backend.core.db import db
+from backend.core.migration import schema_migrator
 from backend.api import api_router
+from backend.client import close_clients
+from backend.core.watcher import status_watcher
+from backend.service.reconcile import reconcile_runner
+from backend.service.sync import sync_runner
+from backend.service.task import task_worker_pool
+from backend.util.codec import DefaultJSONResponse
 
 SETTINGS = get_setting()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with db.engine.connect() as conn:
-        # await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+    await schema_migrator.prepare(db.engine, SETTINGS.DB_SCHEMA_MODE)
+    status_watcher.start()
+    task_worker_pool.start()
+    sync_runner.start()
+    reconcile_runner.start()
     yield
+    await reconcile_runner.stop()
+    await sync_runner.stop()
+    await task_worker_pool.stop()
+    await status_watcher.stop()
+    await close_clients()
     await db.disconnect()
 
 
@@ -24,13 +39,14 @@ def create_app_with_db(db_url: str):
     return fastapi app with db
     - db_url: url of database
     """
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=DefaultJSONResponse)
     db.init_db(db_url)
     app.include_router(
         api_router,
         prefix=""
     )
     register_error_handlers(app)
+    register_middlewares(app)
     return app
 
 
@@ -9,3 +9,12 @@ nova_client = NovaClient()
 glance_client = GlanceClient()
 keystone_client = KeystoneClient()
 cinder_client = CinderClient()
+ALL_CLIENTS = (neutron_client, nova_client, glance_client, keystone_client, cinder_client)
+
+
+async def close_clients() -> None:
+    """
+    모든 openstack client의 session(connection pool)을 종료한다 (app 종료시 호출)
+    """
+    for client in ALL_CLIENTS:
+        await client.close()
@@ -1,10 +1,21 @@
+import asyncio
 import logging
-from aiohttp import ClientSession
-from typing import Optional
+from aiohttp import ClientError, ClientSession, TCPConnector
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+from yarl import URL
 
-from backend.util.constant import ERR_TOKEN_INVALID
+from backend.client.cache import request_cache
+from backend.client.deadline import get_remaining
+from backend.client.priority import request_lane
+from backend.util.breaker import CircuitBreaker, CircuitState
+from backend.util.bulkhead import Bulkhead, Lane
+from backend.util.constant import ERR_TOKEN_INVALID, ERR_OPENSTACK_UNAVAILABLE, ERR_OPENSTACK_BUSY, OA_TOKEN_HEADER_FIELD
 from backend.core.config import get_setting
-from backend.core.exception import OpenstackClientException, ApiServerException
+from backend.core.exception import OpenstackClientException, ApiServerException, OpenstackUnavailableException
+from backend.core.metrics import metrics
 from backend.schema.oa_base import OpenstackBaseResponse, OpenstackBaseRequest
 
 SETTINGS = get_setting()
@@ -22,29 +33,256 @@ class BaseClient:
         - component_url : 오픈스택 컴포넌트의 url 
         """
         self.COMPONENT_URL = component_url
+        self.__sessions: Dict[str, ClientSession] = {}  # base url별 session (connection pool)
+        self.__in_flight: Dict[Tuple, asyncio.Task] = {}  # 진행중인 GET 요청 (single-flight)
+        self.breaker = CircuitBreaker(  # component 장애시 요청 차단
+            failure_rate=SETTINGS.CIRCUIT_BREAKER_FAILURE_RATE,
+            minimum_calls=SETTINGS.CIRCUIT_BREAKER_MINIMUM_CALLS,
+            window_size=SETTINGS.CIRCUIT_BREAKER_WINDOW_SIZE,
+            open_seconds=SETTINGS.CIRCUIT_BREAKER_OPEN_SECONDS,
+            half_open_calls=SETTINGS.CIRCUIT_BREAKER_HALF_OPEN_CALLS
+        )
+        self.bulkhead = Bulkhead(  # component당 동시 요청 수 제한 (우선순위별 대기열)
+            limit=SETTINGS.OPENSTACK_BULKHEAD_LIMIT,
+            max_queue={Lane.INTERACTIVE: SETTINGS.OPENSTACK_BULKHEAD_MAX_QUEUE_INTERACTIVE,
+                       Lane.BACKGROUND: SETTINGS.OPENSTACK_BULKHEAD_MAX_QUEUE_BACKGROUND},
+            on_queue_change=lambda lane, depth: metrics.set('openstack_bulkhead_queue_depth', depth,
+                                                            component=self.COMPONENT_URL, lane=lane.value)
+        )
+
+    def get_session(self, port: Optional[int] = None) -> ClientSession:
+        """
+        해당 port의 base url로 연결되는 session을 리턴한다
+        session이 없거나 종료된 경우에만 새로 생성하여, 이후 요청에서는 connection(keep-alive)을 재사용한다
+        """
+        base_url = self.get_base_url(port)
+        session = self.__sessions.get(base_url)
+        if session is None or session.closed:
+            connector = TCPConnector(
+                limit=SETTINGS.OPENSTACK_POOL_SIZE,
+                limit_per_host=SETTINGS.OPENSTACK_POOL_SIZE_PER_HOST,
+                keepalive_timeout=SETTINGS.OPENSTACK_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=SETTINGS.OPENSTACK_DNS_CACHE_TTL
+            )
+            session = ClientSession(base_url=base_url, connector=connector)
+            self.__sessions[base_url] = session
+        return session
+
+    @staticmethod
+    def get_base_url(port: Optional[int] = None) -> str:
+        return SETTINGS.OPENSTACK_ROOT_URL if not port else str(URL(SETTINGS.OPENSTACK_ROOT_URL).with_port(port))
+
+    async def close(self) -> None:
+        """
+        생성된 모든 session(connection pool)을 종료한다
+        """
+        for session in self.__sessions.values():
+            await session.close()
+        self.__sessions.clear()
 
     async def request_openstack(self, method: str, request: OpenstackBaseRequest,
                                 port: Optional[int] = None) -> OpenstackBaseResponse:
         """
         request를 실행하고 결과를 mapping하여 리턴한다
         만약 2XX 응답코드가 아닌 경우, OpenstackClientException을 발생시킨다
-        이후 client session을 종료한다
-        """
-        async with ClientSession(
-                base_url=SETTINGS.OPENSTACK_ROOT_URL if not port else f'{SETTINGS.OPENSTACK_ROOT_URL}:{port}') as session:
-            async with session.request(method, request.url, headers=request.headers, data=request.data) as resp:
-                oa_response = await OpenstackBaseResponse.mapper(resp)
-                logger.info(
-                    f'({oa_response.status}) URL:{request.url}, '
-                    f'DATA:{request.data if request.data else ""},'
-                    f'HEADERS:{request.headers if request.headers else ""},'
-                    f'RESPONSE:{oa_response.data}')
-                if oa_response.status < 200 or oa_response.status >= 300:
-                    if oa_response.status == 401:
-                        # 토큰은 있지만, openstack에서 401 응답한 경우
-                        raise ApiServerException(
-                            status=401,
-                            message=ERR_TOKEN_INVALID
-                        )
-                    raise OpenstackClientException(oa_response)
+        사용자 요청 처리 중(request cache가 있는 경우)에는 같은 GET 요청의 성공 응답을 재사용하고,
+        자원을 변경하는 요청을 보내면 해당 자원의 cache를 제거한다
+        동시에 진행중인 같은 GET 요청은 하나의 요청으로 합친다 (single-flight)
+        :raises asyncio.TimeoutError: 요청 timeout 혹은 사용자 요청의 deadline 초과 (504 응답)
+        :raises OpenstackUnavailableException: component의 circuit breaker가 열린 경우 (503 응답)
+        """
+        cache = request_cache.get()
+        url = f'{self.get_base_url(port)}{request.url}'
+        token = (request.headers or {}).get(OA_TOKEN_HEADER_FIELD, '')
+        if cache is not None and method == 'GET' and (cached_response := cache.get(method, url, token)):
+            return cached_response
+        if cache is not None and method != 'GET':
+            cache.invalidate(url)
+        if method == 'GET':
+            oa_response = await self.send_single_flight(url, request, port)
+        else:
+            oa_response = await self.send_with_retry(method, request, port)
+        if oa_response.status < 200 or oa_response.status >= 300:
+            if oa_response.status == 401:
+                # 토큰은 있지만, openstack에서 401 응답한 경우
+                raise ApiServerException(
+                    status=401,
+                    message=ERR_TOKEN_INVALID
+                )
+            raise OpenstackClientException(oa_response)
+        if cache is not None and method == 'GET':
+            cache.set(method, url, token, oa_response)
+        return oa_response
+
+    async def send_single_flight(self, url: str, request: OpenstackBaseRequest,
+                                 port: Optional[int] = None) -> OpenstackBaseResponse:
+        """
+        동시에 진행중인 같은 GET(url, headers(token 포함))이 있다면 새로 보내지 않고 그 응답을 함께 사용한다
+        요청은 별도의 task로 보내므로, 먼저 요청한 쪽이 취소되어도 함께 기다리던 쪽은 응답을 받는다
+        """
+        key = (url, tuple(sorted((request.headers or {}).items())))
+        in_flight = self.__in_flight.get(key)
+        if in_flight is not None:
+            metrics.increment('openstack_singleflight_hits_total', component=self.COMPONENT_URL)
+            return await asyncio.wait_for(asyncio.shield(in_flight), get_remaining())
+        metrics.increment('openstack_singleflight_misses_total', component=self.COMPONENT_URL)
+        in_flight = asyncio.ensure_future(self.send_with_retry('GET', request, port))
+        self.__in_flight[key] = in_flight
+
+        def on_done(task: asyncio.Task) -> None:
+            if self.__in_flight.get(key) is task:
+                del self.__in_flight[key]
+            if not task.cancelled():
+                task.exception()  # 기다리는 쪽이 모두 취소된 경우에도 exception을 회수
+
+        in_flight.add_done_callback(on_done)
+        return await asyncio.shield(in_flight)
+
+    async def send_with_retry(self, method: str, request: OpenstackBaseRequest,
+                              port: Optional[int] = None) -> OpenstackBaseResponse:
+        """
+        요청 1회마다 OPENSTACK_REQUEST_TIMEOUT(사용자 요청의 남은 deadline이 더 짧다면 남은 시간)을 적용하여 보내고,
+        일시적인 오류(연결 오류, timeout, OPENSTACK_RETRY_STATUSES 응답)는 method별 재시도 정책에 따라 재시도한다
+        429, 503 응답의 Retry-After는 재시도 간격으로 사용하며, 다음 시도가 deadline을 넘긴다면 재시도하지 않는다
+        연결 오류, OPENSTACK_REQUEST_TIMEOUT 전체를 기다린 timeout, 5XX 응답은 circuit breaker에 실패로 기록하고,
+        breaker가 열린 동안에는 요청을 보내지 않는다 (취소되거나 deadline으로 짧아진 timeout은 기록하지 않음)
+        요청 1회마다 component의 동시 요청 권한(bulkhead)을 얻어서 보내고, 재시도 대기 중에는 반환한다
+        :return: 마지막 응답 (재시도를 모두 실패한 경우 마지막 오류 응답)
+        :raises asyncio.TimeoutError: 마지막 시도가 timeout 혹은 deadline 초과
+        :raises ClientError: 마지막 시도가 연결 오류
+        :raises OpenstackUnavailableException: circuit breaker가 열렸거나, 동시 요청 대기열이 가득 찬 경우
+        """
+        policy = SETTINGS.OPENSTACK_RETRY_POLICIES.get(method)
+        max_attempts = SETTINGS.OPENSTACK_RETRY_MAX_ATTEMPTS if policy is not None else 1
+        attempt = 0
+        while True:
+            timeout = get_remaining(SETTINGS.OPENSTACK_REQUEST_TIMEOUT or None)
+            if timeout is not None and timeout <= 0:
+                metrics.increment('openstack_deadline_exceeded_total', component=self.COMPONENT_URL)
+                raise asyncio.TimeoutError()
+            oa_response, error = None, None
+            if self.breaker.state == CircuitState.OPEN:
+                self.reject_by_breaker()
+            await self.acquire_bulkhead()
+            try:
+                timeout = get_remaining(SETTINGS.OPENSTACK_REQUEST_TIMEOUT or None)  # 대기한 시간 제외
+                if timeout is not None and timeout <= 0:
+                    metrics.increment('openstack_deadline_exceeded_total', component=self.COMPONENT_URL)
+                    raise asyncio.TimeoutError()
+                if not self.breaker.allow():
+                    self.reject_by_breaker()
+                success = None  # breaker에 기록할 성공 여부 (None : 기록하지 않음)
+                try:
+                    oa_response = await asyncio.wait_for(self.send_request(method, request, port), timeout)
+                    success = oa_response.status < 500
+                except asyncio.TimeoutError as e:
+                    metrics.increment('openstack_timeouts_total', component=self.COMPONENT_URL)
+                    error = e
+                    if SETTINGS.OPENSTACK_REQUEST_TIMEOUT and timeout >= SETTINGS.OPENSTACK_REQUEST_TIMEOUT:
+                        success = False
+                except ClientError as e:
+                    error = e
+                    success = False
+                finally:
+                    # 연결 오류, 요청 timeout, 5XX 응답만 component 장애로 기록
+                    if success is None:
+                        self.breaker.discard()
+                    else:
+                        self.breaker.record(success)
+            finally:
+                self.bulkhead.release()
+            if oa_response is not None and oa_response.status not in SETTINGS.OPENSTACK_RETRY_STATUSES:
+                return oa_response
+            attempt += 1
+            interval = policy.get_interval(attempt - 1) if policy is not None else 0
+            if oa_response is not None and oa_response.status in (429, 503):
+                interval = self.get_retry_after(oa_response.headers) or interval
+            remaining = get_remaining()
+            if attempt >= max_attempts or (remaining is not None and interval >= remaining):
+                if error is not None:
+                    raise error
                 return oa_response
+            metrics.increment('openstack_retries_total', component=self.COMPONENT_URL, method=method)
+            logger.warning(f'retry {method} {request.url} after {interval:.2f}s (attempt: {attempt}) : '
+                           f'{oa_response.status if oa_response is not None else repr(error)}')
+            await asyncio.sleep(interval)
+
+    def reject_by_breaker(self) -> None:
+        metrics.increment('openstack_circuit_rejected_total', component=self.COMPONENT_URL)
+        raise OpenstackUnavailableException(message=ERR_OPENSTACK_UNAVAILABLE,
+                                            retry_after=self.breaker.get_retry_after())
+
+    async def acquire_bulkhead(self) -> None:
+        """
+        현재 작업의 우선순위(lane)로 component의 동시 요청 권한을 얻는다 (대기 시간은 사용자 요청의 deadline 이내)
+        대기열 길이와 대기 시간은 metrics로 기록한다
+        :raises OpenstackUnavailableException: 해당 lane의 대기열이 가득 찬 경우 (503, load shedding)
+        :raises asyncio.TimeoutError: 대기 중 deadline 초과
+        """
+        lane = request_lane.get()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        acquired = await asyncio.wait_for(self.bulkhead.acquire(lane), get_remaining())
+        if not acquired:
+            metrics.increment('openstack_bulkhead_rejected_total', component=self.COMPONENT_URL, lane=lane.value)
+            raise OpenstackUnavailableException(message=ERR_OPENSTACK_BUSY,
+                                                retry_after=SETTINGS.OPENSTACK_BULKHEAD_RETRY_AFTER)
+        metrics.increment('openstack_bulkhead_acquired_total', component=self.COMPONENT_URL, lane=lane.value)
+        metrics.increment('openstack_bulkhead_wait_seconds_total', loop.time() - start,
+                          component=self.COMPONENT_URL, lane=lane.value)
+
+    @staticmethod
+    def get_retry_after(headers: Optional[dict]) -> Optional[float]:
+        """
+        응답 헤더의 Retry-After(초 혹은 HTTP-date)를 파싱한다
+        :return: 재시도까지 기다려야 하는 시간(초) (없거나 올바르지 않은 경우 None)
+        """
+        value = next((value for key, value in (headers or {}).items() if key.lower() == 'retry-after'), None)
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def send_request(self, method: str, request: OpenstackBaseRequest,
+                           port: Optional[int] = None) -> OpenstackBaseResponse:
+        """
+        session(connection pool)을 이용하여 openstack에 request를 보내고 응답을 mapping하여 리턴한다
+        session은 종료하지 않고 재사용하며, app 종료시 close를 통해 정리한다
+        """
+        session = self.get_session(port)
+        async with session.request(method, request.url, headers=request.headers, data=request.data) as resp:
+            oa_response = await OpenstackBaseResponse.mapper(resp)
+        logger.info(
+            f'({oa_response.status}) URL:{request.url}, '
+            f'DATA:{request.data if request.data else ""},'
+            f'HEADERS:{request.headers if request.headers else ""},'
+            f'RESPONSE:{oa_response.data}')
+        return oa_response
+
+    @staticmethod
+    def get_next_marker(links: Optional[List[dict]]) -> Optional[str]:
+        """
+        openstack list 응답의 links(servers_links, volumes_links 등) 중 rel=next인 링크에서 다음 페이지의 marker를 추출한다
+        :return: marker (다음 페이지가 없다면 None)
+        """
+        for link in links or []:
+            if link.get('rel') == 'next':
+                return BaseClient.get_marker(link.get('href', ''))
+        return None
+
+    @staticmethod
+    def get_marker(url: Optional[str]) -> Optional[str]:
+        """
+        다음 페이지 url(ex. glance의 next)의 query에서 marker를 추출한다
+        """
+        marker = parse_qs(urlparse(url or '').query).get('marker')
+        return marker[0] if marker else None
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+from uuid import UUID
+
+from backend.schema.oa_base import OpenstackBaseResponse
+
+
+class RequestCache:
+    """
+    하나의 사용자 요청 동안만 유지되는 openstack GET 응답 cache
+
+    key : (method, url, token)
+    - 같은 요청 안에서 같은 GET을 다시 호출하면 openstack에 요청하지 않고 저장된 응답을 리턴한다
+    - 자원을 변경하는 요청(POST, PUT, DELETE 등)을 보내면 해당 자원과 목록의 응답을 cache에서 제거한다
+    """
+
+    def __init__(self) -> None:
+        self.__responses: Dict[Tuple[str, str, str], OpenstackBaseResponse] = {}
+
+    def get(self, method: str, url: str, token: str) -> Optional[OpenstackBaseResponse]:
+        return self.__responses.get((method, url, token))
+
+    def set(self, method: str, url: str, token: str, response: OpenstackBaseResponse) -> None:
+        self.__responses[(method, url, token)] = response
+
+    def invalidate(self, url: str) -> None:
+        """
+        url의 자원을 변경한 경우, 해당 자원(하위 자원 포함)과 상위 자원, 상위 목록의 GET 응답을 제거한다
+        (하위 자원을 변경하면 상위 자원의 응답도 바뀜 ex. 볼륨 연결 -> 서버의 volumes_attached)
+        ex) POST /volumes/{id}/action -> /volumes/{id}, /volumes/{id}/..., /volumes, /volumes/detail 제거
+        ex) POST /servers/{id}/os-volume_attachments -> /servers/{id}/os-volume_attachments/..., /servers/{id},
+            /servers/detail 등 제거
+        """
+        resource = urlsplit(url).path.rstrip('/')
+        if resource.endswith('/action'):  # action은 상위 자원을 변경
+            resource = resource[:-len('/action')]
+        # 상위 경로 중 자원(id로 끝나는 경로)과 목록(id가 아닌 경로)
+        segments = resource.split('/')
+        ancestors = set()
+        for i in range(1, len(segments) + 1):
+            ancestor = '/'.join(segments[:i])
+            if is_id(segments[i - 1]):
+                ancestors.add(ancestor)
+            else:
+                ancestors.update((ancestor, f'{ancestor}/detail'))
+        for key in list(self.__responses):
+            path = urlsplit(key[1]).path.rstrip('/')
+            if path == resource or path.startswith(f'{resource}/') or path in ancestors:
+                del self.__responses[key]
+
+    def __len__(self) -> int:
+        return len(self.__responses)
+
+
+def is_id(segment: str) -> bool:
+    """
+    url path의 segment가 자원 id(uuid, 숫자)인지 여부
+    """
+    if segment.isdigit():
+        return True
+    try:
+        UUID(segment)
+        return True
+    except ValueError:
+        return False
+
+
+# 현재 사용자 요청의 cache (요청 밖(worker, watcher 등)에서는 None -> cache 사용 안함)
+request_cache: ContextVar[Optional[RequestCache]] = ContextVar('request_cache', default=None)
+
+
+@contextmanager
+def request_cache_scope() -> Iterator[RequestCache]:
+    """
+    with 블록 동안 사용할 새로운 request cache를 설정한다
+    """
+    cache = RequestCache()
+    token = request_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        request_cache.reset(token)
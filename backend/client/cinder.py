@@ -1,3 +1,5 @@
+from typing import List, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
 from backend.client.base import BaseClient
@@ -49,6 +51,47 @@ class CinderClient(BaseClient):
 
         return VolumeDto.deserialize(oa_response)
 
+    async def list_volumes_with_details(self, token: str, ids: Optional[List[UUID]] = None,
+                                        filters: Optional[dict] = None,
+                                        max_pages: Optional[int] = None) -> List[VolumeDto]:
+        """
+        - [GET] : /v3/{project_id}/volumes/detail
+
+        - 200 : list of volume details
+
+        cinder는 여러 id로 필터링하는 기능을 제공하지 않으므로, 응답에서 해당 id의 볼륨만 골라낸다
+        요청한 id를 모두 찾았거나, 다음 페이지(volumes_links)가 없거나, max_pages개의 페이지를 받을 때까지 페이지를 따라간다
+        :param ids: (optional) 조회할 volume id list (None이면 전체)
+        :param filters: (optional) cinder list api의 query parameter (ex. {'status': 'available'})
+        :param max_pages: (optional) 최대로 요청할 페이지 수 (None이면 제한 없음)
+        :return: List[VolumeDto] (openstack에 존재하지 않는 볼륨은 포함되지 않음,
+            max_pages로 중단한 경우 찾지 못한 볼륨이 삭제되었는지는 알 수 없음)
+        """
+        if ids is not None and not ids:
+            return []
+        remain_ids = set(ids) if ids is not None else None
+        volume_list = []
+        query = dict(filters) if filters else {}
+        pages = 0
+        while True:
+            oa_request = OpenstackBaseRequest(
+                url=f'{self.COMPONENT_URL}/volumes/detail' + (f'?{urlencode(query)}' if query else ''),
+                headers={OA_TOKEN_HEADER_FIELD: token})
+            oa_response = await self.request_openstack('GET', oa_request)
+            pages += 1
+            for volume_response in oa_response.body.get('volumes', []):
+                # 요청하지 않은 볼륨은 dto로 변환하지 않는다
+                volume_id = UUID(volume_response['id'])
+                if remain_ids is not None:
+                    if volume_id not in remain_ids:
+                        continue
+                    remain_ids.discard(volume_id)
+                volume_list.append(VolumeDto.parse_volume_response(volume_response))
+            marker = self.get_next_marker(oa_response.body.get('volumes_links'))
+            if not marker or (remain_ids is not None and not remain_ids) or (max_pages and pages >= max_pages):
+                return volume_list
+            query['marker'] = marker
+
     async def update_a_volume(self, id: UUID, token: str,
                               volumeUpdateInfoRequest: VolumeUpdateInfoRequest) -> VolumeDto:
         """
@@ -0,0 +1,32 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# 현재 사용자 요청의 deadline (event loop time 기준, 요청 밖(worker, watcher 등)에서는 None -> 제한 없음)
+request_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+
+@contextmanager
+def request_deadline_scope(seconds: float) -> Iterator[None]:
+    """
+    with 블록 동안 보내는 모든 openstack 요청이 함께 사용할 총 시간(초)을 설정한다 (0 이하: 제한 없음)
+    """
+    deadline = asyncio.get_running_loop().time() + seconds if seconds > 0 else None
+    token = request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+
+def get_remaining(timeout: Optional[float] = None) -> Optional[float]:
+    """
+    :param timeout: (optional) 요청 1회의 timeout(초)
+    :return: 남은 deadline과 timeout 중 짧은 시간(초) (둘 다 없다면 None)
+    """
+    deadline = request_deadline.get()
+    if deadline is None:
+        return timeout
+    remaining = deadline - asyncio.get_running_loop().time()
+    return remaining if timeout is None else min(remaining, timeout)
@@ -1,4 +1,5 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
 from backend.client.base import BaseClient
@@ -21,12 +22,28 @@ class GlanceClient(BaseClient):
     async def list_images(self, token: str) -> List[ImageDto]:
         """
         200: 요청 성공
+        모든 페이지를 따라가서 전체 image list를 리턴한다
         """
-        oa_request = OpenstackBaseRequest(url=f'{self.COMPONENT_URL}/images',
-                                          headers={OA_TOKEN_HEADER_FIELD: token})
-        oa_response = await self.request_openstack(method='GET', request=oa_request)
+        return [imageDto async for imageDto in self.iter_images(token)]
 
-        return ImageDto.deserialize(oa_response, many=True)
+    async def iter_images(self, token: str, page_size: Optional[int] = None) -> AsyncIterator[ImageDto]:
+        """
+        - [GET] /images?limit={page_size}&marker={marker}
+        - 200: 요청 성공
+        다음 페이지(next)가 없을 때까지 페이지를 따라가며, 페이지를 받을 때마다 dto를 yield한다
+        :param page_size: (optional) 한 번에 요청할 image 수 (기본 OPENSTACK_LIST_PAGE_SIZE)
+        """
+        query = {'limit': page_size or SETTINGS.OPENSTACK_LIST_PAGE_SIZE}
+        while True:
+            oa_request = OpenstackBaseRequest(url=f'{self.COMPONENT_URL}/images?{urlencode(query)}',
+                                              headers={OA_TOKEN_HEADER_FIELD: token})
+            oa_response = await self.request_openstack(method='GET', request=oa_request)
+            for image_response in oa_response.body.get('images', []):
+                yield ImageDto.parse_image_response(image_response)
+            marker = self.get_marker(oa_response.body.get('next'))
+            if not marker:
+                return
+            query['marker'] = marker
 
     async def show_image(self, image_id: UUID, token: str) -> ImageDto:
         """
@@ -1,10 +1,12 @@
+from typing import List, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
 from backend.client.base import BaseClient
 from backend.core.exception import OpenstackClientException
 from backend.model.floatingip import FloatingipStatus
 from backend.schema.floatingip import (FloatingipCreateRequest, FloatingipUpdateRequest, FloatingipUpdatePortRequest,
-                                       FloatingipDto, FloatingipRemainLimitDto)
+                                       FloatingipDto, FloatingipRemainLimitDto, FloatingipStatusDto)
 from backend.schema.oa_base import OpenstackBaseRequest
 from backend.util.constant import OA_TOKEN_HEADER_FIELD
 from backend.core.config import get_setting
@@ -77,6 +79,46 @@ class NeutronClient(BaseClient):
                                                    port=SETTINGS.OPENSTACK_NEUTRON_PORT)
         return FloatingipDto.deserialize(oa_response)
 
+    async def list_floating_ips(self, token: str, ids: Optional[List[UUID]] = None) -> List[FloatingipStatusDto]:
+        """
+        - [GET] /v2.0/floatingips?id={id}&fields=id&fields=status
+        - 200 : list of floatingip (id, status)
+        :param ids: (optional) 조회할 floatingip id list (None이면 전체)
+        :return: List[FloatingipStatusDto] (openstack에 존재하지 않는 floatingip은 포함되지 않음)
+        """
+        if ids is not None and not ids:
+            return []
+        query = [('fields', 'id'), ('fields', 'status')]
+        query += [('id', str(id)) for id in ids or []]
+        oa_request = OpenstackBaseRequest(url=f'{self.COMPONENT_URL}/floatingips?{urlencode(query)}',
+                                          headers={OA_TOKEN_HEADER_FIELD: token})
+        oa_response = await self.request_openstack(method='GET', request=oa_request,
+                                                   port=SETTINGS.OPENSTACK_NEUTRON_PORT)
+        return FloatingipStatusDto.deserialize(oa_response)
+
+    async def list_floating_ips_with_details(self, token: str, filters: Optional[dict] = None) -> List[FloatingipDto]:
+        """
+        - [GET] /v2.0/floatingips?limit={limit}&marker={marker}
+        - 200 : list of floatingip details
+        다음 페이지(floatingips_links)가 없을 때까지 페이지를 따라간다
+        :param filters: (optional) neutron list api의 query parameter (ex. {'limit': 1000})
+        :return: List[FloatingipDto]
+        """
+        floatingip_list = []
+        query = dict(filters) if filters else {}
+        while True:
+            oa_request = OpenstackBaseRequest(
+                url=f'{self.COMPONENT_URL}/floatingips' + (f'?{urlencode(query)}' if query else ''),
+                headers={OA_TOKEN_HEADER_FIELD: token})
+            oa_response = await self.request_openstack(method='GET', request=oa_request,
+                                                       port=SETTINGS.OPENSTACK_NEUTRON_PORT)
+            floatingip_list += [FloatingipDto.parse_floatingip_response(floatingip_response)
+                                for floatingip_response in oa_response.body.get('floatingips', [])]
+            marker = self.get_next_marker(oa_response.body.get('floatingips_links'))
+            if not marker:
+                return floatingip_list
+            query['marker'] = marker
+
     async def show_quota_details_for_tenant(self, token: str) -> FloatingipRemainLimitDto:
         """
         - [GET] /v2.0/quotas/{project_id}/details.json
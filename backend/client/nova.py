@@ -1,8 +1,9 @@
-import json
-from typing import List, Tuple, Optional
+from typing import AsyncIterator, List, Tuple, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
 from backend.client.base import BaseClient
+from backend.core.config import get_setting
 from backend.core.exception import OpenstackClientException
 from backend.model.server import ServerStatus
 from backend.schema.oa_base import OpenstackBaseRequest
@@ -10,6 +11,9 @@ from backend.schema.server import (ServerDto, ServerCreateRequest, FlavorDto, Se
                                    ServerUpdateInfoRequest, ServerUpdateDto, ServerPowerUpdateRequest,
                                    ServerVolumeUpdateRequest, ServerRemainLimitDto)
 from backend.util.constant import OA_TOKEN_HEADER_FIELD
+from backend.util import codec
+
+SETTINGS = get_setting()
 
 
 class NovaClient(BaseClient):
@@ -35,7 +39,7 @@ class NovaClient(BaseClient):
             data=serverCreateRequest.serialize()
         )
         oa_response = await self.request_openstack(method='POST', request=oa_request)
-        return UUID(oa_response.model_dump()['data']['server']['id'])
+        return UUID(oa_response.body['server']['id'])
 
     async def show_server_details(self, id: UUID, token: str) -> ServerDto:
         """
@@ -50,6 +54,46 @@ class NovaClient(BaseClient):
         oa_response = await self.request_openstack(method='GET', request=oa_request)
         return ServerDto.deserialize(oa_response)
 
+    async def list_servers_with_details(self, token: str, ids: Optional[List[UUID]] = None,
+                                        filters: Optional[dict] = None,
+                                        max_pages: Optional[int] = None) -> List[ServerDto]:
+        """
+        - [GET] : /servers/detail
+        - 200 : list of server details
+        nova는 여러 id로 필터링하는 기능을 제공하지 않으므로, 응답에서 해당 id의 서버만 골라낸다
+        요청한 id를 모두 찾았거나, 다음 페이지(servers_links)가 없거나, max_pages개의 페이지를 받을 때까지 페이지를 따라간다
+        :param ids: (optional) 조회할 server id list (None이면 전체)
+        :param filters: (optional) nova list api의 query parameter (ex. {'changes-since': '...', 'limit': 100})
+        :param max_pages: (optional) 최대로 요청할 페이지 수 (None이면 제한 없음)
+        :return: List[ServerDto] (openstack에 존재하지 않는 서버는 포함되지 않음,
+            max_pages로 중단한 경우 찾지 못한 서버가 삭제되었는지는 알 수 없음)
+        """
+        if ids is not None and not ids:
+            return []
+        remain_ids = set(ids) if ids is not None else None
+        server_list = []
+        query = dict(filters) if filters else {}
+        pages = 0
+        while True:
+            oa_request = OpenstackBaseRequest(
+                url=f'{self.COMPONENT_URL}/servers/detail' + (f'?{urlencode(query)}' if query else ''),
+                headers={OA_TOKEN_HEADER_FIELD: token}
+            )
+            oa_response = await self.request_openstack(method='GET', request=oa_request)
+            pages += 1
+            for server_response in oa_response.body.get('servers', []):
+                # 요청하지 않은 서버는 dto로 변환하지 않는다
+                server_id = UUID(server_response['id'])
+                if remain_ids is not None:
+                    if server_id not in remain_ids:
+                        continue
+                    remain_ids.discard(server_id)
+                server_list.append(ServerDto.parse_server_response(server_response))
+            marker = self.get_next_marker(oa_response.body.get('servers_links'))
+            if not marker or (remain_ids is not None and not remain_ids) or (max_pages and pages >= max_pages):
+                return server_list
+            query['marker'] = marker
+
     async def show_server_details_with_volume_ids(self, id: UUID, token: str) -> Tuple[ServerDto, List[UUID]]:
         """
         - [GET] : /servers/{server_id}
@@ -131,7 +175,7 @@ class NovaClient(BaseClient):
                 "type": "novnc"
             }
         }
-        serialized_data = json.dumps(data_dict)
+        serialized_data = codec.dumps(data_dict)
         oa_request = OpenstackBaseRequest(
             url=f'{self.COMPONENT_URL}/servers/{id}/remote-consoles',
             headers={'Content-Type': 'application/json', OA_TOKEN_HEADER_FIELD: token,
@@ -139,8 +183,8 @@ class NovaClient(BaseClient):
             data=serialized_data
         )
         oa_response = await self.request_openstack(method='POST', request=oa_request)
-        response_dict = oa_response.model_dump()['data'].get('remote_console')
-        return response_dict.get('url') if response_dict is not None else None
+        remote_console = oa_response.body.get('remote_console')
+        return remote_console.get('url') if remote_console is not None else None
 
     async def attach_volume_to_instance(self, id: UUID, serverVolumeUpdateRequest: ServerVolumeUpdateRequest,
                                         token: str):
@@ -186,14 +230,31 @@ class NovaClient(BaseClient):
         """
         - [GET] /flavors/detail
         - 200 : list of flavor details
+        모든 페이지를 따라가서 전체 flavor list를 리턴한다
         :return: List[FlavorDto]
         """
-        oa_request = OpenstackBaseRequest(
-            url=f'{self.COMPONENT_URL}/flavors/detail',
-            headers={OA_TOKEN_HEADER_FIELD: token}
-        )
-        oa_response = await self.request_openstack(method='GET', request=oa_request)
-        return FlavorDto.deserialize(oa_response)
+        return [flavorDto async for flavorDto in self.iter_flavors_with_details(token)]
+
+    async def iter_flavors_with_details(self, token: str, page_size: Optional[int] = None) -> AsyncIterator[FlavorDto]:
+        """
+        - [GET] /flavors/detail?limit={page_size}&marker={marker}
+        - 200 : list of flavor details
+        다음 페이지(flavors_links)가 없을 때까지 페이지를 따라가며, 페이지를 받을 때마다 dto를 yield한다
+        :param page_size: (optional) 한 번에 요청할 flavor 수 (기본 OPENSTACK_LIST_PAGE_SIZE)
+        """
+        query = {'limit': page_size or SETTINGS.OPENSTACK_LIST_PAGE_SIZE}
+        while True:
+            oa_request = OpenstackBaseRequest(
+                url=f'{self.COMPONENT_URL}/flavors/detail?{urlencode(query)}',
+                headers={OA_TOKEN_HEADER_FIELD: token}
+            )
+            oa_response = await self.request_openstack(method='GET', request=oa_request)
+            for flavor_response in oa_response.body.get('flavors', []):
+                yield FlavorDto.parse_flavor_response(flavor_response)
+            marker = self.get_next_marker(oa_response.body.get('flavors_links'))
+            if not marker:
+                return
+            query['marker'] = marker
 
     async def show_flavor_details(self, flavor_id: str, token: str) -> FlavorDto:
         """
@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from backend.util.bulkhead import Lane
+
+# 현재 작업의 openstack 요청 우선순위 (사용자 요청은 INTERACTIVE, 그 외(worker, watcher 등)는 BACKGROUND)
+request_lane: ContextVar[Lane] = ContextVar('request_lane', default=Lane.BACKGROUND)
+
+
+@contextmanager
+def request_lane_scope(lane: Lane) -> Iterator[None]:
+    """
+    with 블록 동안 보내는 openstack 요청의 우선순위를 설정한다
+    """
+    token = request_lane.set(lane)
+    try:
+        yield
+    finally:
+        request_lane.reset(token)
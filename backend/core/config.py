@@ -1,5 +1,8 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Dict, List, Literal
+
+from backend.util.backoff import BackoffPolicy
 
 
 class Settings(BaseSettings):
@@ -14,6 +17,8 @@ class Settings(BaseSettings):
     TEST_DB_URL: str = ''
     DB_URL: str = ''
     DB_ECHO_LOG_ENABLED: bool  # DB log를 활성화 시킬지 여부
+    # 시작할 때 schema 처리 (migrate: 적용하지 않은 migration 실행, check: schema version이 최신인지만 확인)
+    DB_SCHEMA_MODE: Literal['migrate', 'check'] = 'migrate'
 
     # openstack 관련
     OPENSTACK_ROOT_URL: str
@@ -26,6 +31,82 @@ class Settings(BaseSettings):
     OPENSTACK_SUBNET_ID: str
     OPENSTACK_DEFAULT_VOLUME_TYPE: str
 
+    # openstack client connection pool 관련 (component별로 pool 생성)
+    OPENSTACK_POOL_SIZE: int = 100  # component당 최대 동시 연결 수 (0: 무제한)
+    OPENSTACK_POOL_SIZE_PER_HOST: int = 0  # host당 최대 동시 연결 수 (0: 무제한)
+    OPENSTACK_KEEPALIVE_TIMEOUT: float = 30  # 사용하지 않는 연결을 유지하는 시간(초)
+    OPENSTACK_DNS_CACHE_TTL: int = 300  # DNS 조회 결과를 캐싱하는 시간(초)
+
+    OPENSTACK_LIST_PAGE_SIZE: int = 100  # 페이지를 따라가며 목록(image, flavor)을 조회할 때 한 번에 요청하는 수
+
+    # openstack 요청 timeout & 재시도 관련
+    OPENSTACK_REQUEST_TIMEOUT: float = 30  # 요청 1회의 timeout(초) (0: 제한 없음)
+    OPENSTACK_RETRY_MAX_ATTEMPTS: int = 3  # 최대 시도 횟수 (1: 재시도 안함)
+    OPENSTACK_RETRY_STATUSES: List[int] = [429, 502, 503, 504]  # 재시도하는 응답 코드 (429, 503은 Retry-After를 따름)
+    # method별 재시도 간격 (설정하지 않은 method는 재시도 안함 -> 기본적으로 멱등한 GET, PUT, DELETE만 재시도)
+    OPENSTACK_RETRY_POLICIES: Dict[str, BackoffPolicy] = {
+        method: BackoffPolicy(min_interval=0.2, max_interval=2, multiplier=2, jitter=0.5)
+        for method in ('GET', 'PUT', 'DELETE')}
+    REQUEST_DEADLINE: float = 60  # 사용자 요청 하나의 모든 openstack 요청(재시도 포함)이 사용할 수 있는 총 시간(초) (0: 제한 없음)
+
+    # openstack component별 circuit breaker 관련 (장애가 발생한 component로의 요청은 즉시 503)
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5  # 최근 요청 중 실패(연결 오류, timeout, 5XX) 비율이 이 값 이상이면 차단
+    CIRCUIT_BREAKER_MINIMUM_CALLS: int = 10  # 실패율을 계산하기 위한 최소 요청 수
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = 20  # 실패율을 계산하는 최근 요청 수
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30  # 차단을 유지하는 시간(초)
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = 3  # 차단 이후 복구를 확인하기 위해 허용하는 요청 수
+
+    # openstack component별 동시 요청 제한 관련 (사용자 요청(interactive)을 background 요청보다 우선 처리)
+    OPENSTACK_BULKHEAD_LIMIT: int = 50  # component당 최대 동시 요청 수 (0: 무제한)
+    OPENSTACK_BULKHEAD_MAX_QUEUE_INTERACTIVE: int = 200  # 사용자 요청의 최대 대기 수, 넘으면 503
+    OPENSTACK_BULKHEAD_MAX_QUEUE_BACKGROUND: int = 100  # background 요청의 최대 대기 수, 넘으면 503
+    OPENSTACK_BULKHEAD_RETRY_AFTER: float = 1  # 대기열이 가득 찬 경우 응답하는 Retry-After(초)
+
+    # openstack 변경 내역 sync 관련 (changes-since로 변경된 server, volume만 DB에 반영)
+    SYNC_INTERVAL: float = 0  # sync 주기(초) (0: 해당 프로세스에서는 sync하지 않음, 한 프로세스에서만 설정 권장)
+    SYNC_PAGE_SIZE: int = 100  # 변경 내역을 조회할 때 한 번에 요청하는 수
+
+    # openstack 전체 자원 reconcile 관련 (server, volume, floatingip 전체를 조회하여 DB와 비교 & 반영)
+    RECONCILE_INTERVAL: float = 0  # reconcile 주기(초) (0: 해당 프로세스에서는 reconcile하지 않음, 한 프로세스에서만 설정 권장)
+    RECONCILE_PAGE_SIZE: int = 1000  # 전체 자원을 조회할 때 한 번에 요청하는 수
+    RECONCILE_BATCH_SIZE: int = 1000  # 한 번의 INSERT ... ON DUPLICATE KEY UPDATE, UPDATE 문으로 반영하는 최대 행 수
+    RECONCILE_MAX_DELETE_RATIO: float = 0.5  # 삭제되지 않은 행 중 한 번에 삭제 처리할 수 있는 최대 비율, 넘으면 해당 자원은 반영하지 않음
+
+    # response mapper 관련
+    RESPONSE_STATUS_CONCURRENCY: int = 10  # list 응답에서 자원 상태를 개별 조회할 때 최대 동시 요청 수
+    RESPONSE_STATUS_LIST_MAX_PAGES: int = 2  # id 필터가 없는 list api(nova, cinder)로 상태를 조회할 때 최대 페이지 수 (찾지 못한 자원은 개별 조회)
+    RESPONSE_STATUS_FAILURE_POLICY: Literal['raise', 'unknown'] = 'raise'  # 상태 조회 실패시 예외 발생(raise) / UNKNOWN 처리(unknown)
+    RESPONSE_DEFAULT_FRESHNESS: Literal['db', 'live'] = 'live'  # 조회 api의 기본 상태 조회 방식 (db: DB에 기록된 상태, live: openstack 조회)
+
+    # 자원 상태 cache 관련 (stale-while-revalidate, 자원 id별)
+    STATUS_CACHE_TTL: float = 5  # 조회한 상태를 그대로 사용하는 시간(초) (0: cache 사용 안함)
+    STATUS_CACHE_STALE_TTL: float = 30  # ttl이 지난 뒤, 저장된 상태를 응답하면서 background에서 갱신하는 시간(초) (서비스 계정 token으로 조회)
+    STATUS_CACHE_MAX_SIZE: int = 10000  # 자원별 최대 저장 수 (넘는 경우 LRU로 제거)
+
+    # status watcher 관련 (비동기 작업 이후 자원 상태 추적)
+    STATUS_WATCHER_MAX_QPS: float = 10  # openstack으로 보내는 초당 최대 요청 수 (list 페이지, 개별 조회) (0: 무제한)
+    STATUS_WATCHER_BURST: int = 10  # 한 번에 보낼 수 있는 최대 요청 수
+
+    # task worker 관련 (DB에 저장된 후속 작업 실행)
+    TASK_WORKER_COUNT: int = 2  # worker 수 (0: 해당 프로세스에서는 task를 실행하지 않음)
+    TASK_POLL_INTERVAL: float = 1  # 실행할 task가 없을 때 다시 조회하기까지의 시간(초)
+    TASK_LEASE_SECONDS: float = 60  # worker가 task를 점유하는 시간(초), 지나면 다른 worker가 이어서 실행
+    TASK_LEASE_RENEW_INTERVAL: float = 20  # 실행 중인 task의 점유 시간을 연장하는 주기(초) (TASK_LEASE_SECONDS보다 짧게)
+    TASK_MAX_ATTEMPTS: int = 5  # task 최대 실행 횟수
+    TASK_RETRY_POLICY: BackoffPolicy = BackoffPolicy(min_interval=2, max_interval=60, multiplier=2, jitter=0.2)
+
+    # 비동기 작업 이후 상태 polling 정책 (작업 종류별)
+    POLLING_POLICY_CREATE_SERVER: BackoffPolicy = BackoffPolicy(min_interval=3, max_interval=10, multiplier=1.5,
+                                                                jitter=0.2, deadline=150)
+    POLLING_POLICY_ATTACH_VOLUME: BackoffPolicy = BackoffPolicy(min_interval=0.5, max_interval=5, multiplier=1.5,
+                                                                jitter=0.2, deadline=60)
+    POLLING_POLICY_DETACH_VOLUME: BackoffPolicy = BackoffPolicy(min_interval=0.5, max_interval=5, multiplier=1.5,
+                                                                jitter=0.2, deadline=60)
+    POLLING_POLICY_EXTEND_VOLUME: BackoffPolicy = BackoffPolicy(min_interval=1, max_interval=10, multiplier=1.5,
+                                                                jitter=0.2, deadline=150)
+    POLLING_POLICY_POWER_SERVER: BackoffPolicy = BackoffPolicy(min_interval=1, max_interval=10, multiplier=1.5,
+                                                               jitter=0.2, deadline=120)
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
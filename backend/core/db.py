@@ -1,4 +1,7 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncAttrs
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncAttrs, AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import DeclarativeBase
 
@@ -40,6 +43,31 @@ class Database:
             expire_on_commit=False
         )
 
+    def create_session(self) -> AsyncSession:
+        """
+        request 외부(worker 등)에서 사용할 session을 생성한다 (async with로 사용)
+        """
+        return self.__session()
+
+    @asynccontextmanager
+    async def named_lock(self, name: str) -> AsyncIterator[bool]:
+        """
+        여러 프로세스 중 하나만 실행하도록 MySQL named lock(GET_LOCK)을 기다리지 않고 얻는다 (async with로 사용)
+        lock은 connection에 속하므로 블록이 끝날 때까지 connection을 유지하고, 끝나면 반환한다
+        :param name: lock 이름
+        :return: lock을 얻었는지 여부 (다른 프로세스가 점유중이라면 False, MySQL이 아닌 경우 항상 True)
+        """
+        async with self.__engine.connect() as conn:
+            if conn.dialect.name != 'mysql':
+                yield True
+                return
+            acquired = (await conn.execute(text('SELECT GET_LOCK(:name, 0)'), {'name': name})).scalar() == 1
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    await conn.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': name})
+
     async def disconnect(self):
         await self.__engine.dispose()
 
@@ -1,7 +1,11 @@
-from fastapi import Request, status
+from fastapi import Query, Request, status
 
 from backend.util.constant import USER_TOKEN_HEADER_FIELD, ERR_NO_TOKEN_IN_HEADER
+from backend.core.config import get_setting
 from backend.core.exception import ApiServerException
+from backend.schema.response import Freshness
+
+SETTINGS = get_setting()
 
 
 def get_token_or_raise(request: Request):
@@ -16,3 +20,12 @@ def get_token_or_raise(request: Request):
             message=ERR_NO_TOKEN_IN_HEADER
         )
     return token
+
+
+def get_freshness(freshness: Freshness = Query(default=SETTINGS.RESPONSE_DEFAULT_FRESHNESS,
+                                               description='db: DB에 기록된 마지막 상태 (openstack 요청 없음) / '
+                                                           'live: openstack에서 조회한 상태')) -> Freshness:
+    """
+    조회 api에서 응답할 자원 상태의 조회 방식 (query parameter)
+    """
+    return freshness
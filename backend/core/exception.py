@@ -1,3 +1,4 @@
+import math
 from backend.schema.oa_base import OpenstackBaseResponse
 from typing import Optional
 
@@ -24,11 +25,24 @@ class ApiServerException(Exception):
             error_type: Optional[str] = 'error',
             message: Optional[str] = '',
             detail: Optional[str] = '',
+            headers: Optional[dict] = None,
     ) -> None:
         self.error_type = error_type
         self.status = status
         self.message = message
         self.detail = detail
+        self.headers = headers  # 응답에 추가할 헤더 (ex. Retry-After)
 
     def __str__(self) -> str:
         return f'{self.detail}'
+
+
+class OpenstackUnavailableException(ApiServerException):
+    """
+    openstack component의 장애로 요청을 보내지 않고 즉시 실패(503)하는 경우 발생하는 exception
+    일시적인 오류이므로 Retry-After 헤더로 재시도 가능한 시간을 알려준다
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(status=503, error_type='unavailable', message=message,
+                         headers={'Retry-After': str(max(1, math.ceil(retry_after)))})
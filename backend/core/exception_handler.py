@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any
 
@@ -6,6 +7,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
 from backend.core.exception import OpenstackClientException, ApiServerException
+from backend.util.constant import ERR_OPENSTACK_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +46,15 @@ def register_error_handlers(app: FastAPI):
     @app.exception_handler(ApiServerException)
     async def api_server_exception_handler(request: Request, exc: ApiServerException):
         await log_error(request, exc)
-        return JSONResponse(status_code=exc.status, content=ExceptionParser.parse_api_server_exception(exc))
+        return JSONResponse(status_code=exc.status, content=ExceptionParser.parse_api_server_exception(exc),
+                            headers=exc.headers)
+
+    @app.exception_handler(asyncio.TimeoutError)
+    async def timeout_exception_handler(request: Request, exc: asyncio.TimeoutError):
+        # openstack 요청이 timeout 혹은 요청의 deadline을 넘긴 경우 504 에러 발생시킨다
+        await log_error(request, exc)
+        return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content=ErrorContent(
+            error_type='timeout', message=ERR_OPENSTACK_TIMEOUT, detail='').__dict__)
 
 
 class ExceptionParser:
@@ -0,0 +1,45 @@
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    """
+    프로세스 내부의 counter/gauge를 관리하는 클래스 (/api/metrics/ 에서 조회)
+
+    이름과 label로 구분하며, prometheus 표기법(name{label="value"})의 문자열을 key로 사용한다
+    해당 파일의 metrics instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__values: Dict[str, float] = defaultdict(float)
+
+    @staticmethod
+    def get_key(name: str, **labels: str) -> str:
+        if not labels:
+            return name
+        label_str = ','.join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+        return f'{name}{{{label_str}}}'
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        counter를 value만큼 증가시킨다
+        """
+        self.__values[self.get_key(name, **labels)] += value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """
+        gauge를 value로 설정한다
+        """
+        self.__values[self.get_key(name, **labels)] = value
+
+    def get(self, name: str, **labels: str) -> float:
+        return self.__values.get(self.get_key(name, **labels), 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(sorted(self.__values.items()))
+
+    def reset(self) -> None:
+        self.__values.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,25 @@
+from fastapi import FastAPI, Request
+
+from backend.client.cache import request_cache_scope
+from backend.client.deadline import request_deadline_scope
+from backend.client.priority import request_lane_scope
+from backend.core.config import get_setting
+from backend.util.bulkhead import Lane
+
+SETTINGS = get_setting()
+
+
+def register_middlewares(app: FastAPI):
+    """
+    모든 요청에 공통으로 적용되는 middleware
+    """
+
+    @app.middleware('http')
+    async def openstack_request_scope(request: Request, call_next):
+        # middleware마다 요청을 감싸는 비용을 줄이도록, 요청 단위 openstack 설정을 하나의 middleware에서 적용한다
+        # - lane : 사용자 요청의 openstack 요청은 background 요청(worker, watcher 등)보다 우선 처리
+        # - deadline : 요청의 모든 openstack 요청(재시도 포함)은 REQUEST_DEADLINE 안에 끝나야 한다
+        # - cache : 요청마다 새로운 openstack GET 응답 cache 사용 (요청이 끝나면 버림)
+        with request_lane_scope(Lane.INTERACTIVE), request_deadline_scope(SETTINGS.REQUEST_DEADLINE), \
+                request_cache_scope():
+            return await call_next(request)
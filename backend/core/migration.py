@@ -0,0 +1,286 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Sequence
+from sqlalchemy import Connection, inspect, insert, select, func, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.core.config import get_setting
+from backend.core.db import db
+from backend.model.schema_version import SchemaVersion
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_NAME = 'schema_migration'
+MIGRATION_LOCK_TIMEOUT = 60  # 다른 프로세스의 migration을 기다리는 시간(초)
+
+
+class Migration(NamedTuple):
+    """
+    :param version: 1부터 1씩 증가하는 version
+    :param upgrade: schema를 변경하는 함수
+        - 해당 version의 schema가 항상 같도록 model이 아닌 고정된 DDL을 사용한다 (model을 변경한다면 새로운 migration 추가)
+        - create_all로 만든 DB에서도 실행할 수 있도록 이미 적용된 변경은 건너뛴다
+    """
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column_ddl: str) -> None:
+    """
+    :param column_ddl: column 정의 (ex. "status_checked_at DATETIME NULL COMMENT '상태를 확인한 시간'")
+    """
+    column_name = column_ddl.split()[0]
+    if column_name not in {column['name'] for column in inspect(conn).get_columns(table_name)}:
+        conn.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {column_ddl}'))
+
+
+def create_index_if_missing(conn: Connection, table_name: str, index_name: str, *column_names: str) -> None:
+    if index_name not in {index['name'] for index in inspect(conn).get_indexes(table_name)}:
+        conn.execute(text(f'CREATE INDEX {index_name} ON {table_name} ({", ".join(column_names)})'))
+
+
+# version 1 : versioned migration 이전의 schema (create_all로 만들던 table)
+V1_TABLES = [
+    """CREATE TABLE IF NOT EXISTS server (
+    server_id CHAR(32) NOT NULL COMMENT 'server id',
+    name VARCHAR(255) NOT NULL COMMENT 'server name',
+    description VARCHAR(255),
+    fk_project_id CHAR(32),
+    fk_flavor_id VARCHAR(255) COMMENT '사양 flavor id',
+    fk_network_id CHAR(32) COMMENT 'private network id',
+    fk_port_id CHAR(32) COMMENT '연결된 포트',
+    fixed_address VARCHAR(15) COMMENT '고정 ip 주소',
+    created_at DATETIME COMMENT '생성시간',
+    updated_at DATETIME COMMENT '수정시간',
+    deleted_at DATETIME COMMENT '삭제시간',
+    PRIMARY KEY (server_id),
+    UNIQUE (fk_port_id)
+)""",
+    """CREATE TABLE IF NOT EXISTS volume (
+    volume_id CHAR(32) NOT NULL COMMENT 'volume id',
+    name VARCHAR(255) COMMENT 'volume name',
+    description VARCHAR(255) COMMENT 'volume description',
+    volume_type VARCHAR(12) COMMENT 'volume type (lvmdriver-1)',
+    size INTEGER COMMENT 'volume 용량',
+    fk_server_id CHAR(32),
+    fk_project_id CHAR(32),
+    fk_image_id CHAR(32) COMMENT 'image id',
+    created_at DATETIME COMMENT '생성시간',
+    updated_at DATETIME COMMENT '수정시간',
+    deleted_at DATETIME COMMENT '삭제시간',
+    PRIMARY KEY (volume_id),
+    FOREIGN KEY (fk_server_id) REFERENCES server (server_id)
+)""",
+    """CREATE TABLE IF NOT EXISTS floatingip (
+    floatingip_id CHAR(32) NOT NULL COMMENT 'floatingip id',
+    ip_address VARCHAR(15) NOT NULL COMMENT 'floating ip address',
+    fk_project_id CHAR(32),
+    fk_port_id CHAR(32) COMMENT '연결된 포트',
+    fk_network_id CHAR(32) COMMENT 'public network id',
+    description VARCHAR(255),
+    created_at DATETIME COMMENT '생성시간',
+    updated_at DATETIME COMMENT '수정시간',
+    deleted_at DATETIME COMMENT '삭제시간',
+    PRIMARY KEY (floatingip_id),
+    FOREIGN KEY (fk_port_id) REFERENCES server (fk_port_id)
+)""",
+    """CREATE TABLE IF NOT EXISTS task (
+    task_id INTEGER NOT NULL AUTO_INCREMENT COMMENT 'task id',
+    task_type ENUM('SERVER_AFTER_CREATE','SERVER_AFTER_ATTACH_VOLUME','SERVER_AFTER_DETACH_VOLUME',
+                   'VOLUME_AFTER_EXTEND') NOT NULL COMMENT 'task 종류',
+    payload JSON NOT NULL COMMENT 'task 인자',
+    status ENUM('PENDING','RUNNING','DONE','FAILED') NOT NULL COMMENT 'task 상태',
+    attempts INTEGER NOT NULL COMMENT '실행 횟수',
+    run_at DATETIME NOT NULL COMMENT '실행 가능 시간 (재시도시 backoff 반영)',
+    locked_until DATETIME COMMENT 'worker 점유 만료 시간',
+    last_error TEXT COMMENT '마지막 실패 사유',
+    created_at DATETIME COMMENT '생성시간',
+    updated_at DATETIME COMMENT '수정시간',
+    PRIMARY KEY (task_id),
+    INDEX ix_task_status_run_at (status, run_at)
+)""",
+    """CREATE TABLE IF NOT EXISTS sync_state (
+    target ENUM('SERVER','VOLUME','FLOATINGIP') NOT NULL COMMENT 'sync 대상 자원',
+    high_water_mark DATETIME COMMENT '반영한 변경 중 가장 최근의 수정시간 (다음 sync의 changes-since)',
+    synced_at DATETIME COMMENT '마지막 sync 시간',
+    PRIMARY KEY (target)
+)""",
+    """CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER NOT NULL COMMENT 'migration version',
+    description VARCHAR(255) COMMENT 'migration 설명',
+    applied_at DATETIME COMMENT '적용한 시간',
+    PRIMARY KEY (version)
+)""",
+]
+
+# version 2 : 자원의 마지막으로 확인한 상태 (freshness=db) {table: [column DDL]}
+V2_STATUS_COLUMNS = {
+    'server': [
+        "status ENUM('ACTIVE','BUILD','DELETED','ERROR','HARD_REBOOT','MIGRATING','PASSWORD','PAUSED','REBOOT',"
+        "'REBUILD','RESCUE','RESIZE','REVERT_RESIZE','SHELVED','SHELVED_OFFLOADED','SHUTOFF','SOFT_DELETED',"
+        "'SUSPENDED','UNKNOWN','VERIFY_RESIZE') NULL COMMENT '마지막으로 확인한 서버 상태'",
+        "status_checked_at DATETIME NULL COMMENT '상태를 확인한 시간'",
+    ],
+    'volume': [
+        "status ENUM('CREATING','AVAILABLE','RESERVED','ATTACHING','DETACHING','IN_USE','MAINTENANCE','DELETING',"
+        "'AWAITING_TRANSFER','ERROR','ERROR_DELETING','BACKING_UP','RESTORING_BACKUP','ERROR_BACKING_UP',"
+        "'ERROR_RESTORING','ERROR_EXTENDING','DOWNLOADING','UPLOADING','RETYPING','EXTENDING','DELETED','UNKNOWN') "
+        "NULL COMMENT '마지막으로 확인한 볼륨 상태'",
+        "status_checked_at DATETIME NULL COMMENT '상태를 확인한 시간'",
+    ],
+    'floatingip': [
+        "status ENUM('ACTIVE','DOWN','ERROR','DELETED','UNKNOWN') NULL COMMENT '마지막으로 확인한 유동ip 상태'",
+        "status_checked_at DATETIME NULL COMMENT '상태를 확인한 시간'",
+    ],
+}
+
+# version 3 : 이름 중복 확인(name, deleted_at), 정렬/cursor pagination(created_at, name) index
+# (fk column은 InnoDB가 foreign key를 만들 때 index를 생성하므로 추가하지 않는다)
+V3_INDEXES = [
+    ('server', 'ix_server_name_deleted_at', 'name', 'deleted_at'),
+    ('server', 'ix_server_created_at', 'created_at', 'server_id'),
+    ('server', 'ix_server_name_sort', 'name', 'server_id'),
+    ('volume', 'ix_volume_name_deleted_at', 'name', 'deleted_at'),
+    ('volume', 'ix_volume_created_at', 'created_at', 'volume_id'),
+    ('volume', 'ix_volume_name_sort', 'name', 'volume_id'),
+    ('floatingip', 'ix_floatingip_created_at', 'created_at', 'floatingip_id'),
+]
+
+# version 4 : task를 점유한 worker만 연장/완료/실패 처리하도록 claim token 추가
+V4_TASK_COLUMNS = [
+    "locked_by VARCHAR(32) NULL COMMENT '점유할 때마다 발급하는 claim token'",
+]
+
+
+def create_tables(conn: Connection) -> None:
+    for table_ddl in V1_TABLES:
+        conn.execute(text(table_ddl))
+
+
+def add_status_columns(conn: Connection) -> None:
+    for table_name, column_ddls in V2_STATUS_COLUMNS.items():
+        for column_ddl in column_ddls:
+            add_column_if_missing(conn, table_name, column_ddl)
+
+
+def add_indexes(conn: Connection) -> None:
+    for table_name, index_name, *column_names in V3_INDEXES:
+        create_index_if_missing(conn, table_name, index_name, *column_names)
+
+
+def add_task_claim_token(conn: Connection) -> None:
+    for column_ddl in V4_TASK_COLUMNS:
+        add_column_if_missing(conn, 'task', column_ddl)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'create tables', create_tables),
+    Migration(2, 'add last known status columns', add_status_columns),
+    Migration(3, 'add indexes for name lookup, sort columns', add_indexes),
+    Migration(4, 'add task claim token', add_task_claim_token),
+]
+
+
+class SchemaMigrator:
+    """
+    versioned schema migration을 관리하는 클래스
+
+    적용한 migration은 schema_version 테이블에 기록하고, 기록되지 않은 migration만 version 순서대로 적용한다
+    - migrate : 적용하지 않은 migration 실행 (여러 프로세스가 동시에 시작하는 경우를 위해 MySQL named lock을 사용)
+    - check : schema version이 최신인지만 확인 (migration은 배포할 때 `python -m backend.core.migration`으로 실행)
+    해당 파일의 schema_migrator instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self, migrations: Sequence[Migration]) -> None:
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def prepare(self, engine: AsyncEngine, mode: str) -> None:
+        """
+        :param mode: DB_SCHEMA_MODE (migrate, check)
+        """
+        if mode == 'migrate':
+            await self.migrate(engine)
+        else:
+            await self.check(engine)
+
+    async def get_version(self, engine: AsyncEngine) -> int:
+        """
+        :return: DB에 적용된 가장 최근 version (schema_version 테이블이 없다면 0)
+        """
+        async with engine.connect() as conn:
+            return await conn.run_sync(self.__get_version)
+
+    async def migrate(self, engine: AsyncEngine) -> List[int]:
+        """
+        :return: 이번에 적용한 version list
+        """
+        applied = []
+        async with engine.begin() as conn:
+            await conn.run_sync(self.__lock)
+            try:
+                version = await conn.run_sync(self.__get_version)
+                for migration in self.migrations:
+                    if migration.version <= version:
+                        continue
+                    await conn.run_sync(migration.upgrade)
+                    await conn.execute(insert(SchemaVersion).values(version=migration.version,
+                                                                    description=migration.description,
+                                                                    applied_at=datetime.utcnow()))
+                    applied.append(migration.version)
+                    logger.info(f'schema migration {migration.version} applied : {migration.description}')
+            finally:
+                await conn.run_sync(self.__unlock)
+        return applied
+
+    async def check(self, engine: AsyncEngine) -> None:
+        """
+        :raises: RuntimeError: schema version이 최신이 아닌 경우
+        """
+        version = await self.get_version(engine)
+        if version != self.latest_version:
+            raise RuntimeError(f'schema version {version} is not {self.latest_version}, '
+                               f'run `python -m backend.core.migration` first')
+
+    @staticmethod
+    def __get_version(conn: Connection) -> int:
+        if not inspect(conn).has_table(SchemaVersion.__tablename__):
+            return 0
+        return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+    @staticmethod
+    def __lock(conn: Connection) -> None:
+        """
+        :raises: RuntimeError: MIGRATION_LOCK_TIMEOUT 동안 lock을 얻지 못한 경우 (다른 프로세스가 migration 중)
+        """
+        if conn.dialect.name == 'mysql':
+            locked = conn.execute(text('SELECT GET_LOCK(:name, :timeout)'),
+                                  {'name': MIGRATION_LOCK_NAME, 'timeout': MIGRATION_LOCK_TIMEOUT}).scalar()
+            if locked != 1:
+                raise RuntimeError(f'could not acquire {MIGRATION_LOCK_NAME} lock (result : {locked})')
+
+    @staticmethod
+    def __unlock(conn: Connection) -> None:
+        if conn.dialect.name == 'mysql':
+            conn.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': MIGRATION_LOCK_NAME})
+
+
+schema_migrator = SchemaMigrator(MIGRATIONS)
+
+if __name__ == '__main__':
+    async def main() -> None:
+        db.init_db(SETTINGS.DB_URL)
+        try:
+            applied = await schema_migrator.migrate(db.engine)
+            print(f'schema version {schema_migrator.latest_version} (applied : {applied})')
+        finally:
+            await db.disconnect()
+
+
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+import asyncio
+import contextvars
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+from backend.core.config import get_setting
+from backend.core.metrics import metrics
+from backend.service.auth import service_token_provider
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+S = TypeVar('S')
+
+
+class CheckedStatus(NamedTuple, Generic[S]):
+    """
+    :param status: openstack에서 조회한 상태
+    :param checked_at: 조회한 시간 (utc, 조회하지 못한 경우 None)
+    """
+    status: S
+    checked_at: Optional[datetime]
+
+
+class StatusCache(Generic[S]):
+    """
+    자원 id별 openstack 상태를 프로세스 메모리에 저장하는 stale-while-revalidate cache
+
+    - 저장 후 ttl 이내 : 저장된 상태를 바로 리턴 (hit)
+    - ttl ~ ttl + stale_ttl : 저장된 상태를 바로 리턴하고, background에서 다시 조회하여 갱신 (stale)
+    - 그 외 : 조회하여 저장한 뒤 리턴 (miss)
+    최대 max_size개까지 저장하며, 넘는 경우 가장 오래 사용하지 않은 항목부터 제거한다 (LRU)
+    상태와 함께 조회한 시간을 저장하므로, cache에서 리턴한 상태도 실제로 조회한 시간을 알 수 있다
+    background 갱신은 사용자 요청이 끝난 뒤에도 실행될 수 있으므로, 사용자의 token 대신 서비스 계정의 token으로 조회한다
+    자원의 상태를 변경한 경우 invalidate로 해당 항목을 제거해야 한다
+    (invalidate 이전에 시작한 조회의 결과는 저장하지 않는다. 조회 전에 get_version으로 version을 받아 set에 전달)
+    해당 파일의 server_status_cache, volume_status_cache, floatingip_status_cache instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float, max_size: int) -> None:
+        """
+        :param name: metrics의 component label
+        :param ttl: 저장된 상태를 그대로 사용하는 시간(초) (0 이하인 경우 cache를 사용하지 않음)
+        :param stale_ttl: ttl이 지난 뒤, 저장된 상태를 응답하면서 background에서 갱신하는 시간(초)
+        :param max_size: 최대 저장 수
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        # key -> (상태, 저장 시간)
+        self.__entries: OrderedDict[Hashable, Tuple[CheckedStatus[S], float]] = OrderedDict()
+        self.__refreshing: Dict[Hashable, asyncio.Task] = {}
+        # invalidate할 때마다 증가하는 version
+        # key를 invalidate한 version이 조회를 시작한 version보다 크다면 조회 결과를 저장하지 않는다 (변경 이전의 상태일 수 있음)
+        self.__version = 0
+        self.__invalidated: OrderedDict[Hashable, int] = OrderedDict()  # key -> 마지막으로 invalidate한 version
+        self.__min_version = 0  # 이 version 이전에 시작한 조회 결과는 key와 무관하게 저장하지 않음 (clear, 기록 초과)
+
+    def get_version(self) -> int:
+        """
+        :return: 현재 version (조회를 시작하기 전에 받아서 set에 전달)
+        """
+        return self.__version
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[str], Awaitable[S]],
+                          token: str) -> CheckedStatus[S]:
+        """
+        :param loader: cache에 없거나 만료된 경우 token으로 상태를 조회하는 함수 (token 외의 인증 정보를 담지 않아야 한다)
+        :param token: 사용자의 인증 토큰 (바로 조회하는 경우에만 사용, background 갱신은 서비스 계정의 token 사용)
+        :return: 상태와 조회한 시간 (cache에서 리턴한 경우 저장된 상태를 조회한 시간)
+        """
+        if self.ttl <= 0:
+            return CheckedStatus(await loader(token), datetime.utcnow())
+        loop = asyncio.get_running_loop()
+        entry = self.__entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = loop.time() - stored_at
+            if age < self.ttl:
+                self.__entries.move_to_end(key)
+                self.__record('hit')
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.__entries.move_to_end(key)
+                self.__record('stale')
+                self.__refresh(key, loader)
+                return value
+        self.__record('miss')
+        version = self.get_version()
+        value = CheckedStatus(await loader(token), datetime.utcnow())
+        self.set(key, value, version)
+        return value
+
+    def set(self, key: Hashable, value: CheckedStatus[S], version: Optional[int] = None) -> None:
+        """
+        :param value: 상태와 조회한 시간
+        :param version: (optional) 조회를 시작하기 전의 version (이후 key가 invalidate 되었다면 저장하지 않음)
+        """
+        if self.ttl <= 0 or (version is not None and self.__is_invalidated(key, version)):
+            return
+        self.__entries[key] = (value, asyncio.get_running_loop().time())
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        상태가 변경된 자원의 항목을 제거한다 (진행중인 background 갱신도 취소)
+        """
+        self.__version += 1
+        for key in keys:
+            self.__entries.pop(key, None)
+            self.__invalidated[key] = self.__version
+            self.__invalidated.move_to_end(key)
+            task = self.__refreshing.pop(key, None)
+            if task is not None:
+                task.cancel()
+        # 기록은 max_size개까지만 유지, 지운 기록의 version 이전에 시작한 조회는 모두 저장하지 않는다
+        while len(self.__invalidated) > self.max_size:
+            _, version = self.__invalidated.popitem(last=False)
+            self.__min_version = max(self.__min_version, version)
+
+    async def get_service_token(self) -> str:
+        """
+        background 갱신에 사용할 서비스 계정의 token을 리턴한다 (만료 1분 전까지 재사용)
+        """
+        return await service_token_provider.get_token()
+
+    def clear(self) -> None:
+        self.__version += 1
+        self.__min_version = self.__version
+        self.__invalidated.clear()
+        self.__entries.clear()
+        for task in self.__refreshing.values():
+            task.cancel()
+        self.__refreshing.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __is_invalidated(self, key: Hashable, version: int) -> bool:
+        """
+        :return: version 이후에 key가 invalidate 되었는지 여부
+        """
+        return version < self.__min_version or self.__invalidated.get(key, 0) > version
+
+    def __refresh(self, key: Hashable, loader: Callable[[str], Awaitable[S]]) -> None:
+        """
+        key의 상태를 background에서 다시 조회하여 저장한다 (key별로 하나만 실행)
+        사용자 요청의 context(deadline, 우선순위 등)와 token을 이어받지 않도록 빈 context에서 서비스 계정의 token으로 조회한다
+        """
+        if key in self.__refreshing:
+            return
+        version = self.get_version()
+
+        async def refresh() -> None:
+            try:
+                value = CheckedStatus(await loader(await self.get_service_token()), datetime.utcnow())
+            except Exception as e:
+                logger.warning(f'{self.name} status cache refresh failed ({key}) : {e!r}')
+                return
+            finally:
+                if self.__refreshing.get(key) is asyncio.current_task():
+                    del self.__refreshing[key]
+            self.set(key, value, version)
+
+        self.__refreshing[key] = asyncio.get_running_loop().create_task(refresh(), context=contextvars.Context())
+
+    def __record(self, result: str) -> None:
+        metrics.increment('status_cache_requests_total', component=self.name, result=result)
+        hits = sum(metrics.get('status_cache_requests_total', component=self.name, result=el)
+                   for el in ('hit', 'stale'))
+        total = hits + metrics.get('status_cache_requests_total', component=self.name, result='miss')
+        metrics.set('status_cache_hit_ratio', hits / total, component=self.name)
+
+
+def create_status_cache(name: str) -> StatusCache:
+    return StatusCache(name=name, ttl=SETTINGS.STATUS_CACHE_TTL, stale_ttl=SETTINGS.STATUS_CACHE_STALE_TTL,
+                       max_size=SETTINGS.STATUS_CACHE_MAX_SIZE)
+
+
+server_status_cache = create_status_cache('server')
+volume_status_cache = create_status_cache('volume')
+floatingip_status_cache = create_status_cache('floatingip')
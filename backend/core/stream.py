@@ -0,0 +1,44 @@
+import logging
+from typing import AsyncIterator
+from pydantic import BaseModel
+
+from fastapi.responses import StreamingResponse
+
+from backend.client.deadline import request_deadline_scope
+from backend.core.config import get_setting
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+
+async def stream_json_array(items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """
+    items를 받는 대로 json 배열로 내보내는 응답을 리턴한다 (전체 목록을 메모리에 모으지 않음)
+    첫 item은 응답을 시작하기 전에 받으므로, 첫 페이지 조회 중 발생한 오류(401 등)는 기존과 같은 오류 응답으로 처리된다
+    응답 body는 요청의 REQUEST_DEADLINE이 끝난 뒤에도 내보내므로, 다음 item(페이지)을 받을 때마다 REQUEST_DEADLINE을 새로 적용한다
+    이후 페이지 조회 중 오류가 발생하면 이미 200 응답을 시작했으므로 오류 응답을 보낼 수 없다
+    -> 오류를 기록하고 연결을 끊는다 (client는 닫히지 않은 json 배열을 받으므로 실패로 처리해야 한다)
+    """
+    try:
+        first = await anext(items)
+    except StopAsyncIteration:
+        first = None
+
+    async def generate() -> AsyncIterator[bytes]:
+        if first is None:
+            yield b'[]'
+            return
+        yield b'[' + first.model_dump_json().encode()
+        while True:
+            try:
+                with request_deadline_scope(SETTINGS.REQUEST_DEADLINE):
+                    item = await anext(items)
+            except StopAsyncIteration:
+                break
+            except Exception:
+                logger.exception('streaming json array aborted : failed to fetch next item after response started')
+                raise
+            yield b',' + item.model_dump_json().encode()
+        yield b']'
+
+    return StreamingResponse(generate(), media_type='application/json')
@@ -0,0 +1,245 @@
+import asyncio
+import enum
+import logging
+from aiohttp import ClientError
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from backend.client import nova_client, cinder_client
+from backend.core.config import get_setting
+from backend.core.exception import OpenstackClientException, OpenstackUnavailableException
+from backend.service.auth import service_token_provider
+from backend.util.backoff import BackoffPolicy
+from backend.util.limiter import RateLimiter
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+# 일시적인 조회 실패로 간주하는 예외 (circuit breaker 차단 포함, 다음 주기에 다시 조회)
+TRANSIENT_EXCEPTIONS = (OpenstackClientException, OpenstackUnavailableException, ClientError, asyncio.TimeoutError)
+
+
+class WatchComponent(str, enum.Enum):
+    SERVER = 'server'  # NOVA
+    VOLUME = 'volume'  # CINDER
+
+
+class WatchEntry:
+    """
+    상태를 추적하는 자원 하나의 정보
+
+    - target_statuses : 완료로 간주하는 상태
+    - failure_statuses : 실패로 간주하는 상태
+    - callback : (optional) 추적이 끝나면 결과(dto or None)로 호출하는 coroutine function
+    - policy : polling 간격 & deadline
+    - future : 추적 결과 (마지막으로 조회한 dto, 자원이 없거나 deadline이 지난 경우 None)
+    """
+
+    def __init__(self, component: WatchComponent, id: UUID,
+                 target_statuses: Iterable, failure_statuses: Iterable,
+                 callback: Optional[Callable[[Any], Awaitable]], policy: BackoffPolicy) -> None:
+        loop = asyncio.get_running_loop()
+        self.component = component
+        self.id = id
+        self.target_statuses = set(target_statuses)
+        self.failure_statuses = set(failure_statuses)
+        self.callback = callback
+        self.policy = policy
+        self.polls = 0  # 지금까지 조회한 횟수
+        self.started_at = loop.time()
+        self.next_poll_at = self.started_at + policy.get_interval(0)
+        self.future: asyncio.Future = loop.create_future()
+
+
+class StatusWatcher:
+    """
+    비동기 작업(서버 생성, 볼륨 연결/해제/확장 등) 이후 자원의 상태를 추적하는 클래스
+
+    자원마다 polling하지 않고, 등록된 자원 중 조회할 시점이 된 자원들을 component별로 묶어서
+    list api 한 페이지로 조회한다 (nova, cinder는 id로 필터링할 수 없으므로 다음 페이지는 따라가지 않음).
+    첫 페이지에서 찾지 못한 자원만 개별 조회하며, 없는 자원(404)은 바로 추적을 끝낸다.
+    openstack으로의 요청(list 페이지, 개별 조회)은 요청마다 STATUS_WATCHER_MAX_QPS로 제한한다
+    등록한 사용자와 무관하게 묶을 수 있도록, 조회는 서비스 계정(OPENSTACK_USERNAME)의 token으로 한다
+    해당 파일의 status_watcher instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: List[WatchEntry] = []
+        self.__task: Optional[asyncio.Task] = None
+        self.__wakeup: Optional[asyncio.Event] = None
+        self.__callbacks: Set[asyncio.Task] = set()  # 실행중인 callback (gc 방지)
+        self.limiter: Optional[RateLimiter] = None
+
+    def start(self) -> None:
+        """
+        현재 event loop에서 추적 loop를 시작한다 (이미 실행중이라면 무시)
+        """
+        loop = asyncio.get_running_loop()
+        if self.__task is not None and not self.__task.done() and self.__task.get_loop() is loop:
+            return
+        # 다른 event loop에서 등록된 자원은 버린다
+        self.__entries = [entry for entry in self.__entries if entry.future.get_loop() is loop]
+        self.__wakeup = asyncio.Event()
+        self.limiter = RateLimiter(rate=SETTINGS.STATUS_WATCHER_MAX_QPS, burst=SETTINGS.STATUS_WATCHER_BURST)
+        self.__task = loop.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """
+        추적 loop를 종료하고, 추적중인 자원은 None으로 완료 처리한다 (app 종료시 호출)
+        """
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        for entry in self.__entries:
+            self.__resolve(entry, None)
+        self.__entries.clear()
+
+    def register(self, component: WatchComponent, id: UUID,
+                 target_statuses: Iterable, policy: BackoffPolicy, failure_statuses: Iterable = (),
+                 callback: Optional[Callable[[Any], Awaitable]] = None) -> asyncio.Future:
+        """
+        상태를 추적할 자원을 등록한다
+
+        :param component: 자원 종류
+        :param id: 자원 id
+        :param target_statuses: 완료로 간주하는 상태
+        :param failure_statuses: 실패로 간주하는 상태
+        :param policy: polling 간격 & deadline (deadline이 지나도 최소 한 번은 조회)
+        :param callback: (optional) 추적이 끝나면 결과로 호출하는 coroutine function
+        :return: 추적 결과 future (마지막으로 조회한 dto, 자원이 없거나 deadline이 지난 경우 None)
+        """
+        self.start()
+        entry = WatchEntry(component=component, id=id, target_statuses=target_statuses,
+                           failure_statuses=failure_statuses, callback=callback, policy=policy)
+        self.__entries.append(entry)
+        self.__wakeup.set()
+        return entry.future
+
+    async def watch(self, component: WatchComponent, id: UUID,
+                    target_statuses: Iterable, policy: BackoffPolicy,
+                    failure_statuses: Iterable = ()) -> Optional[Any]:
+        """
+        자원을 등록하고, 완료/실패 상태가 될 때까지 기다린다
+        :return: 마지막으로 조회한 dto (자원이 없거나 deadline이 지난 경우 None)
+        :raises: 조회 중 발생한 ApiServerException (ex. 서비스 계정 인증 실패)
+        """
+        return await self.register(component=component, id=id, target_statuses=target_statuses,
+                                   failure_statuses=failure_statuses, policy=policy)
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            due_entries = [entry for entry in self.__entries if entry.next_poll_at <= now]
+            if not due_entries:
+                # 다음 조회 시점 혹은 새로운 자원이 등록될 때까지 대기
+                self.__wakeup.clear()
+                timeout = min((entry.next_poll_at for entry in self.__entries), default=now + 60) - now
+                try:
+                    await asyncio.wait_for(self.__wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # component별로 묶어서 한 번에 조회
+            groups: Dict[WatchComponent, List[WatchEntry]] = {}
+            for entry in due_entries:
+                groups.setdefault(entry.component, []).append(entry)
+            await asyncio.gather(*[self.__poll(component, entries) for component, entries in groups.items()])
+
+    async def __poll(self, component: WatchComponent, entries: List[WatchEntry]) -> None:
+        """
+        list api 한 페이지로 entries의 상태를 조회하고(찾지 못한 자원은 개별 조회), 완료/실패/삭제된 자원의 추적을 끝낸다
+        """
+        ids = list(dict.fromkeys(entry.id for entry in entries))
+        try:
+            token = await self.get_service_token()
+            await self.limiter.acquire()
+            dto_map = await self.__list(component, token, ids)
+            await self.__show_missing(component, token, ids, dto_map)
+        except TRANSIENT_EXCEPTIONS as e:
+            # 일시적인 오류(circuit breaker 차단 포함) : 조회 횟수만 차감하고 다음 주기에 다시 조회
+            logger.warning(f'status watcher failed to list {component.value}s : {e}')
+            dto_map = None
+        except Exception as e:
+            # 서비스 계정 인증 실패 등 : 추적 중단
+            for entry in entries:
+                self.__remove(entry)
+                if not entry.future.done():
+                    entry.future.set_exception(e)
+            return
+        now = asyncio.get_running_loop().time()
+        for entry in entries:
+            # 조회하지 못한 자원(개별 조회 실패)은 다음 주기에 다시 조회
+            if dto_map is not None and entry.id in dto_map:
+                dto = dto_map[entry.id]
+                if dto is None or dto.status in entry.target_statuses or dto.status in entry.failure_statuses:
+                    # 삭제되었거나 완료/실패 상태
+                    self.__remove(entry)
+                    self.__resolve(entry, dto)
+                    continue
+            entry.polls += 1
+            if entry.policy.is_expired(now - entry.started_at):
+                self.__remove(entry)
+                self.__resolve(entry, None)
+            else:
+                entry.next_poll_at = now + entry.policy.get_interval(entry.polls)
+
+    async def get_service_token(self) -> str:
+        """
+        서비스 계정의 token을 리턴한다 (만료 1분 전까지 재사용)
+        """
+        return await service_token_provider.get_token()
+
+    @staticmethod
+    async def __list(component: WatchComponent, token: str, ids: List[UUID]) -> Dict[UUID, Any]:
+        """
+        list api의 첫 페이지에서 ids의 자원을 찾는다 (최근 생성된 자원부터 정렬되므로 대부분 첫 페이지에 있음)
+        """
+        if component == WatchComponent.SERVER:
+            return {serverDto.server_id: serverDto
+                    for serverDto in await nova_client.list_servers_with_details(token=token, ids=ids, max_pages=1)}
+        return {volumeDto.volume_id: volumeDto
+                for volumeDto in await cinder_client.list_volumes_with_details(token=token, ids=ids, max_pages=1)}
+
+    async def __show_missing(self, component: WatchComponent, token: str, ids: List[UUID],
+                             dto_map: Dict[UUID, Any]) -> None:
+        """
+        list 결과에서 찾지 못한 자원을 하나씩 조회하여 dto_map에 추가한다 (openstack에 없는 자원은 None)
+        일시적인 오류로 조회하지 못한 자원은 추가하지 않는다
+        """
+        for id in ids:
+            if id in dto_map:
+                continue
+            await self.limiter.acquire()
+            try:
+                if component == WatchComponent.SERVER:
+                    dto_map[id] = await nova_client.show_server_details(id=id, token=token)
+                else:
+                    dto_map[id] = await cinder_client.show_volume_detail(id=id, token=token)
+            except OpenstackClientException as e:
+                if e.status == 404:
+                    dto_map[id] = None
+                else:
+                    logger.warning(f'status watcher failed to show {component.value} {id} : {e}')
+            except TRANSIENT_EXCEPTIONS as e:
+                logger.warning(f'status watcher failed to show {component.value} {id} : {e}')
+
+    def __remove(self, entry: WatchEntry) -> None:
+        if entry in self.__entries:
+            self.__entries.remove(entry)
+
+    def __resolve(self, entry: WatchEntry, result: Optional[Any]) -> None:
+        if entry.future.done():
+            return
+        entry.future.set_result(result)
+        if entry.callback is not None:
+            task = asyncio.get_running_loop().create_task(entry.callback(result))
+            self.__callbacks.add(task)
+            task.add_done_callback(self.__callbacks.discard)
+
+
+status_watcher = StatusWatcher()
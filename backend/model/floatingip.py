@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Uuid, String, DateTime, ForeignKey
+from sqlalchemy import Column, Uuid, String, DateTime, ForeignKey, Enum, Index
 from datetime import datetime
 import enum
 from sqlalchemy.orm import relationship
@@ -13,10 +13,12 @@ class FloatingipStatus(str, enum.Enum):
     ERROR = 'ERROR'
 
     DELETED = 'DELETED'  # for soft delete
+    UNKNOWN = 'UNKNOWN'  # 상태 조회 실패
 
 
 class Floatingip(Base):
     __tablename__ = 'floatingip'
+    __table_args__ = (Index('ix_floatingip_created_at', 'created_at', 'floatingip_id'),)  # 정렬, cursor pagination
     floatingip_id: UUID = Column(
         Uuid(as_uuid=True), primary_key=True, comment='floatingip id')
     ip_address: str = Column(String(15), nullable=False,
@@ -27,6 +29,8 @@ class Floatingip(Base):
     fk_network_id: UUID = Column(
         Uuid(as_uuid=True), nullable=True, comment='public network id')
     description: str = Column(String(255))
+    status: FloatingipStatus = Column(Enum(FloatingipStatus), nullable=True, comment='마지막으로 확인한 유동ip 상태')
+    status_checked_at: datetime = Column(DateTime, nullable=True, comment='상태를 확인한 시간')
     created_at: datetime = Column(DateTime, comment='생성시간')
     updated_at: datetime = Column(DateTime, comment='수정시간')
     deleted_at: datetime = Column(DateTime, nullable=True, comment='삭제시간')
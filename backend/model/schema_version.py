@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+
+from backend.core.db import Base
+
+
+class SchemaVersion(Base):
+    """
+    DB에 적용한 schema migration (backend/core/migration.py)
+    """
+    __tablename__ = 'schema_version'
+    version: int = Column(Integer, primary_key=True, autoincrement=False, comment='migration version')
+    description: str = Column(String(255), comment='migration 설명')
+    applied_at: datetime = Column(DateTime, comment='적용한 시간')
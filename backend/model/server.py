@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from typing import List
 from uuid import UUID
-from sqlalchemy import Column, Uuid, String, DateTime
+from sqlalchemy import Column, Uuid, String, DateTime, Enum, Index
 from sqlalchemy.orm import Mapped, relationship
 
 from backend.core.db import Base
@@ -35,6 +35,9 @@ class ServerStatus(str, enum.Enum):
 
 class Server(Base):
     __tablename__ = 'server'
+    __table_args__ = (Index('ix_server_name_deleted_at', 'name', 'deleted_at'),  # 삭제되지 않은 서버의 이름 중복 확인
+                      Index('ix_server_created_at', 'created_at', 'server_id'),  # 정렬, cursor pagination
+                      Index('ix_server_name_sort', 'name', 'server_id'))
     server_id: UUID = Column(
         Uuid(as_uuid=True), primary_key=True, comment='server id')
     name: str = Column(String(255), nullable=False, comment='server name')
@@ -46,6 +49,8 @@ class Server(Base):
     fk_port_id: UUID = Column(
         Uuid(as_uuid=True), nullable=True, unique=True, comment='연결된 포트')
     fixed_address: str = Column(String(15), comment='고정 ip 주소')
+    status: ServerStatus = Column(Enum(ServerStatus), nullable=True, comment='마지막으로 확인한 서버 상태')
+    status_checked_at: datetime = Column(DateTime, nullable=True, comment='상태를 확인한 시간')
     created_at: datetime = Column(DateTime, comment='생성시간')
     updated_at: datetime = Column(DateTime, comment='수정시간')
     deleted_at: datetime = Column(DateTime, nullable=True, comment='삭제시간')
@@ -0,0 +1,22 @@
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Enum
+
+from backend.core.db import Base
+
+
+class SyncTarget(str, enum.Enum):
+    SERVER = 'server'  # NOVA
+    VOLUME = 'volume'  # CINDER
+    FLOATINGIP = 'floatingip'  # NEUTRON
+
+
+class SyncState(Base):
+    """
+    openstack 자원의 변경 내역을 DB에 반영(sync)한 위치
+    """
+    __tablename__ = 'sync_state'
+    target: SyncTarget = Column(Enum(SyncTarget), primary_key=True, comment='sync 대상 자원')
+    high_water_mark: datetime = Column(DateTime, nullable=True,
+                                       comment='반영한 변경 중 가장 최근의 수정시간 (다음 sync의 changes-since)')
+    synced_at: datetime = Column(DateTime, comment='마지막 sync 시간')
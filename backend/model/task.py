@@ -0,0 +1,39 @@
+import enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Enum, Index
+
+from backend.core.db import Base
+
+
+class TaskType(str, enum.Enum):
+    SERVER_AFTER_CREATE = 'server.after_create'  # 서버 생성 이후 port, 루트 볼륨 반영
+    SERVER_AFTER_ATTACH_VOLUME = 'server.after_attach_volume'  # 볼륨 연결 이후 반영
+    SERVER_AFTER_DETACH_VOLUME = 'server.after_detach_volume'  # 볼륨 해제 이후 반영
+    VOLUME_AFTER_EXTEND = 'volume.after_extend'  # 볼륨 확장 이후 용량 반영
+
+
+class TaskStatus(str, enum.Enum):
+    PENDING = 'PENDING'  # 실행 대기 (재시도 대기 포함)
+    RUNNING = 'RUNNING'  # worker가 점유하여 실행중
+    DONE = 'DONE'
+    FAILED = 'FAILED'  # 재시도 횟수 초과
+
+
+class Task(Base):
+    """
+    비동기 작업 이후 수행해야 하는 후속 작업 (worker pool이 실행)
+    """
+    __tablename__ = 'task'
+    __table_args__ = (Index('ix_task_status_run_at', 'status', 'run_at'),)  # 실행 가능한 task 조회
+    task_id: int = Column(Integer, primary_key=True, autoincrement=True, comment='task id')
+    task_type: TaskType = Column(Enum(TaskType), nullable=False, comment='task 종류')
+    payload: dict = Column(JSON, nullable=False, comment='task 인자')
+    status: TaskStatus = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING,
+                                comment='task 상태')
+    attempts: int = Column(Integer, nullable=False, default=0, comment='실행 횟수')
+    run_at: datetime = Column(DateTime, nullable=False, comment='실행 가능 시간 (재시도시 backoff 반영)')
+    locked_until: datetime = Column(DateTime, nullable=True, comment='worker 점유 만료 시간')
+    locked_by: str = Column(String(32), nullable=True, comment='점유할 때마다 발급하는 claim token')
+    last_error: str = Column(Text, nullable=True, comment='마지막 실패 사유')
+    created_at: datetime = Column(DateTime, comment='생성시간')
+    updated_at: datetime = Column(DateTime, comment='수정시간')
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from uuid import UUID
-from sqlalchemy import Column, Uuid, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Uuid, String, Integer, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 
 from backend.core.db import Base
@@ -31,10 +31,14 @@ class VolumeStatus(str, enum.Enum):
 
     # 추가
     DELETED = 'deleted'
+    UNKNOWN = 'unknown'  # 상태 조회 실패
 
 
 class Volume(Base):
     __tablename__ = 'volume'
+    __table_args__ = (Index('ix_volume_name_deleted_at', 'name', 'deleted_at'),  # 삭제되지 않은 볼륨의 이름 중복 확인
+                      Index('ix_volume_created_at', 'created_at', 'volume_id'),  # 정렬, cursor pagination
+                      Index('ix_volume_name_sort', 'name', 'volume_id'))
     volume_id: UUID = Column(
         Uuid(as_uuid=True), primary_key=True, comment='volume id')
     name: str = Column(String(255), comment='volume name')
@@ -45,6 +49,8 @@ class Volume(Base):
         'server.server_id'), nullable=True)
     fk_project_id: UUID = Column(Uuid(as_uuid=True))
     fk_image_id: UUID = Column(Uuid(as_uuid=True), comment='image id')
+    status: VolumeStatus = Column(Enum(VolumeStatus), nullable=True, comment='마지막으로 확인한 볼륨 상태')
+    status_checked_at: datetime = Column(DateTime, nullable=True, comment='상태를 확인한 시간')
     created_at: datetime = Column(DateTime, comment='생성시간')
     # cinder에서는 기본적으로 생성시 updated_at : null
     updated_at: datetime = Column(DateTime, comment='수정시간')
@@ -1,8 +1,27 @@
+from typing import Callable, Optional
 from fastapi import Depends
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
 from backend.core.db import db
 
 
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN {statement} (bind parameter는 statement와 같이 전달된다)
+    """
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain)
+def compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f'EXPLAIN {compiler.process(element.statement, **kwargs)}'
+
+
 class BaseRepository:
     def __init__(self, session: AsyncSession = Depends(db.get_db)):
         self.db = session
@@ -18,3 +37,26 @@ class BaseRepository:
 
     async def flush(self):
         await self.db.flush()
+
+    @staticmethod
+    def with_loader(query: Select, loader: Optional[Callable], *relationships) -> Select:
+        """
+        relationship들을 해당 loader strategy로 eager loading 하도록 query에 option을 추가한다
+        (row마다 lazy loading으로 SELECT를 수행하지 않기 위함)
+        :param loader: (optional) selectinload, joinedload 등의 loader strategy (None이면 lazy loading)
+        :param relationships: eager loading할 relationship들
+        """
+        if loader is None:
+            return query
+        return query.options(*[loader(relationship) for relationship in relationships])
+
+    async def count(self, query: Select, estimate: bool = False) -> int:
+        """
+        query(filter만 적용한 select)의 행 수
+        :param estimate: True면 실행하지 않고 optimizer의 예상 행 수(index 통계)를 리턴한다 (MySQL이 아니라면 정확한 행 수)
+        """
+        if estimate and self.db.bind.dialect.name == 'mysql':
+            plan = (await self.db.execute(Explain(query))).mappings().first()
+            if plan is not None and plan['rows'] is not None:
+                return round(plan['rows'] * (plan['filtered'] or 100) / 100)
+        return await self.db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
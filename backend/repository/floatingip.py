@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Callable
 from uuid import UUID
 from sqlalchemy import select
 
@@ -8,23 +8,38 @@ from backend.schema.floatingip import FloatingipQuery
 
 
 class FloatingipRepository(BaseRepository):
-    async def find_floatingips_by_query(self, queryInput: Optional[FloatingipQuery]) -> List[Floatingip]:
+    async def find_floatingips_by_query(self, queryInput: Optional[FloatingipQuery],
+                                        loader: Optional[Callable] = None) -> List[Floatingip]:
+        """
+        :param loader: (optional) 연결된 server를 eager loading 할 loader strategy (ex. selectinload)
+        """
         # 1. filter
-        list_query = select(Floatingip)
+        list_query = self.with_loader(select(Floatingip), loader, Floatingip.server)
         list_query = queryInput.get_filtered_query(
             query=list_query, db_model=Floatingip)
         # 2. sort
         list_query = queryInput.get_sorted_query(
             query=list_query, db_model=Floatingip)
         # 3. pagination
-        list_query = queryInput.get_paginated_query(list_query)
+        list_query = queryInput.get_paginated_query(list_query, db_model=Floatingip)
         scalars = await self.db.scalars(list_query)
 
-        return list(scalars.all())
+        return queryInput.get_paginated_result(list(scalars.unique().all()), db_model=Floatingip)
 
-    async def find_floatingip_by_id(self, id: UUID) -> Optional[Floatingip]:
-        scalar = await self.db.scalar(select(Floatingip).filter(Floatingip.floatingip_id == id))
-        return scalar
+    async def count_floatingips_by_query(self, queryInput: FloatingipQuery) -> int:
+        """
+        해당 query의 filter에 해당하는 floatingip 수 (include_total이 estimate면 예상 행 수)
+        """
+        count_query = queryInput.get_filtered_query(query=select(Floatingip.floatingip_id), db_model=Floatingip)
+        return await self.count(count_query, estimate=queryInput.include_total == 'estimate')
+
+    async def find_floatingip_by_id(self, id: UUID, loader: Optional[Callable] = None) -> Optional[Floatingip]:
+        """
+        :param loader: (optional) 연결된 server를 eager loading 할 loader strategy (ex. selectinload)
+        """
+        query = self.with_loader(select(Floatingip), loader, Floatingip.server)
+        scalars = await self.db.scalars(query.filter(Floatingip.floatingip_id == id))
+        return scalars.unique().first()
 
     async def save_floatingip(self, floatingip: Floatingip) -> Floatingip:
         self.db.add(floatingip)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Callable
 from uuid import UUID
 from sqlalchemy import select
 
@@ -8,29 +8,52 @@ from backend.schema.server import ServerQuery
 
 
 class ServerRepository(BaseRepository):
-    async def find_servers_by_query(self, queryInput: Optional[ServerQuery]) -> List[Server]:
+    async def find_servers_by_query(self, queryInput: Optional[ServerQuery],
+                                    loader: Optional[Callable] = None) -> List[Server]:
+        """
+        :param loader: (optional) volumes, floatingip을 eager loading 할 loader strategy (ex. selectinload)
+        """
         # 1. filter
-        list_query = select(Server)
+        list_query = self.with_loader(select(Server), loader, Server.volumes, Server.floatingip)
         list_query = queryInput.get_filtered_query(
             query=list_query, db_model=Server)
         # 2. sort
         list_query = queryInput.get_sorted_query(
             query=list_query, db_model=Server)
         # 3. pagination
-        list_query = queryInput.get_paginated_query(list_query)
+        list_query = queryInput.get_paginated_query(list_query, db_model=Server)
         scalars = await self.db.scalars(list_query)
 
-        return list(scalars.all())
+        return queryInput.get_paginated_result(list(scalars.unique().all()), db_model=Server)
+
+    async def count_servers_by_query(self, queryInput: ServerQuery) -> int:
+        """
+        해당 query의 filter에 해당하는 server 수 (include_total이 estimate면 예상 행 수)
+        """
+        count_query = queryInput.get_filtered_query(query=select(Server.server_id), db_model=Server)
+        return await self.count(count_query, estimate=queryInput.include_total == 'estimate')
 
-    async def find_server_by_id(self, id: UUID, check_alive: Optional[bool] = False) -> Server:
+    async def find_server_by_id(self, id: UUID, check_alive: Optional[bool] = False,
+                                loader: Optional[Callable] = None) -> Server:
         """
         :param check_alive: 해당 행이 유효한지(not deleted)
+        :param loader: (optional) volumes, floatingip을 eager loading 할 loader strategy (ex. selectinload)
         """
-        query = select(Server).filter(Server.server_id == id)
+        query = self.with_loader(select(Server), loader, Server.volumes, Server.floatingip)
+        query = query.filter(Server.server_id == id)
         if check_alive:
             query = query.filter(Server.deleted == False)
-        scalar = await self.db.scalar(query)
-        return scalar
+        scalars = await self.db.scalars(query)
+        return scalars.unique().first()
+
+    async def find_servers_by_ids(self, ids: List[UUID]) -> List[Server]:
+        """
+        해당 id들의 server list (삭제된 server 포함, 없는 id는 제외)
+        """
+        if not ids:
+            return []
+        scalars = await self.db.scalars(select(Server).filter(Server.server_id.in_(ids)))
+        return list(scalars.all())
 
     async def find_server_by_name(self, name: str, check_alive: Optional[bool] = False) -> Optional[Server]:
         query = select(Server).filter(Server.name == name)
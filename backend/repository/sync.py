@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Type
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert
+
+from backend.core.db import Base
+from backend.model.sync import SyncState, SyncTarget
+from backend.repository.base import BaseRepository
+
+
+class SyncRepository(BaseRepository):
+    async def find_high_water_mark(self, target: SyncTarget) -> Optional[datetime]:
+        """
+        :return: 해당 자원의 high water mark (sync한 적이 없다면 None)
+        """
+        syncState = await self.db.get(SyncState, target)
+        return syncState.high_water_mark if syncState is not None else None
+
+    async def save_high_water_mark(self, target: SyncTarget, high_water_mark: Optional[datetime]) -> None:
+        """
+        high water mark를 저장한다 (commit은 호출한 service에서 수행하므로, 자원 변경과 같은 transaction으로 반영된다)
+        """
+        syncState = await self.db.get(SyncState, target) or SyncState(target=target)
+        syncState.high_water_mark = high_water_mark
+        syncState.synced_at = datetime.utcnow()
+        self.db.add(syncState)
+        await self.db.flush()
+
+    async def find_rows(self, model: Type[Base], id_column: str, columns: Sequence[str]) -> Dict[UUID, dict]:
+        """
+        테이블의 전체 행(삭제된 행 포함)을 ORM 객체로 만들지 않고, 해당 column 값만 조회한다
+        :return: {id: {column: value}}
+        """
+        result = await self.db.execute(select(getattr(model, id_column), *[getattr(model, column) for column in columns]))
+        return {row[0]: dict(zip(columns, row[1:])) for row in result}
+
+    async def upsert_rows(self, model: Type[Base], rows: List[dict], update_columns: Sequence[str],
+                          batch_size: int) -> None:
+        """
+        batch_size개씩 INSERT ... ON DUPLICATE KEY UPDATE 문으로 반영한다 (이미 있는 행은 update_columns만 수정)
+        :param rows: 추가할 행의 column 값 (모든 행은 같은 column을 가져야 함)
+        """
+        for i in range(0, len(rows), batch_size):
+            statement = insert(model).values(rows[i:i + batch_size])
+            statement = statement.on_duplicate_key_update({column: statement.inserted[column]
+                                                           for column in update_columns})
+            await self.db.execute(statement)
+
+    async def update_rows(self, model: Type[Base], id_column: str, ids: List[UUID], batch_size: int,
+                          **values) -> None:
+        """
+        batch_size개씩 UPDATE ... SET {values} WHERE id IN (...) 문으로 반영한다 (ex. 삭제 처리(deleted_at))
+        """
+        for i in range(0, len(ids), batch_size):
+            await self.db.execute(update(model)
+                                  .where(getattr(model, id_column).in_(ids[i:i + batch_size]))
+                                  .values(**values)
+                                  .execution_options(synchronize_session=False))
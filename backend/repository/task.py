@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import uuid4
+from sqlalchemy import select, update, or_, and_
+
+from backend.model.task import Task, TaskType, TaskStatus
+from backend.repository.base import BaseRepository
+
+
+class TaskRepository(BaseRepository):
+    async def enqueue_task(self, task_type: TaskType, payload: dict, run_at: Optional[datetime] = None) -> Task:
+        """
+        task를 추가한다 (commit은 호출한 service에서 수행하므로, 자원 변경과 같은 transaction으로 반영된다)
+        :param task_type: task 종류
+        :param payload: task 인자 (json)
+        :param run_at: (optional) 실행 가능 시간 (없다면 즉시)
+        :return: task
+        """
+        utcnow = datetime.utcnow()
+        task = Task(task_type=task_type, payload=payload, status=TaskStatus.PENDING, attempts=0,
+                    run_at=run_at or utcnow, created_at=utcnow, updated_at=utcnow)
+        self.db.add(task)
+        await self.db.flush()
+        return task
+
+    async def claim_tasks(self, limit: int, lease_seconds: float) -> List[Task]:
+        """
+        실행 가능한 task를 limit개까지 점유하고 commit한다
+        - PENDING이고 run_at이 지난 task
+        - RUNNING이지만 점유 시간(locked_until)이 지난 task (worker가 종료된 경우 이어서 실행)
+        다른 worker가 점유중인 row는 건너뛴다 (SELECT ... FOR UPDATE SKIP LOCKED)
+        점유할 때마다 새로운 claim token(locked_by)을 저장하므로, 점유 시간이 지나 다른 worker가 다시 점유한 task는
+        이전 worker가 연장/완료/실패 처리할 수 없다
+        :param limit: 최대 점유 개수
+        :param lease_seconds: 점유 시간(초)
+        :return: 점유한 task list
+        """
+        utcnow = datetime.utcnow()
+        query = (select(Task)
+                 .filter(or_(and_(Task.status == TaskStatus.PENDING, Task.run_at <= utcnow),
+                             and_(Task.status == TaskStatus.RUNNING, Task.locked_until < utcnow)))
+                 .order_by(Task.run_at)
+                 .limit(limit)
+                 .with_for_update(skip_locked=True))
+        tasks = list((await self.db.scalars(query)).all())
+        for task in tasks:
+            task.status = TaskStatus.RUNNING
+            task.attempts += 1
+            task.locked_until = utcnow + timedelta(seconds=lease_seconds)
+            task.locked_by = uuid4().hex
+            task.updated_at = utcnow
+        await self.commit()
+        return tasks
+
+    async def renew_lease(self, task_id: int, locked_by: str, lease_seconds: float) -> bool:
+        """
+        점유중인 task의 점유 시간을 연장하고 commit한다
+        :param locked_by: 점유할 때 받은 claim token
+        :param lease_seconds: 지금부터의 점유 시간(초)
+        :return: 연장 여부 (다른 worker가 다시 점유하였거나 완료된 경우 False)
+        """
+        utcnow = datetime.utcnow()
+        return await self.update_claimed_task(task_id, locked_by,
+                                              locked_until=utcnow + timedelta(seconds=lease_seconds))
+
+    async def complete_task(self, task: Task, locked_by: str) -> bool:
+        """
+        task를 완료 처리하고 commit한다
+        :param locked_by: 점유할 때 받은 claim token
+        :return: 완료 처리 여부 (다른 worker가 다시 점유한 경우 False)
+        """
+        return await self.update_claimed_task(task.task_id, locked_by,
+                                              status=TaskStatus.DONE, locked_until=None, locked_by=None)
+
+    async def fail_task(self, task: Task, locked_by: str, error: str, retry_at: Optional[datetime]) -> bool:
+        """
+        task를 실패 처리하고 commit한다
+        :param locked_by: 점유할 때 받은 claim token
+        :param error: 실패 사유
+        :param retry_at: 재시도 시간 (없다면 FAILED 처리)
+        :return: 실패 처리 여부 (다른 worker가 다시 점유한 경우 False)
+        """
+        return await self.update_claimed_task(task.task_id, locked_by,
+                                              status=TaskStatus.PENDING if retry_at is not None else TaskStatus.FAILED,
+                                              run_at=retry_at or task.run_at, locked_until=None, locked_by=None,
+                                              last_error=error)
+
+    async def update_claimed_task(self, task_id: int, locked_by: str, **values) -> bool:
+        """
+        claim token이 일치하는(아직 점유중인) RUNNING task만 수정하고 commit한다
+        (UPDATE task SET ... WHERE task_id = ? AND locked_by = ? AND status = 'RUNNING')
+        :return: 수정 여부
+        """
+        query = (update(Task)
+                 .where(Task.task_id == task_id, Task.locked_by == locked_by, Task.status == TaskStatus.RUNNING)
+                 .values(**values, updated_at=datetime.utcnow()))
+        result = await self.db.execute(query)
+        await self.commit()
+        return result.rowcount == 1
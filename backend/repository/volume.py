@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Callable
 from uuid import UUID
 from sqlalchemy import select
 
@@ -20,12 +20,14 @@ class VolumeRepository(BaseRepository):
         await self.refresh(volume)
         return volume
 
-    async def find_volumes_by_query(self, queryInput: Optional[VolumeQuery]) -> List[Volume]:
+    async def find_volumes_by_query(self, queryInput: Optional[VolumeQuery],
+                                    loader: Optional[Callable] = None) -> List[Volume]:
         """
         해당 query에 해당하는 volume list를 select
+        :param loader: (optional) 연결된 server를 eager loading 할 loader strategy (ex. selectinload)
         """
         # 1. filter
-        list_query = select(Volume)
+        list_query = self.with_loader(select(Volume), loader, Volume.server)
         list_query = queryInput.get_filtered_query(
             query=list_query, db_model=Volume
         )
@@ -34,23 +36,41 @@ class VolumeRepository(BaseRepository):
             query=list_query, db_model=Volume
         )
         # 3. pagination
-        list_query = queryInput.get_paginated_query(list_query)
+        list_query = queryInput.get_paginated_query(list_query, db_model=Volume)
         scalars = await self.db.scalars(list_query)
 
-        return list(scalars.all())
+        return queryInput.get_paginated_result(list(scalars.unique().all()), db_model=Volume)
 
-    async def find_volume_by_id(self, id: UUID, check_alive: Optional[bool] = False) -> Optional[Volume]:
+    async def count_volumes_by_query(self, queryInput: VolumeQuery) -> int:
+        """
+        해당 query의 filter에 해당하는 volume 수 (include_total이 estimate면 예상 행 수)
+        """
+        count_query = queryInput.get_filtered_query(query=select(Volume.volume_id), db_model=Volume)
+        return await self.count(count_query, estimate=queryInput.include_total == 'estimate')
+
+    async def find_volume_by_id(self, id: UUID, check_alive: Optional[bool] = False,
+                                loader: Optional[Callable] = None) -> Optional[Volume]:
         """
         해당 id(PK)를 갖는 volume 반환
         :param id: PK
         :param check_alive: (optional) delete 된 볼륨도 찾을지 여부
+        :param loader: (optional) 연결된 server를 eager loading 할 loader strategy (ex. selectinload)
         :return: Optional[Volume]
         """
-        query = select(Volume).filter(Volume.volume_id == id)
+        query = self.with_loader(select(Volume), loader, Volume.server).filter(Volume.volume_id == id)
         if check_alive:
             query = query.filter(Volume.deleted_at == None)
-        scalar = await self.db.scalar(query)
-        return scalar
+        scalars = await self.db.scalars(query)
+        return scalars.unique().first()
+
+    async def find_volumes_by_ids(self, ids: List[UUID]) -> List[Volume]:
+        """
+        해당 id들의 volume list (삭제된 volume 포함, 없는 id는 제외)
+        """
+        if not ids:
+            return []
+        scalars = await self.db.scalars(select(Volume).filter(Volume.volume_id.in_(ids)))
+        return list(scalars.all())
 
     async def find_volume_by_name(self, name: str, check_alive: Optional[bool] = False) -> Optional[Volume]:
         """
@@ -1,9 +1,9 @@
 from pydantic import BaseModel
-import json
 from datetime import datetime
 
 from backend.schema.oa_base import OpenstackBaseResponse
 from backend.util.constant import OA_TOKEN_LOGIN_HEADER_FIELD
+from backend.util import codec
 
 
 class TokenCreateRequest(BaseModel):
@@ -17,7 +17,7 @@ class TokenCreateRequest(BaseModel):
         """
         openstack api에 보낼 login request(json)로 변환
         """
-        return json.dumps({
+        return codec.dumps({
             "auth": {
                 "identity": {
                     "methods": [
@@ -45,7 +45,7 @@ class TokenDto(BaseModel):
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse) -> 'TokenDto':
         token = oa_response.headers[OA_TOKEN_LOGIN_HEADER_FIELD]
-        username = oa_response.data['token']['user']['name']
+        username = oa_response.body['token']['user']['name']
         expires_at = datetime.fromisoformat(
-            oa_response.data['token']['expires_at'])  # pydantic 기본 변환시 , response.set_cookie에서 type 충돌이 발생
+            oa_response.body['token']['expires_at'])  # pydantic 기본 변환시 , response.set_cookie에서 type 충돌이 발생
         return TokenDto(username=username, token=token, expires_at=expires_at)
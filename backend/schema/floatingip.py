@@ -1,13 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
-import json
 
 from backend.model.floatingip import FloatingipStatus
 from backend.schema.oa_base import OpenstackBaseResponse
 from backend.core.config import get_setting
-from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic
+from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic, CREATED_AT_FILTER_PATTERN
+from backend.util import codec
 
 SETTINGS = get_setting()
 
@@ -17,12 +17,14 @@ class FloatingipQuery(PaginationQueryBasic, SortQueryBasic, FilterBasic):
     - 검색조건:
         - floatingip_id (equal, in, not)
         - ip_address (equal, like)
+        - created_at (equal, gt, lt, gte, lte, ';'로 범위 지정)
     - 정렬조건:
         - created_at
     """
     sort_by: Optional[str] = Field(default=None, pattern=f'^(created_at)$')
     floatingip_id: Optional[str] = Field(default=None, pattern=f'^(eq|in|not):.+', isFilter=True)
     ip_address: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', isFilter=True)
+    created_at: Optional[str] = Field(default=None, pattern=CREATED_AT_FILTER_PATTERN, isFilter=True)
 
 
 class FloatingipCreateRequest(BaseModel):
@@ -40,7 +42,7 @@ class FloatingipCreateRequest(BaseModel):
         }
         if not self.description:
             del data_dict["description"]
-        return json.dumps({"floatingip": data_dict})
+        return codec.dumps({"floatingip": data_dict})
 
 
 class FloatingipDto(BaseModel):
@@ -63,8 +65,13 @@ class FloatingipDto(BaseModel):
         """
         oa_response -> dto
         """
-        response_dict = oa_response.model_dump()
-        floatingip_response = response_dict['data']['floatingip']
+        return FloatingipDto.parse_floatingip_response(oa_response.body['floatingip'])
+
+    @staticmethod
+    def parse_floatingip_response(floatingip_response: dict) -> 'FloatingipDto':
+        """
+        openstack 응답의 floatingip 객체(dict) -> dto
+        """
         return FloatingipDto(
             floatingip_id=floatingip_response['id'],
             ip_address=floatingip_response['floating_ip_address'],
@@ -79,6 +86,25 @@ class FloatingipDto(BaseModel):
         )
 
 
+class FloatingipStatusDto(BaseModel):
+    """
+    floatingip list 조회시 id, status field만 projection한 결과
+    """
+    floatingip_id: UUID
+    status: FloatingipStatus
+
+    @staticmethod
+    def deserialize(oa_response: OpenstackBaseResponse) -> List['FloatingipStatusDto']:
+        """
+        oa_response(/floatingips?fields=id&fields=status) -> dto list
+        """
+        floatingip_list_response = oa_response.body['floatingips']
+        return [FloatingipStatusDto(
+            floatingip_id=floatingip_response['id'],
+            status=floatingip_response['status']
+        ) for floatingip_response in floatingip_list_response]
+
+
 class FloatingipUpdateRequest(BaseModel):
     description: Optional[str] = Field(None, max_length=255)
 
@@ -91,7 +117,7 @@ class FloatingipUpdateRequest(BaseModel):
         }
         if not self.description:
             del data_dict["description"]
-        return json.dumps({"floatingip": data_dict})
+        return codec.dumps({"floatingip": data_dict})
 
 
 class FloatingipUpdatePortRequest(BaseModel):
@@ -101,7 +127,7 @@ class FloatingipUpdatePortRequest(BaseModel):
         data_dict = {
             "port_id": f"{self.port_id}" if self.port_id else None,
         }
-        return json.dumps({"floatingip": data_dict})
+        return codec.dumps({"floatingip": data_dict})
 
 
 class FloatingipRemainLimitDto(BaseModel):
@@ -109,8 +135,8 @@ class FloatingipRemainLimitDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse) -> 'FloatingipRemainLimitDto':
-        response_dict = oa_response.model_dump()
-        quota_response = response_dict['data']['quota']
+        response_body = oa_response.body
+        quota_response = response_body['quota']
         floatingip_quota = quota_response.get('floatingip')
         return FloatingipRemainLimitDto(
             remain_cnt=floatingip_quota.get('limit') - floatingip_quota.get('used') - floatingip_quota.get('reserved')
@@ -1,6 +1,11 @@
 from pydantic import BaseModel, Field
 from aiohttp import ClientResponse
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from backend.util import codec
+
+EMPTY_BODY: Mapping[str, Any] = MappingProxyType({})
 
 class OpenstackBaseRequest(BaseModel):
     """
@@ -18,17 +23,30 @@ class OpenstackBaseResponse(BaseModel):
     """
     Openstack API에 응답을 받기 위한 형식
     - status : HTTP status
-    - headers : dict 형식의 헤더
+    - headers : 응답 헤더 (mapping)
     - data : dict 형식의 response body
+    응답은 request cache, single-flight를 통해 여러 요청에서 공유되므로 수정하지 않고 body로 읽는다
     """
     status: int
-    headers: Optional[dict] = Field(None)
+    headers: Optional[Mapping[str, str]] = Field(None)
     data: Optional[dict] = Field(None)
 
+    @property
+    def body(self) -> Mapping[str, Any]:
+        """
+        response body의 읽기 전용 view (model_dump와 달리 검증 & 복사 없이 파싱된 body를 그대로 참조)
+        """
+        return MappingProxyType(self.data) if self.data is not None else EMPTY_BODY
+
     @staticmethod
     async def mapper(response: ClientResponse):
         """
         ClientResponse(aiohttp의 응답 결과)를 OpenstackBaseResponse로 변환
+        파싱된 body와 헤더(CIMultiDictProxy, 읽기 전용)는 검증 & 복사 없이 그대로 사용한다 (model_construct)
+        body는 문자열로 decode하지 않고 bytes에서 바로 파싱한다 (codec)
         """
-        return OpenstackBaseResponse(status=response.status, headers=response.headers,
-                                     data=await response.json() if response.content_type == 'application/json' else None)
+        data = None
+        if response.content_type == 'application/json':
+            body = await response.read()
+            data = codec.loads(body) if body.strip() else None
+        return OpenstackBaseResponse.model_construct(status=response.status, headers=response.headers, data=data)
@@ -1,27 +1,179 @@
+import base64
+import operator
+from datetime import datetime, timezone
+from functools import lru_cache
 from uuid import UUID
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
-from sqlalchemy import Column, Uuid
-from sqlalchemy.sql import Select, desc
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Literal, Tuple, Type, TypeVar
+from sqlalchemy import Column, Uuid, DateTime, and_, or_, inspect
+from sqlalchemy.sql import ColumnElement, Select, desc
 from fastapi import status
 
 from backend.core.db import Base
 from backend.core.exception import ApiServerException
+from backend.util import codec
+from backend.util.constant import ERR_INVALID_CURSOR
+
+T = TypeVar('T', bound=Base)
+# cursor에 담을 수 있는 값의 type (json scalar)
+CURSOR_VALUE_TYPES = (str, int, float, bool)
+
+# 생성시간 filter (ex. gte:2024-01-01T00:00:00;lt:2024-02-01T00:00:00)
+CREATED_AT_FILTER_PATTERN = r'^(eq|gt|lt|gte|lte):[^;]+(;(gt|lt|gte|lte):[^;]+)?$'
 
 
 class PaginationQueryBasic(BaseModel):
     """
     list api에서 Pagination을 위한 스키마
 
+    - page mode (기본) : OFFSET (page-1)*per_page 부터 per_page개
+    - cursor mode (cursor가 주어진 경우) : 정렬 기준(sort_by) 값과 PK가 cursor 이후인 행부터 per_page개 (keyset pagination)
+        - 건너뛴 행을 읽지 않으므로, 페이지 깊이와 관계없이 일정한 시간에 조회한다
+        - 첫 페이지는 빈 cursor(cursor=)로 요청하고, 다음 페이지는 응답의 X-Next-Cursor 값으로 요청한다 (마지막 페이지는 헤더 없음)
+
+    전체 행 수(include_total)는 filter만 적용한 query로 센다 (X-Total-Count 헤더)
+
     :param page: 요청 페이지
     :param per_page: 페이지당 갯수
+    :param cursor: 이전 페이지 응답의 next_cursor
+    :param include_total: exact(정확한 행 수) / estimate(index 통계로 예상한 행 수, 큰 테이블에서 사용)
     """
     page: Optional[int] = Field(default=1, ge=1)
     per_page: Optional[int] = Field(default=10, ge=1)
+    cursor: Optional[str] = Field(default=None)
+    include_total: Optional[Literal['exact', 'estimate']] = Field(default=None)
+    _next_cursor: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """
+        cursor mode에서 다음 페이지가 있는 경우, 다음 페이지의 cursor (get_paginated_result 이후 설정됨)
+        """
+        return self._next_cursor
+
+    def get_paginated_query(self, query: Select, db_model: Optional[Type[Base]] = None) -> Select:
+        """
+        cursor mode에서는 정렬 기준이 같은 행을 PK 순서로 정렬하고, 다음 페이지 여부를 알기 위해 per_page + 1개를 조회한다
+        (get_sorted_query를 적용한 query에 사용해야 한다)
+        :param db_model: cursor mode에서 정렬 기준, PK column을 찾을 model
+        :raises: ApiServerException: 400(올바르지 않은 cursor)
+        """
+        if self.cursor is None:
+            strt_idx = (self.page - 1) * self.per_page
+            return query.offset(strt_idx).limit(self.per_page)
+        if db_model is None:
+            raise ApiServerException(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        sort_column, id_column, descending = self.__get_keyset_columns(db_model)
+        if self.cursor:
+            sort_value, id_value = self.__decode_cursor(sort_column, id_column)
+            query = query.filter(get_keyset_condition(sort_column, id_column, descending, sort_value, id_value))
+        query = query.order_by(desc(id_column) if descending else id_column)
+        return query.limit(self.per_page + 1)
+
+    def get_paginated_result(self, rows: List[T], db_model: Type[T]) -> List[T]:
+        """
+        cursor mode에서 per_page개를 넘게 조회된 경우, per_page개만 리턴하고 마지막 행으로 next_cursor를 만든다
+        :param rows: get_paginated_query로 조회한 행
+        """
+        if self.cursor is None or len(rows) <= self.per_page:
+            return rows
+        rows = rows[:self.per_page]
+        sort_column, id_column, _ = self.__get_keyset_columns(db_model)
+        last = rows[-1]
+        sort_value = getattr(last, sort_column.key) if sort_column is not None else None
+        self._next_cursor = encode_cursor([self.__get_sort_key(), to_cursor_value(sort_value),
+                                           to_cursor_value(getattr(last, id_column.key))])
+        return rows
+
+    def __get_sort_key(self) -> Optional[str]:
+        """
+        cursor를 만든 정렬 조건 (정렬 조건이 바뀐 cursor는 사용할 수 없다)
+        """
+        sort_by = getattr(self, 'sort_by', None)
+        return f'{sort_by}:{getattr(self, "order_by", None) or "asc"}' if sort_by else None
+
+    def __get_keyset_columns(self, db_model: Type[Base]) -> Tuple[Optional[Column], Column, bool]:
+        """
+        :return: 정렬 기준 column(없으면 None), PK column, 내림차순 여부
+        """
+        sort_by = getattr(self, 'sort_by', None)
+        id_column = inspect(db_model).primary_key[0]
+        if not sort_by:
+            return None, id_column, False
+        return getattr(db_model, sort_by), id_column, getattr(self, 'order_by', None) == 'desc'
+
+    def __decode_cursor(self, sort_column: Optional[Column], id_column: Column) -> Tuple[Any, Any]:
+        try:
+            sort_key, sort_value, id_value = decode_cursor(self.cursor)
+            if sort_key != self.__get_sort_key():
+                raise ValueError('sort condition changed')
+            if sort_column is not None:
+                sort_value = from_cursor_value(sort_column, sort_value)
+            return sort_value, from_cursor_value(id_column, id_value)
+        except Exception:  # 변조된 cursor의 모든 decode 오류(ex. base64, json, 값의 type)는 400
+            raise ApiServerException(status=status.HTTP_400_BAD_REQUEST, message=ERR_INVALID_CURSOR)
+
+
+def get_keyset_condition(sort_column: Optional[Column], id_column: Column, descending: bool,
+                         sort_value: Any, id_value: Any) -> ColumnElement:
+    """
+    (정렬 기준, PK) 순서에서 cursor(sort_value, id_value) 이후의 행 조건
+    MySQL은 NULL을 가장 작은 값으로 정렬하므로 (오름차순에서 처음, 내림차순에서 마지막), NULL인 정렬 기준도 이어서 조회한다
+    """
+    if sort_column is None:
+        return id_column < id_value if descending else id_column > id_value
+    if not descending:
+        if sort_value is None:
+            return or_(and_(sort_column.is_(None), id_column > id_value), sort_column.is_not(None))
+        return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > id_value))
+    if sort_value is None:
+        return and_(sort_column.is_(None), id_column < id_value)
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < id_value),
+               sort_column.is_(None))
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(codec.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list:
+    """
+    cursor를 [정렬 조건, 정렬 기준 값, PK 값]으로 decode한다
+    정렬 조건은 문자열, 값은 json scalar(문자열, 숫자, bool)이어야 한다 (정렬 조건, 정렬 기준 값은 null 가능)
+    :raises: ValueError: 올바르지 않은 cursor
+    """
+    values = codec.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    if not isinstance(values, list) or len(values) != 3:
+        raise ValueError('invalid cursor')
+    sort_key, sort_value, id_value = values
+    if (not (sort_key is None or isinstance(sort_key, str)) or not isinstance(id_value, CURSOR_VALUE_TYPES)
+            or not (sort_value is None or isinstance(sort_value, CURSOR_VALUE_TYPES))):
+        raise ValueError('invalid cursor value type')
+    return values
+
+
+def to_cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
 
-    def get_paginated_query(self, query: Select) -> Select:
-        strt_idx = (self.page - 1) * self.per_page
-        return query.offset(strt_idx).limit(self.per_page)
+def from_cursor_value(column: Column, value: Any) -> Any:
+    """
+    cursor의 값을 column type의 값으로 변환한다
+    :raises: ValueError: column type으로 변환할 수 없는 경우
+    """
+    if value is None:
+        return None
+    if isinstance(column.type, (DateTime, Uuid)) and not isinstance(value, str):
+        raise ValueError(f'{column.key} cursor value must be a string')
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Uuid):
+        return UUID(value)
+    return value
 
 
 class SortQueryBasic(BaseModel):
@@ -45,42 +197,101 @@ class SortQueryBasic(BaseModel):
         return query
 
 
+class FilterField(NamedTuple):
+    """
+    query schema의 filter 필드 하나를 처리하는 방법 (get_filter_plan에서 query class별로 한 번 만든다)
+
+    :param name: 필드 이름 (db model의 column 이름과 같음)
+    :param db_field: db model의 column
+    :param operators: 사용 가능한 연산자
+    :param parse: 문자열 value를 column type의 값으로 변환하는 함수 (ValueError : 올바르지 않은 값)
+    :param error_message: 변환할 수 없는 값인 경우 400 응답의 message
+    :param is_range: 여러 조건을 ';'로 이어서 받는지 여부 (ex. gte:2024-01-01T00:00:00;lt:2024-02-01T00:00:00)
+    """
+    name: str
+    db_field: Column
+    operators: FrozenSet[str]
+    parse: Callable[[str], Any]
+    error_message: Optional[str]
+    is_range: bool
+
+    def get_conditions(self, raw_filter_str: str) -> List[ColumnElement]:
+        """
+        :param raw_filter_str: {op}:{value} (ex. like:2, in:1,2, gte:2024-01-01T00:00:00)
+        :raises: ApiServerException: 400(올바르지 않은 값), 500(schema에 정의되지 않은 연산자)
+        """
+        conditions = []
+        for condition_str in (raw_filter_str.split(';') if self.is_range else [raw_filter_str]):
+            op, _, value = condition_str.partition(':')
+            if op not in self.operators:
+                # schema의 pattern과 column type에서 사용 가능한 연산자로 구성되어 있어야함
+                raise ApiServerException(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            try:
+                if op == 'like':
+                    conditions.append(self.db_field.like(f'%{value}%'))
+                elif op == 'in':
+                    conditions.append(self.db_field.in_([self.parse(el) for el in value.split(',')]))
+                else:
+                    conditions.append(FILTER_OPERATORS[op](self.db_field, self.parse(value)))
+            except ValueError:
+                raise ApiServerException(status=status.HTTP_400_BAD_REQUEST, message=self.error_message)
+        return conditions
+
+
+FILTER_OPERATORS: Dict[str, Callable[[Column, Any], ColumnElement]] = {
+    'eq': operator.eq,
+    'not': operator.ne,
+    'gt': operator.gt,
+    'lt': operator.lt,
+    'gte': operator.ge,
+    'lte': operator.le,
+}
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    ISO 8601 문자열 -> DB와 같은 timezone 없는 UTC
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def get_filter_plan(query_class: Type[BaseModel], db_model: Type[Base]) -> Tuple[FilterField, ...]:
+    """
+    query class에서 isFilter로 선언한 필드의 filter 처리 방법 (query class, db model별로 한 번만 계산)
+    """
+    plan = []
+    for field_name, field_info in query_class.model_fields.items():
+        if not (field_info.json_schema_extra and 'isFilter' in field_info.json_schema_extra):
+            continue
+        db_field: Column = getattr(db_model, field_name)
+        if isinstance(db_field.type, Uuid):
+            plan.append(FilterField(field_name, db_field, frozenset({'eq', 'not', 'in'}), UUID,
+                                    'Should be Valid UUID', False))
+        elif isinstance(db_field.type, DateTime):
+            plan.append(FilterField(field_name, db_field, frozenset({'eq', 'not', 'gt', 'lt', 'gte', 'lte'}),
+                                    parse_datetime, 'Should be Valid datetime (ISO 8601)', True))
+        else:
+            plan.append(FilterField(field_name, db_field, frozenset({'eq', 'not', 'in', 'like'}), str, None, False))
+    return tuple(plan)
+
+
 class FilterBasic(BaseModel):
+    """
+    list api에서 검색을 위한 스키마
+
+    Field(..., isFilter=True)로 선언한 필드를 {op}:{value} 형식으로 받아, 같은 이름의 column 조건으로 변환한다
+    - uuid : eq, not, in
+    - datetime : eq, not, gt, lt, gte, lte (';'로 범위 조건을 이어서 사용 가능)
+    - 그 외 : eq, not, in, like
+    """
+
     def get_filtered_query(self, query: Select, db_model: Base) -> Select:
-        for field_name, field_info in self.model_fields.items():
-            if field_info.json_schema_extra and 'isFilter' in field_info.json_schema_extra:
-                if hasattr(self, field_name) and getattr(self, field_name):
-                    raw_filter_str: str = getattr(self, field_name)  # ex) like:2
-                    op, value = raw_filter_str.split(':')
-                    db_field: Column = getattr(db_model, field_name)
-                    # 1. db_field가 uuid인 경우 (eq, not, in) => value를 uuid 타입으로 변환해야함
-                    if isinstance(db_field.type, Uuid):
-                        try:
-                            if op == 'eq':
-                                query = query.filter(db_field == UUID(value))
-                            elif op == 'not':
-                                query = query.filter(db_field != UUID(value))
-                            elif op == 'in':
-                                in_list = list(map(UUID, value.split(',')))
-                                query = query.filter(db_field.in_(in_list))
-                            else:
-                                # eq, in, not, like로 구성되어 있어야함
-                                raise ApiServerException(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                        except ValueError:
-                            # 올바르지 않은 uuid 입력시 400 에러 발생
-                            raise ApiServerException(status=status.HTTP_400_BAD_REQUEST, message='Should be Valid UUID')
-                    else:
-                        if op == 'eq':
-                            query = query.filter(db_field == value)
-                        elif op == 'in':
-                            # check value is valid list
-                            in_list = value.split(',')
-                            query = query.filter(db_field.in_(in_list))
-                        elif op == 'not':
-                            query = query.filter(db_field != value)
-                        elif op == 'like':
-                            query = query.filter(db_field.like(f'%{value}%'))
-                        else:
-                            # eq, in, not, like로 구성되어 있어야함
-                            raise ApiServerException(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        for filterField in get_filter_plan(type(self), db_model):
+            raw_filter_str: Optional[str] = getattr(self, filterField.name)
+            if raw_filter_str:
+                query = query.filter(*filterField.get_conditions(raw_filter_str))
         return query
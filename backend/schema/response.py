@@ -1,13 +1,83 @@
+import asyncio
+from aiohttp import ClientError
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional, Dict, Callable, Awaitable, TypeVar
 from uuid import UUID
 from pydantic import BaseModel, Field
 
 from backend.client import neutron_client, nova_client, cinder_client
-from backend.core.exception import OpenstackClientException
+from backend.core.config import get_setting
+from backend.core.exception import OpenstackClientException, OpenstackUnavailableException
+from backend.core.status_cache import (CheckedStatus, server_status_cache, volume_status_cache,
+                                       floatingip_status_cache)
 from backend.model.floatingip import Floatingip, FloatingipStatus
 from backend.model.server import Server, ServerStatus
 from backend.model.volume import Volume, VolumeStatus
+from backend.util.func import gather_with_concurrency
+
+SETTINGS = get_setting()
+# 상태 조회 실패로 간주하는 예외 (토큰 만료 등 ApiServerException은 그대로 전파)
+STATUS_LOOKUP_EXCEPTIONS = (OpenstackClientException, OpenstackUnavailableException, ClientError, asyncio.TimeoutError)
+# list api가 요청을 처리하지 못한 경우(필터 미지원, URI 길이 초과 등)의 응답 상태 (자원별 조회로 대신함)
+LIST_FALLBACK_STATUSES = (400, 404, 413, 414)
+S = TypeVar('S')
+# 응답하는 자원 상태의 조회 방식 (db: DB에 기록된 마지막 상태, openstack 요청 없음 / live: openstack에서 조회)
+Freshness = Literal['db', 'live']
+
+
+def get_stored_status(db_model: Floatingip | Server | Volume, unknown_status: S, deleted_status: S) -> S:
+    """
+    freshness=db인 경우 응답할 상태 (삭제된 행은 deleted, 상태를 기록한 적 없다면 unknown_status)
+    """
+    if db_model.deleted:
+        return deleted_status
+    return db_model.status if db_model.status is not None else unknown_status
+
+
+async def get_status_map_by_ids(ids: List[UUID], token: str,
+                                get_status_map: Callable[..., Awaitable[Dict[UUID, CheckedStatus[S]]]],
+                                get_status: Callable[..., Awaitable[CheckedStatus[S]]],
+                                unknown_status: S) -> Dict[UUID, CheckedStatus[S]]:
+    """
+    list api 한 번으로 여러 자원의 상태를 조회하고, list api가 요청을 처리하지 못한 경우(LIST_FALLBACK_STATUSES)와
+    list 결과에서 확인하지 못한 자원(ex. RESPONSE_STATUS_LIST_MAX_PAGES 안에서 찾지 못한 서버, 볼륨)만 자원별로 상태를 조회한다.
+    component 장애(5XX, timeout, 연결 오류, circuit breaker 차단)인 경우에는
+    자원별 조회도 실패할 가능성이 높으므로 요청을 늘리지 않고 모든 자원의 조회를 실패로 처리한다.
+
+    자원별 조회는 최대 RESPONSE_STATUS_CONCURRENCY개까지 동시에 요청한다
+    (ex. 50개, 동시 요청 10개 -> 약 5번의 왕복)
+    조회에 실패한 경우 RESPONSE_STATUS_FAILURE_POLICY에 따라 예외를 발생시키거나(raise) unknown_status로 간주한다(unknown)
+    :param ids: 자원 id list
+    :param token: 인증 토큰
+    :param get_status_map: list api로 상태를 조회하는 함수 (ids, token), 확인하지 못한 자원은 결과에 포함하지 않는다
+    :param get_status: 단일 자원의 상태를 조회하는 함수 (id, token)
+    :param unknown_status: 상태 조회 실패시 사용할 상태
+    :return: Dict[UUID, CheckedStatus] (자원 id -> 상태와 조회한 시간)
+    """
+    if not ids:
+        return {}
+    try:
+        status_map = await get_status_map(ids=ids, token=token)
+    except STATUS_LOOKUP_EXCEPTIONS as e:
+        if not isinstance(e, OpenstackClientException) or e.status not in LIST_FALLBACK_STATUSES:
+            if SETTINGS.RESPONSE_STATUS_FAILURE_POLICY == 'unknown':
+                return {id: CheckedStatus(unknown_status, None) for id in ids}
+            raise e
+        status_map = {}
+    missing_ids = [id for id in ids if id not in status_map]
+
+    async def get_status_by_policy(id: UUID) -> CheckedStatus[S]:
+        try:
+            return await get_status(id=id, token=token)
+        except STATUS_LOOKUP_EXCEPTIONS as e:
+            if SETTINGS.RESPONSE_STATUS_FAILURE_POLICY == 'unknown':
+                return CheckedStatus(unknown_status, None)
+            raise e
+
+    statuses = await gather_with_concurrency(get_status_by_policy, missing_ids,
+                                             limit=SETTINGS.RESPONSE_STATUS_CONCURRENCY)
+    status_map.update(zip(missing_ids, statuses))
+    return status_map
 
 
 class ServerOverallResponse(BaseModel):
@@ -72,19 +142,31 @@ class FloatingipResponse(BaseModel):
     server: Optional[ServerOverallResponse]
     network_id: UUID
     status: str
+    status_checked_at: Optional[datetime] = Field(default=None, description='상태를 확인한 시간')
     description: str
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
 
     @staticmethod
-    async def mapper(el: Floatingip | list[Floatingip], token: str) -> 'FloatingipResponse' | List[
-        'FloatingipResponse']:
+    async def mapper(el: Floatingip | list[Floatingip], token: str, status: Optional[FloatingipStatus] = None,
+                     freshness: Freshness = 'live',
+                     status_checked_at: Optional[datetime] = None) -> 'FloatingipResponse' | List['FloatingipResponse']:
+        """
+        :param status: (optional) 이미 조회한 floatingip 상태 (없다면 freshness에 따라 DB의 상태를 사용하거나 NEUTRON으로 조회)
+        :param status_checked_at: (optional) status를 조회한 시간
+        :param freshness: db(DB에 기록된 상태, NEUTRON 요청 없음) / live(NEUTRON으로 조회)
+        """
         if isinstance(el, Floatingip):
             floatingip = el
             server = await floatingip.awaitable_attrs.server
+            if freshness == 'db':
+                status = get_stored_status(floatingip, FloatingipStatus.UNKNOWN, FloatingipStatus.DELETED)
+                status_checked_at = floatingip.status_checked_at
             # get latest floatingip status
-            status = await get_floatingip_status_by_id_or_deleted(id=floatingip.floatingip_id, token=token)
+            elif status is None:
+                status, status_checked_at = await get_floatingip_status_by_id_or_deleted(
+                    id=floatingip.floatingip_id, token=token)
             return FloatingipResponse(
                 floatingip_id=floatingip.floatingip_id,
                 ip_address=floatingip.ip_address,
@@ -92,32 +174,72 @@ class FloatingipResponse(BaseModel):
                 server=ServerOverallResponse.mapper(server),
                 network_id=floatingip.fk_network_id,
                 status=status,
+                status_checked_at=status_checked_at,
                 description=floatingip.description,
                 created_at=floatingip.created_at,
                 updated_at=floatingip.updated_at,
                 deleted_at=floatingip.deleted_at
             )
         floatingip_list = el
-        return [await FloatingipResponse.mapper(el=floatingip, token=token) for floatingip in floatingip_list]
+        if freshness == 'db':
+            return [await FloatingipResponse.mapper(el=floatingip, token=token, freshness=freshness)
+                    for floatingip in floatingip_list]
+        # 한 번의 list 요청으로 page 내 모든 floatingip의 상태를 조회 (실패시 제한된 동시성으로 개별 조회)
+        status_map = await get_status_map_by_ids(
+            ids=[floatingip.floatingip_id for floatingip in floatingip_list], token=token,
+            get_status_map=get_floatingip_status_map_by_ids_or_deleted,
+            get_status=get_floatingip_status_by_id_or_deleted, unknown_status=FloatingipStatus.UNKNOWN)
+        # 상태는 이미 조회했으므로 순서대로 mapping (같은 AsyncSession을 동시에 사용할 수 없음)
+        return [await FloatingipResponse.mapper(el=floatingip, token=token,
+                                                status=status_map[floatingip.floatingip_id].status,
+                                                status_checked_at=status_map[floatingip.floatingip_id].checked_at)
+                for floatingip in floatingip_list]
 
 
-async def get_floatingip_status_by_id_or_deleted(id: UUID, token: str) -> FloatingipStatus:
+async def get_floatingip_status_by_id_or_deleted(id: UUID, token: str) -> CheckedStatus[FloatingipStatus]:
     """
     NEUTRON 이용하여 floatingip의 상태를 조회한다.
 
     해당 id가 DB에 존재하지만, openstack에 존재하지 않는 경우에는 floatingip의 상태를 deleted로 간주한다.
+    최근에 조회한 상태는 floatingip_status_cache에서 리턴한다 (stale-while-revalidate)
     :param id: floatingip id
     :param token: 인증 토큰
-    :return: FloatingipStatus(유동ip 상태)
+    :return: CheckedStatus(FloatingipStatus(유동ip 상태), 조회한 시간)
     """
-    try:
-        floatingipDto = await neutron_client.show_floating_ip_details(id, token)
-        return floatingipDto.status
-    except OpenstackClientException as e:
-        if e.status == 404:
-            return FloatingipStatus.DELETED
-        else:
-            raise e
+
+    async def load(token: str) -> FloatingipStatus:
+        try:
+            floatingipDto = await neutron_client.show_floating_ip_details(id, token)
+            return floatingipDto.status
+        except OpenstackClientException as e:
+            if e.status == 404:
+                return FloatingipStatus.DELETED
+            else:
+                raise e
+
+    return await floatingip_status_cache.get_or_load(id, load, token)
+
+
+async def get_floatingip_status_map_by_ids_or_deleted(ids: List[UUID],
+                                                      token: str) -> Dict[UUID, CheckedStatus[FloatingipStatus]]:
+    """
+    NEUTRON list api(/floatingips) 한 번으로 여러 floatingip의 상태를 조회한다. (id, status field만 조회)
+
+    openstack에 존재하지 않는 id의 경우에는 floatingip의 상태를 deleted로 간주한다.
+    :param ids: floatingip id list
+    :param token: 인증 토큰
+    :return: Dict[UUID, CheckedStatus] (floatingip id -> 유동ip 상태와 조회한 시간)
+    """
+    # list 요청 도중 invalidate된(상태를 변경한) 자원의 결과는 cache에 저장하지 않음
+    version = floatingip_status_cache.get_version()
+    floatingipStatusDtos = await neutron_client.list_floating_ips(token=token, ids=ids)
+    checked_at = datetime.utcnow()
+    found_status_map = {floatingipStatusDto.floatingip_id: floatingipStatusDto.status
+                        for floatingipStatusDto in floatingipStatusDtos}
+    status_map = {id: CheckedStatus(found_status_map.get(id, FloatingipStatus.DELETED), checked_at) for id in ids}
+    for id, checked_status in status_map.items():
+        floatingip_status_cache.set(id, checked_status, version)
+    return status_map
 
 
 class ServerResponse(BaseModel):
@@ -133,6 +255,7 @@ class ServerResponse(BaseModel):
     port_id: Optional[UUID]
     fixed_address: Optional[str]
     status: str
+    status_checked_at: Optional[datetime] = Field(default=None, description='상태를 확인한 시간')
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
@@ -140,14 +263,28 @@ class ServerResponse(BaseModel):
     floatingip: Optional[FloatingipOverallResponse]
 
     @staticmethod
-    async def mapper(el: Server | List[Server], token: str) -> 'ServerResponse' | List['ServerResponse']:
+    async def mapper(el: Server | List[Server], token: str, status: Optional[ServerStatus] = None,
+                     freshness: Freshness = 'live',
+                     status_checked_at: Optional[datetime] = None) -> 'ServerResponse' | List['ServerResponse']:
+        """
+        :param status: (optional) 이미 조회한 서버 상태 (없다면 freshness에 따라 DB의 상태를 사용하거나 NOVA로 조회)
+        :param status_checked_at: (optional) status를 조회한 시간
+        :param freshness: db(DB에 기록된 상태, NOVA 요청 없음) / live(NOVA로 조회)
+        """
         if isinstance(el, Server):
             server = el
             # awaitable relationships
             volumes = await server.awaitable_attrs.volumes
             floatingip = await server.awaitable_attrs.floatingip
+            if freshness == 'db':
+                cur_status = get_stored_status(server, ServerStatus.UNKNOWN, ServerStatus.DELETED)
+                status_checked_at = server.status_checked_at
             # get latest server status
-            cur_status = await get_server_status_by_id_or_deleted(id=server.server_id, token=token)
+            elif status is None:
+                cur_status, status_checked_at = await get_server_status_by_id_or_deleted(id=server.server_id,
+                                                                                         token=token)
+            else:
+                cur_status = status
             return ServerResponse(
                 server_id=server.server_id,
                 name=server.name,
@@ -158,6 +295,7 @@ class ServerResponse(BaseModel):
                 port_id=server.fk_port_id,
                 fixed_address=server.fixed_address,
                 status=cur_status,
+                status_checked_at=status_checked_at,
                 created_at=server.created_at,
                 updated_at=server.updated_at,
                 deleted_at=server.deleted_at,
@@ -165,27 +303,67 @@ class ServerResponse(BaseModel):
                 floatingip=FloatingipOverallResponse.mapper(floatingip)
             )
         server_list = el
-        return [await ServerResponse.mapper(el=server, token=token) for server in server_list]
+        if freshness == 'db':
+            return [await ServerResponse.mapper(el=server, token=token, freshness=freshness) for server in server_list]
+        # DB에서 삭제된 서버는 조회하지 않고, 나머지는 한 번의 list 요청으로 상태를 조회 (실패시 제한된 동시성으로 개별 조회)
+        status_map = {server.server_id: CheckedStatus(ServerStatus.DELETED, server.status_checked_at)
+                      for server in server_list if server.deleted}
+        status_map.update(await get_status_map_by_ids(
+            ids=[server.server_id for server in server_list if not server.deleted], token=token,
+            get_status_map=get_server_status_map_by_ids,
+            get_status=get_server_status_by_id_or_deleted, unknown_status=ServerStatus.UNKNOWN))
+        # 상태는 이미 조회했으므로 순서대로 mapping (같은 AsyncSession을 동시에 사용할 수 없음)
+        return [await ServerResponse.mapper(el=server, token=token, status=status_map[server.server_id].status,
+                                            status_checked_at=status_map[server.server_id].checked_at)
+                for server in server_list]
 
 
-async def get_server_status_by_id_or_deleted(id: UUID, token: str) -> ServerStatus:
+async def get_server_status_by_id_or_deleted(id: UUID, token: str) -> CheckedStatus[ServerStatus]:
     """
     NOVA 이용하여 서버의 상태를 조회한다.
 
     해당 id가 DB에 존재하지만, openstack에 존재하지 않는 경우에는 서버의 상태를 deleted로 간주한다.
 
+    최근에 조회한 상태는 server_status_cache에서 리턴한다 (stale-while-revalidate)
+
     :param id: server id
     :param token: 인증 토큰
-    :return: ServerStatus(서버 상태)
+    :return: CheckedStatus(ServerStatus(서버 상태), 조회한 시간)
     """
-    try:
-        serverDto = await nova_client.show_server_details(id=id, token=token)
-        return serverDto.status
-    except OpenstackClientException as e:
-        if e.status == 404:
-            return ServerStatus.DELETED
-        else:
-            raise e
+
+    async def load(token: str) -> ServerStatus:
+        try:
+            serverDto = await nova_client.show_server_details(id=id, token=token)
+            return serverDto.status
+        except OpenstackClientException as e:
+            if e.status == 404:
+                return ServerStatus.DELETED
+            else:
+                raise e
+
+    return await server_status_cache.get_or_load(id, load, token)
+
+
+async def get_server_status_map_by_ids(ids: List[UUID], token: str) -> Dict[UUID, CheckedStatus[ServerStatus]]:
+    """
+    NOVA list api(/servers/detail)로 여러 서버의 상태를 조회한다.
+
+    nova는 id로 필터링할 수 없으므로 RESPONSE_STATUS_LIST_MAX_PAGES 페이지까지만 조회한다.
+    찾지 못한 서버는 결과에 포함하지 않는다 (삭제 여부는 자원별 조회로 확인).
+
+    :param ids: server id list
+    :param token: 인증 토큰
+    :return: Dict[UUID, CheckedStatus] (server id -> 서버 상태와 조회한 시간)
+    """
+    # list 요청 도중 invalidate된(상태를 변경한) 자원의 결과는 cache에 저장하지 않음
+    version = server_status_cache.get_version()
+    serverDtos = await nova_client.list_servers_with_details(token=token, ids=ids,
+                                                             max_pages=SETTINGS.RESPONSE_STATUS_LIST_MAX_PAGES)
+    checked_at = datetime.utcnow()
+    status_map = {serverDto.server_id: CheckedStatus(serverDto.status, checked_at) for serverDto in serverDtos}
+    for id, checked_status in status_map.items():
+        server_status_cache.set(id, checked_status, version)
+    return status_map
 
 
 class VolumeResponse(BaseModel):
@@ -198,18 +376,30 @@ class VolumeResponse(BaseModel):
     project_id: UUID
     image_id: Optional[UUID] = Field(default=None)
     status: str
+    status_checked_at: Optional[datetime] = Field(default=None, description='상태를 확인한 시간')
     created_at: datetime
     updated_at: Optional[datetime] = Field(default=None)
     deleted_at: Optional[datetime] = Field(default=None)
 
     @staticmethod
-    async def mapper(el: Volume | list[Volume], token: str) -> 'VolumeResponse' | List['VolumeResponse']:
+    async def mapper(el: Volume | list[Volume], token: str, status: Optional[VolumeStatus] = None,
+                     freshness: Freshness = 'live',
+                     status_checked_at: Optional[datetime] = None) -> 'VolumeResponse' | List['VolumeResponse']:
+        """
+        :param status: (optional) 이미 조회한 볼륨 상태 (없다면 freshness에 따라 DB의 상태를 사용하거나 CINDER로 조회)
+        :param status_checked_at: (optional) status를 조회한 시간
+        :param freshness: db(DB에 기록된 상태, CINDER 요청 없음) / live(CINDER로 조회)
+        """
         if isinstance(el, Volume):
             volume = el
             # awaitable attrs
             server_attached = await volume.awaitable_attrs.server
+            if freshness == 'db':
+                status = get_stored_status(volume, VolumeStatus.UNKNOWN, VolumeStatus.DELETED)
+                status_checked_at = volume.status_checked_at
             # get latest volume status
-            status = await get_volume_status_by_id_or_deleted(id=volume.volume_id, token=token)
+            elif status is None:
+                status, status_checked_at = await get_volume_status_by_id_or_deleted(id=volume.volume_id, token=token)
             return VolumeResponse(
                 volume_id=volume.volume_id,
                 name=volume.name,
@@ -220,28 +410,67 @@ class VolumeResponse(BaseModel):
                 project_id=volume.fk_project_id,
                 image_id=volume.fk_image_id,
                 status=status,
+                status_checked_at=status_checked_at,
                 created_at=volume.created_at,
                 updated_at=volume.updated_at,
                 deleted_at=volume.deleted_at
             )
         volume_list = el
-        return [await VolumeResponse.mapper(el=volume, token=token) for volume in volume_list]
+        if freshness == 'db':
+            return [await VolumeResponse.mapper(el=volume, token=token, freshness=freshness) for volume in volume_list]
+        # DB에서 삭제된 볼륨은 조회하지 않고, 나머지는 한 번의 list 요청으로 상태를 조회 (실패시 제한된 동시성으로 개별 조회)
+        status_map = {volume.volume_id: CheckedStatus(VolumeStatus.DELETED, volume.status_checked_at)
+                      for volume in volume_list if volume.deleted}
+        status_map.update(await get_status_map_by_ids(
+            ids=[volume.volume_id for volume in volume_list if not volume.deleted], token=token,
+            get_status_map=get_volume_status_map_by_ids,
+            get_status=get_volume_status_by_id_or_deleted, unknown_status=VolumeStatus.UNKNOWN))
+        # 상태는 이미 조회했으므로 순서대로 mapping (같은 AsyncSession을 동시에 사용할 수 없음)
+        return [await VolumeResponse.mapper(el=volume, token=token, status=status_map[volume.volume_id].status,
+                                            status_checked_at=status_map[volume.volume_id].checked_at)
+                for volume in volume_list]
 
 
-async def get_volume_status_by_id_or_deleted(id: UUID, token: str) -> VolumeStatus:
+async def get_volume_status_by_id_or_deleted(id: UUID, token: str) -> CheckedStatus[VolumeStatus]:
     """
     CINDER 이용하여 볼륨의 상태를 조회한다.
 
     해당 id가 DB에 존재하지만, openstack에 존재하지 않는 경우에는 볼륨의 상태를 deleted로 간주한다.
+    최근에 조회한 상태는 volume_status_cache에서 리턴한다 (stale-while-revalidate)
     :param id: volume id
     :param token: 인증 토큰
-    :return: VolumeStatus(볼륨 상태)
+    :return: CheckedStatus(VolumeStatus(볼륨 상태), 조회한 시간)
     """
-    try:
-        volumeDto = await cinder_client.show_volume_detail(id=id, token=token)
-        return volumeDto.status
-    except OpenstackClientException as e:
-        if e.status == 404:
-            return VolumeStatus.DELETED
-        else:
-            raise e
+
+    async def load(token: str) -> VolumeStatus:
+        try:
+            volumeDto = await cinder_client.show_volume_detail(id=id, token=token)
+            return volumeDto.status
+        except OpenstackClientException as e:
+            if e.status == 404:
+                return VolumeStatus.DELETED
+            else:
+                raise e
+
+    return await volume_status_cache.get_or_load(id, load, token)
+
+
+async def get_volume_status_map_by_ids(ids: List[UUID], token: str) -> Dict[UUID, CheckedStatus[VolumeStatus]]:
+    """
+    CINDER list api(/volumes/detail)로 여러 볼륨의 상태를 조회한다.
+
+    cinder는 여러 id로 필터링할 수 없으므로 RESPONSE_STATUS_LIST_MAX_PAGES 페이지까지만 조회한다.
+    찾지 못한 볼륨은 결과에 포함하지 않는다 (삭제 여부는 자원별 조회로 확인).
+    :param ids: volume id list
+    :param token: 인증 토큰
+    :return: Dict[UUID, CheckedStatus] (volume id -> 볼륨 상태와 조회한 시간)
+    """
+    # list 요청 도중 invalidate된(상태를 변경한) 자원의 결과는 cache에 저장하지 않음
+    version = volume_status_cache.get_version()
+    volumeDtos = await cinder_client.list_volumes_with_details(token=token, ids=ids,
+                                                               max_pages=SETTINGS.RESPONSE_STATUS_LIST_MAX_PAGES)
+    checked_at = datetime.utcnow()
+    status_map = {volumeDto.volume_id: CheckedStatus(volumeDto.status, checked_at) for volumeDto in volumeDtos}
+    for id, checked_status in status_map.items():
+        volume_status_cache.set(id, checked_status, version)
+    return status_map
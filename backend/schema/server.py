@@ -1,4 +1,3 @@
-import json
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List
@@ -8,8 +7,9 @@ from pydantic import Field, BaseModel
 from backend.core.config import get_setting
 from backend.model.server import ServerStatus
 from backend.schema.oa_base import OpenstackBaseResponse
-from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic
+from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic, CREATED_AT_FILTER_PATTERN
 from backend.schema.volume import RootVolumeCreateRequest
+from backend.util import codec
 
 SETTINGS = get_setting()
 
@@ -19,13 +19,15 @@ class ServerQuery(PaginationQueryBasic, SortQueryBasic, FilterBasic):
     - 검색조건:
         - server_id(equal, in, not)
         - name(equal, like)
+        - created_at(equal, gt, lt, gte, lte, ';'로 범위 지정)
     - 정렬 조건
         - name
         - created_at
     """
     sort_by: Optional[str] = Field(default=None, pattern=f'^(created_at|name)$')
-    server_id: Optional[str] = Field(default=None, pattern=f'^(eq|in|not):.+', is_Filter=True)
-    name: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', is_Filter=True)
+    server_id: Optional[str] = Field(default=None, pattern=f'^(eq|in|not):.+', isFilter=True)
+    name: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', isFilter=True)
+    created_at: Optional[str] = Field(default=None, pattern=CREATED_AT_FILTER_PATTERN, isFilter=True)
 
 
 class ServerRequestBasic(BaseModel):
@@ -38,7 +40,7 @@ class ServerCreateRequest(ServerRequestBasic):
     volume: RootVolumeCreateRequest
 
     def serialize(self) -> str:
-        return json.dumps(
+        return codec.dumps(
             {
                 "server": {
                     "name": self.name,
@@ -86,7 +88,7 @@ class ServerUpdateInfoRequest(BaseModel):
             del data_dict["name"]
         if not self.description:
             del data_dict["description"]
-        return json.dumps({"server": data_dict})
+        return codec.dumps({"server": data_dict})
 
 
 class PowerState(str, Enum):
@@ -114,7 +116,7 @@ class ServerPowerUpdateRequest(BaseModel):
             # hard-reboot => HARD
             # soft-reboot => SOFT
             data_dict['reboot'] = {'type': 'HARD' if self.power_state == PowerState.HARD_REBOOT else 'SOFT'}
-        return json.dumps(data_dict)
+        return codec.dumps(data_dict)
 
 
 class ServerVolumeUpdateRequest(BaseModel):
@@ -129,7 +131,7 @@ class ServerVolumeUpdateRequest(BaseModel):
                 "volumeId": f"{self.volume_id}"
             }
         }
-        return json.dumps(data_dict)
+        return codec.dumps(data_dict)
 
 
 class ServerDto(BaseModel):
@@ -150,12 +152,22 @@ class ServerDto(BaseModel):
     deleted_at: Optional[datetime] = Field(default=None)
 
     @staticmethod
-    def deserialize(oa_response: OpenstackBaseResponse) -> 'ServerDto':
+    def deserialize(oa_response: OpenstackBaseResponse, many: Optional[bool] = False) -> 'ServerDto' | List['ServerDto']:
         """
         서버 정보 & interface 조회 -> oa_response -> dto -> db 서버 생성
+        - many : 서버 list 조회(/servers/detail)의 응답인 경우
+        """
+        response_body = oa_response.body
+        if many:
+            return [ServerDto.parse_server_response(server_response) for server_response in
+                    response_body['servers']]
+        return ServerDto.parse_server_response(response_body['server'])
+
+    @staticmethod
+    def parse_server_response(server_response: dict) -> 'ServerDto':
+        """
+        openstack 응답의 server 객체(dict) -> dto
         """
-        response_dict = oa_response.model_dump()
-        server_response = response_dict['data']['server']
         return ServerDto(
             server_id=UUID(server_response.get('id')),
             name=server_response['name'],
@@ -172,8 +184,8 @@ class ServerDto(BaseModel):
 
     @staticmethod
     def deserialize_volumes(oa_response: OpenstackBaseResponse) -> List[UUID]:
-        response_dict = oa_response.model_dump()
-        server_response = response_dict['data']['server']
+        response_body = oa_response.body
+        server_response = response_body['server']
         volumes = server_response.get('os-extended-volumes:volumes_attached')
         return [UUID(volume.get('id')) for volume in volumes]
 
@@ -190,8 +202,8 @@ class ServerUpdateDto(BaseModel):
         user input -> oa_request
         name, description은 없다면 필드 자체를 빼고 보내야 한다
         """
-        response_dict = oa_response.model_dump()
-        server_response = response_dict['data']['server']
+        response_body = oa_response.body
+        server_response = response_body['server']
         return ServerUpdateDto(
             name=server_response.get('name'),
             description=server_response.get('description')
@@ -207,7 +219,7 @@ class ServerNetInterfaceDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse) -> Optional['ServerNetInterfaceDto']:
-        networkAttachments = oa_response.model_dump()['data'].get('interfaceAttachments')
+        networkAttachments = oa_response.body.get('interfaceAttachments')
         if networkAttachments:
             interface_response = networkAttachments[0]  # network interface는 하나로 고정
             return ServerNetInterfaceDto(
@@ -227,24 +239,23 @@ class FlavorDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse, many: Optional[bool] = True) -> List['FlavorDto'] | 'FlavorDto':
-        response_dict = oa_response.model_dump()
+        response_body = oa_response.body
         if not many:
-            flavor_response = response_dict['data']['flavor']
-            return FlavorDto(
-                id=flavor_response['id'],
-                name=flavor_response['name'],
-                ram=flavor_response['ram'],
-                disk=flavor_response['disk'],
-                vcpus=flavor_response['vcpus']
-            )
+            return FlavorDto.parse_flavor_response(response_body['flavor'])
+        return [FlavorDto.parse_flavor_response(flavor) for flavor in response_body['flavors']]
 
-        flavor_list_response = response_dict['data']['flavors']
-        return [FlavorDto(
-            id=flavor['id'],
-            name=flavor['name'],
-            ram=flavor['ram'],
-            disk=flavor['disk'],
-            vcpus=flavor['vcpus']) for flavor in flavor_list_response]
+    @staticmethod
+    def parse_flavor_response(flavor_response: dict) -> 'FlavorDto':
+        """
+        openstack 응답의 flavor 객체(dict) -> dto
+        """
+        return FlavorDto(
+            id=flavor_response['id'],
+            name=flavor_response['name'],
+            ram=flavor_response['ram'],
+            disk=flavor_response['disk'],
+            vcpus=flavor_response['vcpus']
+        )
 
 
 class ImageDto(BaseModel):
@@ -259,21 +270,17 @@ class ImageDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse, many: Optional[bool] = False) -> 'ImageDto' | List['ImageDto']:
-        response_dict = oa_response.model_dump()
+        response_body = oa_response.body
         if not many:
-            image_response = response_dict['data']
-            return ImageDto(
-                id=UUID(image_response.get('id')),
-                name=image_response.get('name'),
-                disk_format=image_response.get('disk_format'),
-                status=image_response.get('status'),
-                min_disk=image_response.get('min_disk'),
-                min_ram=image_response.get('min_ram'),
-                size=image_response.get('size'),
-                virtual_size=image_response.get('virtual_size')
-            )
-        images = response_dict['data']['images']
-        return [ImageDto(
+            return ImageDto.parse_image_response(response_body)
+        return [ImageDto.parse_image_response(image_response) for image_response in response_body['images']]
+
+    @staticmethod
+    def parse_image_response(image_response: dict) -> 'ImageDto':
+        """
+        openstack 응답의 image 객체(dict) -> dto
+        """
+        return ImageDto(
             id=UUID(image_response.get('id')),
             name=image_response.get('name'),
             disk_format=image_response.get('disk_format'),
@@ -282,7 +289,7 @@ class ImageDto(BaseModel):
             min_ram=image_response.get('min_ram'),
             size=image_response.get('size'),
             virtual_size=image_response.get('virtual_size')
-        ) for image_response in images]
+        )
 
 
 class ServerRemainLimitDto(BaseModel):
@@ -292,8 +299,8 @@ class ServerRemainLimitDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse) -> 'ServerRemainLimitDto':
-        response_dict = oa_response.model_dump()
-        quota_response = response_dict['data']['limits']
+        response_body = oa_response.body
+        quota_response = response_body['limits']
         server_quota = quota_response.get('absolute')
         return ServerRemainLimitDto(
             remain_instances=server_quota.get('maxTotalInstances') - server_quota.get('totalInstancesUsed'),
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+from backend.model.sync import SyncTarget
+
+
+class SyncResultDto(BaseModel):
+    """
+    openstack 자원을 DB에 반영(sync)한 결과
+    """
+    target: SyncTarget
+    created: int = Field(default=0, description='새로 추가한 행 수')
+    updated: int = Field(default=0, description='수정한 행 수')
+    deleted: int = Field(default=0, description='삭제 처리(soft delete)한 행 수')
+
+    @property
+    def changed(self) -> int:
+        return self.created + self.updated + self.deleted
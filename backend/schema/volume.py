@@ -1,13 +1,13 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field
-import json
 
 from backend.core.config import get_setting
 from backend.model.volume import VolumeStatus
 from backend.schema.oa_base import OpenstackBaseResponse
-from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic
+from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic, CREATED_AT_FILTER_PATTERN
+from backend.util import codec
 
 SETTINGS = get_setting()
 
@@ -17,13 +17,15 @@ class VolumeQuery(PaginationQueryBasic, SortQueryBasic, FilterBasic):
     - 검색조건:
         - volume_id (equal, in, not)
         - name (equal, like)
+        - created_at (equal, gt, lt, gte, lte, ';'로 범위 지정)
     - 정렬 조건
         - name
         - created_at
     """
     sort_by: Optional[str] = Field(default=None, pattern=f'^(created_at|name)$')
     volume_id: Optional[str] = Field(default=None, pattern=f'^(eq|in|not):.+', isFilter=True)
-    name: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', is_Filter=True)
+    name: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', isFilter=True)
+    created_at: Optional[str] = Field(default=None, pattern=CREATED_AT_FILTER_PATTERN, isFilter=True)
 
 
 class VolumeCreateRequest(BaseModel):
@@ -38,7 +40,7 @@ class VolumeCreateRequest(BaseModel):
         """
         user input-> oa_request
         """
-        return json.dumps({
+        return codec.dumps({
             "volume": {
                 "size": self.size,
                 "name": self.name,
@@ -76,12 +78,22 @@ class VolumeDto(BaseModel):
     deleted_at: Optional[datetime] = Field(default=None)
 
     @staticmethod
-    def deserialize(oa_response: OpenstackBaseResponse) -> 'VolumeDto':
+    def deserialize(oa_response: OpenstackBaseResponse, many: Optional[bool] = False) -> 'VolumeDto' | List['VolumeDto']:
         """
         oa_response -> dto
+        - many : 볼륨 list 조회(/volumes/detail)의 응답인 경우
+        """
+        response_body = oa_response.body
+        if many:
+            return [VolumeDto.parse_volume_response(volume_response) for volume_response in
+                    response_body['volumes']]
+        return VolumeDto.parse_volume_response(response_body['volume'])
+
+    @staticmethod
+    def parse_volume_response(volume_response: dict) -> 'VolumeDto':
+        """
+        openstack 응답의 volume 객체(dict) -> dto
         """
-        response_dict = oa_response.model_dump()
-        volume_response = response_dict['data']['volume']
         is_server_attached = volume_response.get('attachments')
         is_bootable = volume_response.get('volume_image_metadata')
         return VolumeDto(
@@ -116,7 +128,7 @@ class VolumeUpdateInfoRequest(BaseModel):
             # description이 field에 없다면 굳이 업데이트 하지 않음
             del data_dict['description']
 
-        return json.dumps({
+        return codec.dumps({
             "volume": data_dict
         })
 
@@ -130,7 +142,7 @@ class VolumeSizeUpdateRequest(BaseModel):
                 "new_size": self.new_size
             }
         }
-        return json.dumps(data_dict)
+        return codec.dumps(data_dict)
 
 
 class VolumeRemainLimitDto(BaseModel):
@@ -142,8 +154,8 @@ class VolumeRemainLimitDto(BaseModel):
 
     @staticmethod
     def deserialize(oa_response: OpenstackBaseResponse) -> 'VolumeRemainLimitDto':
-        response_dict = oa_response.model_dump()['data']
-        absolute_limits = response_dict['limits']['absolute']
+        response_body = oa_response.body
+        absolute_limits = response_body['limits']['absolute']
         remain_cnt = absolute_limits.get('maxTotalVolumes') - absolute_limits.get('totalVolumesUsed')
         remain_size = absolute_limits.get('maxTotalVolumeGigabytes') - absolute_limits.get('totalGigabytesUsed')
         return VolumeRemainLimitDto(
@@ -1,6 +1,13 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
 from backend.client import keystone_client
+from backend.core.config import get_setting
 from backend.schema.auth import TokenCreateRequest, TokenDto
 
+SETTINGS = get_setting()
+
 
 class AuthService:
     def __init__(self):
@@ -8,3 +15,32 @@ class AuthService:
 
     async def login(self, tokenCreateRequest: TokenCreateRequest) -> TokenDto:
         return await keystone_client.password_authentication_with_unscoped_authorization(tokenCreateRequest)
+
+
+class ServiceTokenProvider:
+    """
+    background 작업(task worker, sync 등)에서 사용하는 서비스 계정(OPENSTACK_USERNAME)의 token을 관리하는 클래스
+    token은 만료 1분 전까지 재사용한다
+    해당 파일의 service_token_provider instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__token: Optional[TokenDto] = None
+        self.__lock: Optional[asyncio.Lock] = None
+
+    async def get_token(self) -> str:
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            if self.__token is None or to_utc(self.__token.expires_at) - timedelta(minutes=1) <= datetime.now(
+                    timezone.utc):
+                self.__token = await keystone_client.password_authentication_with_unscoped_authorization(
+                    TokenCreateRequest(username=SETTINGS.OPENSTACK_USERNAME, password=SETTINGS.OPENSTACK_PASSWORD))
+            return self.__token.token
+
+
+def to_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+service_token_provider = ServiceTokenProvider()
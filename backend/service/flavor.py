@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from backend.client import nova_client
 from backend.schema.server import FlavorDto
@@ -12,3 +12,11 @@ class FlavorService:
         :return: List[FlavorDto]
         """
         return await nova_client.list_flavors_with_details(token)
+
+    def stream_flavors(self, token: str) -> AsyncIterator[FlavorDto]:
+        """
+        flavor list를 페이지 단위로 받는 대로 반환 (전체 목록을 메모리에 모으지 않음)
+        :param token: 인증토큰
+        :return: AsyncIterator[FlavorDto]
+        """
+        return nova_client.iter_flavors_with_details(token)
@@ -2,11 +2,13 @@ from datetime import datetime
 from typing import List
 from fastapi import Depends, BackgroundTasks
 from uuid import UUID
+from sqlalchemy.orm import selectinload
 
 from backend.client import neutron_client, nova_client
 from backend.core.exception import ApiServerException
+from backend.core.status_cache import floatingip_status_cache
 from backend.model.server import ServerStatus
-from backend.model.floatingip import Floatingip
+from backend.model.floatingip import Floatingip, FloatingipStatus
 from backend.repository.floatingip import FloatingipRepository
 from backend.repository.server import ServerRepository
 from backend.schema.floatingip import (FloatingipCreateRequest, FloatingipUpdateRequest, FloatingipUpdatePortRequest,
@@ -14,7 +16,7 @@ from backend.schema.floatingip import (FloatingipCreateRequest, FloatingipUpdate
 from backend.util.constant import (ERR_FLOATINGIP_NOT_FOUND, ERR_FLOATINGIP_STATUS_CONFLICT,
                                    ERR_FLOATINGIP_PORT_CONFLICT, ERR_SERVER_PORT_NOT_FOUND, ERR_SERVER_STATUS_CONFLICT,
                                    ERR_FLOATINGIP_LIMIT_OVER)
-from backend.util.func import update_model_value
+from backend.util.func import update_model_value, update_model_status
 
 
 class FloatingipService:
@@ -28,7 +30,14 @@ class FloatingipService:
         모든 floatingip list를 반환
         :return: floatingip list
         """
-        return await self.floatingipRepository.find_floatingips_by_query(queryInput)
+        return await self.floatingipRepository.find_floatingips_by_query(queryInput, loader=selectinload)
+
+    async def count_floatingips_by_query(self, queryInput: FloatingipQuery) -> int:
+        """
+        query의 검색조건에 해당하는 floatingip 수 (DB만 조회)
+        :return: floatingip 수
+        """
+        return await self.floatingipRepository.count_floatingips_by_query(queryInput)
 
     async def get_floatingip_by_id(self, id: UUID) -> Floatingip:
         """
@@ -37,7 +46,7 @@ class FloatingipService:
         :return: floatingip 객체
         :raises ApiServerException: 404(해당 id 존재하지 않음)
         """
-        floatingip = await self.floatingipRepository.find_floatingip_by_id(id)
+        floatingip = await self.floatingipRepository.find_floatingip_by_id(id, loader=selectinload)
         if not floatingip:
             raise ApiServerException(status=404, message=ERR_FLOATINGIP_NOT_FOUND,
                                      detail=f'floatingip (id :{id}) not found')
@@ -59,6 +68,7 @@ class FloatingipService:
         floatingipDto = await neutron_client.create_floating_ip(token, floatingipCreateRequest)
         # 3. create in db
         floatingip = Floatingip(**floatingipDto.model_dump(exclude={'status'}))
+        update_model_status(floatingip, floatingipDto.status)
         new_floatingip = await self.floatingipRepository.save_floatingip(floatingip)
         await self.floatingipRepository.commit()
         return new_floatingip
@@ -73,7 +83,7 @@ class FloatingipService:
         :raises ApiServerException: 404(해당 floating ip 없음), 409(해당 floatingip 삭제됨)
         """
         # 1. find floatingip by id
-        floatingip = await self.floatingipRepository.find_floatingip_by_id(id)
+        floatingip = await self.floatingipRepository.find_floatingip_by_id(id, loader=selectinload)
         if not floatingip:
             raise ApiServerException(status=404, message=ERR_FLOATINGIP_NOT_FOUND,
                                      detail=f'floatingip (id :{id}) not found')
@@ -106,8 +116,10 @@ class FloatingipService:
             raise ApiServerException(status=409, message=ERR_FLOATINGIP_PORT_CONFLICT)
         # 2. hard delete in openstack api
         await neutron_client.delete_floating_ip(floatingip.floatingip_id, token)
+        floatingip_status_cache.invalidate(id)
         # 3. soft delete in db (update deleted_at)
         floatingip.deleted_at = datetime.utcnow()
+        update_model_status(floatingip, FloatingipStatus.DELETED)
         await self.floatingipRepository.commit()
         return None
 
@@ -123,7 +135,7 @@ class FloatingipService:
         :return: 수정(연결/해제)된 floatingip 객체 & task 수행
         :raises ApiServerException: 404(해당 floating ip 없음, 해당 port id의 서버 없음)/ 409(해당 floating ip 이미 삭제, 해당 서버 상태가 ACTIVE가 아님)
         """
-        # 1. find floatingip by id
+        # 1. find floatingip by id (port 변경 후 연결된 server를 다시 읽어야 하므로 eager loading 하지 않음)
         floatingip = await self.floatingipRepository.find_floatingip_by_id(id)
         if not floatingip:
             raise ApiServerException(status=404, message=ERR_FLOATINGIP_NOT_FOUND,
@@ -138,11 +150,13 @@ class FloatingipService:
                 raise ApiServerException(status=404, message=ERR_SERVER_PORT_NOT_FOUND,
                                          detail=f'server with port (id: {floatingipUpdatePortRequest.port_id}) not found')
             curServerDto = await nova_client.show_server_details(id=server.server_id, token=token)
+            update_model_status(server, curServerDto.status)
             if curServerDto.status != ServerStatus.ACTIVE:
                 raise ApiServerException(status=409, message=ERR_SERVER_STATUS_CONFLICT,
                                          detail=f'current server status : {curServerDto.status.value}')
         # 3. update in openstack api
         floatingipDto = await neutron_client.update_floating_ip(id, token, floatingipUpdatePortRequest)
+        floatingip_status_cache.invalidate(id)
         # 4. update in db
         if not floatingipDto.fk_port_id:
             # port_id None이라면 연결 해제 의미함
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from backend.client import glance_client
 from backend.schema.server import ImageDto
@@ -12,3 +12,11 @@ class ImageService:
         :return: List[ImageDto]
         """
         return await glance_client.list_images(token)
+
+    def stream_images(self, token: str) -> AsyncIterator[ImageDto]:
+        """
+        image list를 페이지 단위로 받는 대로 반환 (전체 목록을 메모리에 모으지 않음)
+        :param token: 인증토큰
+        :return: AsyncIterator[ImageDto]
+        """
+        return glance_client.iter_images(token)
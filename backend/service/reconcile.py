@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+from uuid import UUID
+from fastapi import Depends
+from pydantic import BaseModel
+
+from backend.client import nova_client, cinder_client, neutron_client
+from backend.core.config import get_setting
+from backend.core.db import Base, db
+from backend.model.floatingip import Floatingip, FloatingipStatus
+from backend.model.server import Server, ServerStatus
+from backend.model.sync import SyncTarget
+from backend.model.volume import Volume, VolumeStatus
+from backend.repository.sync import SyncRepository
+from backend.schema.sync import SyncResultDto
+from backend.service.auth import service_token_provider
+from backend.service.sync import SERVER_DELETED_STATUSES, VOLUME_DELETED_STATUSES, to_naive_utc
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+RECONCILE_LOCK_NAME = 'reconcile'
+
+# openstack list 응답과 비교하여 갱신하는 column (list api에서 제공하지 않는 column(ex. server의 port, 고정 ip)은 갱신하지 않는다)
+SERVER_COLUMNS = ('name', 'fk_flavor_id', 'status', 'created_at', 'updated_at', 'deleted_at')
+VOLUME_COLUMNS = ('name', 'description', 'volume_type', 'size', 'fk_server_id', 'fk_image_id', 'status', 'created_at',
+                  'updated_at', 'deleted_at')
+FLOATINGIP_COLUMNS = ('ip_address', 'fk_port_id', 'fk_network_id', 'description', 'status', 'created_at',
+                      'updated_at', 'deleted_at')
+
+
+class ReconcileService:
+    """
+    openstack(nova, cinder, neutron)의 전체 server, volume, floatingip을 조회하여 DB와 비교하고, 다른 행만 반영하는 클래스
+
+    incremental sync(SyncService)가 놓친 변경(ex. changes-since 이전에 삭제된 자원, 직접 수정된 DB)을 바로잡기 위해 사용한다
+    - 비교는 id를 key로 하는 dict로 메모리에서 수행한다 (ORM 객체를 만들지 않음)
+    - 추가/수정은 INSERT ... ON DUPLICATE KEY UPDATE, 삭제 처리는 UPDATE ... WHERE id IN (...) 문으로 RECONCILE_BATCH_SIZE개씩 반영한다
+    """
+
+    def __init__(self, syncRepository: SyncRepository = Depends()):
+        self.syncRepository = syncRepository
+
+    async def reconcile(self, token: str) -> List[SyncResultDto]:
+        """
+        전체 자원을 동시에 조회한 뒤, 서버 -> 볼륨 -> floatingip 순서로 반영하고 자원별로 commit한다
+        (볼륨, floatingip은 DB의 서버를 참조하므로 서버를 먼저 반영한다)
+        """
+        started_at = datetime.utcnow()
+        filters = {'limit': SETTINGS.RECONCILE_PAGE_SIZE}
+        serverDtos, volumeDtos, floatingipDtos = await asyncio.gather(
+            nova_client.list_servers_with_details(token=token, filters=filters),
+            cinder_client.list_volumes_with_details(token=token, filters=filters),
+            neutron_client.list_floating_ips_with_details(token=token, filters=filters))
+
+        servers = {serverDto.server_id: to_row(serverDto, started_at) for serverDto in serverDtos
+                   if serverDto.status not in SERVER_DELETED_STATUSES}
+        results = [await self.apply(SyncTarget.SERVER, Server, 'server_id', servers, SERVER_COLUMNS, started_at,
+                                   ServerStatus.DELETED)]
+
+        # DB에 없는 서버(포트)와의 연결은 비워둔다 (FK)
+        server_ports = await self.syncRepository.find_rows(Server, 'server_id', ('fk_port_id',))
+        port_ids = {server['fk_port_id'] for server in server_ports.values()}
+        volumes = {}
+        for volumeDto in volumeDtos:
+            if volumeDto.status in VOLUME_DELETED_STATUSES:
+                continue
+            volume = volumes[volumeDto.volume_id] = to_row(volumeDto, started_at)
+            if volume['fk_server_id'] not in server_ports:
+                volume['fk_server_id'] = None
+        results.append(await self.apply(SyncTarget.VOLUME, Volume, 'volume_id', volumes, VOLUME_COLUMNS, started_at,
+                                        VolumeStatus.DELETED))
+
+        floatingips = {}
+        for floatingipDto in floatingipDtos:
+            floatingip = floatingips[floatingipDto.floatingip_id] = to_row(floatingipDto, started_at)
+            if floatingip['fk_port_id'] not in port_ids:
+                floatingip['fk_port_id'] = None
+        results.append(await self.apply(SyncTarget.FLOATINGIP, Floatingip, 'floatingip_id', floatingips,
+                                        FLOATINGIP_COLUMNS, started_at, FloatingipStatus.DELETED))
+        return results
+
+    async def apply(self, target: SyncTarget, model: Type[Base], id_column: str, current: Dict[UUID, dict],
+                    columns: Sequence[str], started_at: datetime, deleted_status: str) -> SyncResultDto:
+        """
+        openstack의 자원(current)과 DB의 행을 비교하여 반영하고 commit한다
+        상태 확인 시간(status_checked_at)은 비교하지 않고, 반영하는 행에만 기록한다
+        :param deleted_status: openstack에 없는 행을 삭제 처리할 때 기록하는 상태
+        """
+        stored = await self.syncRepository.find_rows(model, id_column, columns)
+        created, updated, deleted = self.diff(current, stored, columns, started_at)
+        self.check_deletions(target, current, stored, deleted)
+        await self.syncRepository.upsert_rows(model, created + updated, (*columns, 'status_checked_at'),
+                                              SETTINGS.RECONCILE_BATCH_SIZE)
+        utcnow = datetime.utcnow()
+        await self.syncRepository.update_rows(model, id_column, deleted, SETTINGS.RECONCILE_BATCH_SIZE,
+                                              deleted_at=utcnow, status=deleted_status, status_checked_at=utcnow)
+        await self.syncRepository.commit()
+        return SyncResultDto(target=target, created=len(created), updated=len(updated), deleted=len(deleted))
+
+    @staticmethod
+    def diff(current: Dict[UUID, dict], stored: Dict[UUID, dict], columns: Sequence[str],
+             started_at: datetime) -> Tuple[List[dict], List[dict], List[UUID]]:
+        """
+        :param current: openstack의 자원 {id: 행}
+        :param stored: DB의 행 {id: 행} (삭제된 행 포함)
+        :param started_at: 전체 조회를 시작한 시간 (이후 생성된 행은 조회 결과에 없더라도 삭제 처리하지 않는다)
+        :return: 추가할 행, 수정할 행(삭제된 행 복구 포함), 삭제 처리할 id
+        """
+        created, updated = [], []
+        for id, row in current.items():
+            stored_row = stored.get(id)
+            if stored_row is None:
+                created.append(row)
+            elif any(row[column] != stored_row[column] for column in columns):
+                updated.append(row)
+        deleted = [id for id, stored_row in stored.items()
+                   if id not in current and stored_row['deleted_at'] is None
+                   and (stored_row['created_at'] is None or stored_row['created_at'] < started_at)]
+        return created, updated, deleted
+
+    @staticmethod
+    def check_deletions(target: SyncTarget, current: Dict[UUID, dict], stored: Dict[UUID, dict],
+                        deleted: List[UUID]) -> None:
+        """
+        openstack 조회 결과가 잘못된 경우(ex. 일시적인 빈 응답, 다른 project의 token) 대부분의 행을 삭제 처리하지 않도록 확인한다
+        :raises RuntimeError: 조회 결과가 비었지만 DB에 삭제되지 않은 행이 있는 경우,
+            삭제 처리할 행 수가 삭제되지 않은 행 수의 RECONCILE_MAX_DELETE_RATIO를 넘는 경우 (반영하지 않음)
+        """
+        live = sum(1 for stored_row in stored.values() if stored_row['deleted_at'] is None)
+        if not deleted or live == 0:
+            return
+        if not current:
+            raise RuntimeError(f'reconcile {target.value}s aborted : openstack returned no {target.value}s, '
+                               f'but {live} {target.value}s are alive in DB')
+        if len(deleted) > live * SETTINGS.RECONCILE_MAX_DELETE_RATIO:
+            raise RuntimeError(f'reconcile {target.value}s aborted : {len(deleted)} of {live} alive {target.value}s '
+                               f'would be deleted (RECONCILE_MAX_DELETE_RATIO: {SETTINGS.RECONCILE_MAX_DELETE_RATIO})')
+
+
+def to_row(dto: BaseModel, status_checked_at: datetime) -> dict:
+    """
+    dto -> DB에 저장되는 형식의 행 (시간은 DB의 DateTime과 같은 초 단위의 timezone 없는 UTC)
+    :param status_checked_at: dto의 상태를 확인한 시간
+    """
+    row = dto.model_dump()
+    for column, value in row.items():
+        if isinstance(value, datetime):
+            row[column] = to_db_datetime(value)
+    row['status_checked_at'] = status_checked_at
+    return row
+
+
+def to_db_datetime(value: datetime) -> datetime:
+    """
+    DateTime column은 소수점 이하 초를 반올림하여 저장하므로, 비교하기 전에 같은 값으로 맞춘다
+    """
+    value = to_naive_utc(value)
+    if value.microsecond >= 500000:
+        value += timedelta(seconds=1)
+    return value.replace(microsecond=0)
+
+
+class ReconcileRunner:
+    """
+    RECONCILE_INTERVAL마다 전체 자원을 reconcile하는 background loop를 관리하는 클래스
+    여러 프로세스에서 실행되는 경우, named lock을 얻은 프로세스만 실행한다 (다른 프로세스는 해당 주기를 건너뜀)
+    해당 파일의 reconcile_runner instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        reconcile loop를 시작한다 (RECONCILE_INTERVAL이 0 이하라면 실행하지 않음)
+        """
+        if SETTINGS.RECONCILE_INTERVAL <= 0:
+            return
+        self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'reconcile error : {e!r}')
+            await asyncio.sleep(SETTINGS.RECONCILE_INTERVAL)
+
+    async def run_once(self) -> List[SyncResultDto]:
+        """
+        전체 자원을 한 번 reconcile하고, 자원별로 변경한 행 수를 기록한다
+        :return: 자원별 결과 (다른 프로세스에서 reconcile중이라면 빈 list)
+        """
+        async with db.named_lock(RECONCILE_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info('reconcile is running in another process, skipped')
+                return []
+            token = await service_token_provider.get_token()
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            async with db.create_session() as session:
+                results = await ReconcileService(syncRepository=SyncRepository(session=session)).reconcile(token)
+        logger.info(f'reconciled in {loop.time() - start:.2f}s : '
+                    + ', '.join(f'{result.target.value}s {result!r}' for result in results))
+        return results
+
+
+reconcile_runner = ReconcileRunner()
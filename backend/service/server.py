@@ -1,17 +1,23 @@
-import asyncio
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from fastapi import Depends, BackgroundTasks
+from sqlalchemy.orm import selectinload
+from fastapi import Depends
 
 from backend.client import nova_client, glance_client, cinder_client
+from backend.core.config import get_setting
+from backend.core.db import db
 from backend.core.exception import ApiServerException, OpenstackClientException
+from backend.core.status_cache import server_status_cache, volume_status_cache
+from backend.core.watcher import status_watcher, WatchComponent
 from backend.model.server import Server, ServerStatus
+from backend.model.task import TaskType
 from backend.model.volume import Volume, VolumeStatus
 from backend.repository.server import ServerRepository
+from backend.repository.task import TaskRepository
 from backend.repository.volume import VolumeRepository
 from backend.schema.server import (ServerQuery, ServerCreateRequest, ServerUpdateInfoRequest,
-                                   ServerPowerUpdateRequest, ServerVolumeUpdateRequest)
+                                   ServerPowerUpdateRequest, ServerVolumeUpdateRequest, PowerState, ServerDto)
 from backend.schema.volume import VolumeUpdateInfoRequest
 from backend.util.constant import (ERR_SERVER_NOT_FOUND, ERR_FLAVOR_NOT_FOUND, ERR_IMAGE_NOT_FOUND,
                                    ERR_IMAGE_SIZE_CONFLICT, ERR_SERVER_NAME_DUPLICATED, ERR_VOLUME_NAME_DUPLICATED,
@@ -20,20 +26,42 @@ from backend.util.constant import (ERR_SERVER_NOT_FOUND, ERR_FLAVOR_NOT_FOUND, E
                                    ERR_VOLUME_STATUS_CONFLICT,
                                    ERR_SERVER_VOLUME_NOT_CONNECTED, ERR_SERVER_ROOT_VOLUME_CANT_DETACH,
                                    ERR_SERVER_LIMIT_OVER, ERR_VOLUME_LIMIT_OVER)
-from backend.util.func import update_model_value
+from backend.util.backoff import BackoffPolicy
+from backend.util.func import update_model_value, update_model_status
+
+SETTINGS = get_setting()
+
+# 전원 상태 변경 이후 완료로 간주하는 서버 상태
+POWER_TARGET_STATUSES = {
+    PowerState.START: ServerStatus.ACTIVE,
+    PowerState.STOP: ServerStatus.SHUTOFF,
+    PowerState.PAUSE: ServerStatus.PAUSED,
+    PowerState.UNPAUSE: ServerStatus.ACTIVE,
+    PowerState.HARD_REBOOT: ServerStatus.ACTIVE,
+    PowerState.SOFT_REBOOT: ServerStatus.ACTIVE,
+}
 
 
 class ServerService:
-    def __init__(self, serverRepository: ServerRepository = Depends(), volumeRepository: VolumeRepository = Depends()):
+    def __init__(self, serverRepository: ServerRepository = Depends(), volumeRepository: VolumeRepository = Depends(),
+                 taskRepository: TaskRepository = Depends()):
         self.serverRepository = serverRepository
         self.volumeRepository = volumeRepository
+        self.taskRepository = taskRepository
 
     async def get_servers_by_query(self, queryInput: ServerQuery) -> List[Server]:
         """
         모든 server list를 반환(연관된 자원도 Overall하게 보여줘야 함)
         :return: server list
         """
-        return await self.serverRepository.find_servers_by_query(queryInput)
+        return await self.serverRepository.find_servers_by_query(queryInput, loader=selectinload)
+
+    async def count_servers_by_query(self, queryInput: ServerQuery) -> int:
+        """
+        query의 검색조건에 해당하는 server 수 (DB만 조회)
+        :return: server 수
+        """
+        return await self.serverRepository.count_servers_by_query(queryInput)
 
     async def get_server_by_id(self, id: UUID) -> Server:
         """
@@ -42,17 +70,16 @@ class ServerService:
         :return: server
         :raises: ApiServerException: 해당 id 존재하지 않는다면 발생
         """
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND,
                                      detail=f'server (id: {id}) not found')
         return server
 
-    async def create_server_with_root_volume(self, serverCreateRequest: ServerCreateRequest, token: str,
-                                             bg_task: BackgroundTasks) -> Server:
+    async def create_server_with_root_volume(self, serverCreateRequest: ServerCreateRequest, token: str) -> Server:
         """
         요청한 정보의 server와 루트볼륨을 생성
-        서버 생성 완료 이후, background_tasks를 수행
+        서버 생성 완료 이후의 task를 서버와 함께 저장 (worker가 실행)
         :return: server
         :raises: ApiserverException: 404(해당 flavor id 없음. 해당 image id 없음), 409(해당 name의 서버나 볼륨이 이미 존재, quota 부족, image > volume.size)
         """
@@ -91,11 +118,14 @@ class ServerService:
         curServerDto = await nova_client.show_server_details(token=token, id=server_id)
         curServerDto.description = serverCreateRequest.description
         # 3. insert server
-        new_server = await self.serverRepository.save_server(Server(**curServerDto.model_dump(exclude={'status'})))
-
+        new_server = Server(**curServerDto.model_dump(exclude={'status'}))
+        update_model_status(new_server, curServerDto.status)
+        new_server = await self.serverRepository.save_server(new_server)
+        # 4. enqueue task (서버와 같은 transaction으로 저장)
+        await self.taskRepository.enqueue_task(TaskType.SERVER_AFTER_CREATE,
+                                               payload={'server_id': str(new_server.server_id),
+                                                        'volume_name': serverCreateRequest.volume.name})
         await self.serverRepository.commit()
-        # 4. do background task
-        bg_task.add_task(self._task_after_create_server, new_server, serverCreateRequest.volume.name, token)
         return new_server
 
     async def update_server_by_id(self, id: UUID, serverUpdateInfoRequest: ServerUpdateInfoRequest,
@@ -104,7 +134,7 @@ class ServerService:
         해당 id의 서버의 정보를 업데이트 한다
         :raises: ApiServerException: 404(서버 없는 경우), 409 (서버 삭제된 경우, 이름 중복)
         """
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         # 서버가 없는 경우
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND,
@@ -131,7 +161,7 @@ class ServerService:
         : raises: ApiServerException : 404(서버 없는 경우), 409 (서버 삭제된 경우)
         """
 
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         # 서버가 없는 경우
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND,
@@ -141,6 +171,7 @@ class ServerService:
             raise ApiServerException(status=409, message=ERR_SERVER_ALREADY_DELETED, detail='')
         # hard delete in openstack api
         await nova_client.delete_server(id=id, token=token)
+        server_status_cache.invalidate(id)
         # 성공시, db에 반영 (server soft-delete, root volume soft-delete, volume detach, floatingip detach, securitygroup detach)
         utcnow = datetime.utcnow()
         # 1. 볼륨 관련
@@ -149,6 +180,8 @@ class ServerService:
             if attached_volume.is_root_volume:
                 # 루트 볼륨 : 삭제
                 attached_volume.deleted_at = utcnow
+                update_model_status(attached_volume, VolumeStatus.DELETED)
+                volume_status_cache.invalidate(attached_volume.volume_id)
         server.volumes = [] # 모든 볼륨 연결 해제
         # 2. floatingip 연결 해제
         server.floatingip = None
@@ -159,6 +192,7 @@ class ServerService:
         server.fixed_address = None
         # 4. server 삭제 처리
         server.deleted_at = utcnow
+        update_model_status(server, ServerStatus.DELETED)
         await self.serverRepository.commit()
         return None
 
@@ -166,9 +200,10 @@ class ServerService:
                                         token: str) -> Server:
         """
         해당 id의 서버 상태를 변경한다
+        DB에 기록된 상태는 변경 이전의 상태이므로 지우고(freshness=db 조회시 unknown), 변경이 끝날 때까지 status watcher로 추적하여 기록한다
         :raises: ApiServerException : 404 (서버 없는 경우), 409(서버 이미 삭제된 경우, 불가능한 상태인 경우)
         """
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         # 서버가 없는 경우
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND,
@@ -177,9 +212,33 @@ class ServerService:
         if server.deleted:
             raise ApiServerException(status=409, message=ERR_SERVER_ALREADY_DELETED, detail='')
         await nova_client.run_an_action(id=id, serverPowerUpdateRequest=serverPowerUpdateRequest, token=token)
+        server_status_cache.invalidate(id)
+        server.status, server.status_checked_at = None, None
+        await self.serverRepository.commit()
+        status_watcher.register(WatchComponent.SERVER, id=id,
+                                target_statuses=[POWER_TARGET_STATUSES[serverPowerUpdateRequest.power_state]],
+                                failure_statuses=[ServerStatus.ERROR], policy=SETTINGS.POLLING_POLICY_POWER_SERVER,
+                                callback=lambda serverDto: self.record_server_status(id, serverDto))
 
         return server
 
+    @staticmethod
+    async def record_server_status(id: UUID, serverDto: Optional[ServerDto]) -> None:
+        """
+        status watcher로 추적한 서버 상태를 DB에 기록한다 (요청이 끝난 이후 실행되므로 별도의 session 사용)
+        :param serverDto: 마지막으로 조회한 서버 (삭제되었거나 deadline이 지난 경우 None, 기록하지 않음)
+        """
+        if serverDto is None:
+            return
+        async with db.create_session() as session:
+            serverRepository = ServerRepository(session=session)
+            server = await serverRepository.find_server_by_id(id)
+            if server is None or server.deleted:
+                return
+            update_model_status(server, serverDto.status)
+            await serverRepository.commit()
+        server_status_cache.invalidate(id)
+
     async def get_vnc_url_by_id(self, id: UUID, token: str) -> str:
         """
         vnc url을 리턴
@@ -198,14 +257,13 @@ class ServerService:
         return await nova_client.create_console(id=id, token=token)
 
     async def attach_volume_by_id(self, id: UUID, serverVolumeUpdateRequest: ServerVolumeUpdateRequest,
-                                  bg_task: BackgroundTasks,
                                   token: str) -> Server:
         """
-        해당 id의 서버에 volume을 연결히고, volume의 상태를 추적하는 task를 수행
+        해당 id의 서버에 volume을 연결히고, volume의 상태를 추적하는 task를 저장
         :return: Server
         :raises: ApiServerException: 404(서버 혹은 볼륨 없는 경우), 409 (자원이 삭제된 경우, 볼륨 available 아니거나, 서버 상태 제약 )
         """
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         # 서버 없는 경우
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND)
@@ -224,6 +282,7 @@ class ServerService:
 
         # NOVA : 최신 server 정보 가져옴
         curServerDto = await nova_client.show_server_details(id=id, token=token)
+        update_model_status(server, curServerDto.status)
 
         # server ACTIVE 아니라면 불가
         if curServerDto.status != ServerStatus.ACTIVE:
@@ -239,20 +298,24 @@ class ServerService:
         # NOVA : attach
         await nova_client.attach_volume_to_instance(id=id, serverVolumeUpdateRequest=serverVolumeUpdateRequest,
                                                     token=token)
+        server_status_cache.invalidate(id)
+        volume_status_cache.invalidate(volume.volume_id)
         # TASK : 볼륨 상태 in-use 된다면 연결 처리
-        bg_task.add_task(self._task_after_attach_volume, server=server, volume=volume, token=token)
+        await self.taskRepository.enqueue_task(TaskType.SERVER_AFTER_ATTACH_VOLUME,
+                                               payload={'server_id': str(server.server_id),
+                                                        'volume_id': str(volume.volume_id)})
+        await self.taskRepository.commit()
 
         return server
 
     async def detach_volume_by_id(self, id: UUID, serverVolumeUpdateRequest: ServerVolumeUpdateRequest,
-                                  bg_task: BackgroundTasks,
                                   token: str) -> Server:
         """
-        해당 id의 서버에 volume을 해제하고, volume의 상태를 추적하는 task를 수행
+        해당 id의 서버에 volume을 해제하고, volume의 상태를 추적하는 task를 저장
         :return: Server
         :raises: ApiServerException: 404(서버 혹은 볼륨 없는 경우), 409 (자원이 삭제된 경우, 볼륨 in-use 아니거나, 서버 상태 제약, 둘이 연결되어 있지 않은 경우, 루트 볼륨인 경우)
         """
-        server = await self.serverRepository.find_server_by_id(id)
+        server = await self.serverRepository.find_server_by_id(id, loader=selectinload)
         # 서버 없는 경우
         if not server:
             raise ApiServerException(status=404, message=ERR_SERVER_NOT_FOUND)
@@ -278,6 +341,7 @@ class ServerService:
 
         # NOVA : 최신 server 정보 가져옴
         curServerDto = await nova_client.show_server_details(id=id, token=token)
+        update_model_status(server, curServerDto.status)
 
         # server ACTIVE 아니라면 불가
         if curServerDto.status != ServerStatus.ACTIVE:
@@ -292,16 +356,19 @@ class ServerService:
         # NOVA : detach
         await nova_client.detach_volume_to_instance(id=id, serverVolumeUpdateRequest=serverVolumeUpdateRequest,
                                                     token=token)
+        server_status_cache.invalidate(id)
+        volume_status_cache.invalidate(volume.volume_id)
         # TASK : 볼륨 상태 available 된다면 해제 처리
-        bg_task.add_task(self._task_after_detach_volume, volume=volume, token=token)
+        await self.taskRepository.enqueue_task(TaskType.SERVER_AFTER_DETACH_VOLUME,
+                                               payload={'volume_id': str(volume.volume_id)})
+        await self.taskRepository.commit()
 
         return server
 
 
     async def _task_after_create_server(self,
                                         server: Server, volume_name: str, token: str,
-                                        interval_time: Optional[int] = 1,
-                                        polling_limit: Optional[int] = 100):
+                                        policy: Optional[BackoffPolicy] = None):
         """
         [TASK]
         check server status
@@ -317,82 +384,88 @@ class ServerService:
             1. server row(status) update
             2. return
         """
-        for _ in range(polling_limit):
-            await asyncio.sleep(interval_time)
-            # 1. check status regularly until ACTIVE/ERROR
-            curServerDto, volume_id_list = await nova_client.show_server_details_with_volume_ids(id=server.server_id,
-                                                                                                 token=token)
-            if curServerDto.status == ServerStatus.ACTIVE:
-                # 2. NOVA - network interface 정보 요청 & db 수정
-                if ((server.fk_port_id is None)
-                        and (serverNetInterfaceDto := await nova_client.show_port_interface_details(id=server.server_id,
-                                                                                                    token=token))):
-                    server.fk_port_id = serverNetInterfaceDto.port_id
-                    server.fixed_address = serverNetInterfaceDto.fixed_address
-                    await self.serverRepository.save_server(server)
-                    await self.serverRepository.commit()
-                # 3. CINDER - volume 정보로부터 루트 볼륨 여부 판단
-                for volume_id in volume_id_list:
-                    volume_created = await cinder_client.show_volume_detail(id=volume_id,
-                                                                            token=token)  # openstack에서 생성된 볼륨 정보
-                    if volume_created.fk_image_id is not None:
-                        new_volume = Volume(**volume_created.model_dump(exclude={'status'}))
-                        # 4. CINDER - volume row update (볼륨 이름 변경)
-                        try:
-                            updatedVolumeDto = await cinder_client.update_a_volume(
-                                id=new_volume.volume_id,
-                                volumeUpdateInfoRequest=VolumeUpdateInfoRequest(name=volume_name),
-                                token=token
-                            )
-                            update_model_value(db_model=new_volume, updateDto=updatedVolumeDto)  # 이름 변경 성공시 model 반영
-                        except OpenstackClientException:
-                            pass
-                        finally:
-                            # 5. 볼륨 정보 db 반영
-                            await self.volumeRepository.save_volume(new_volume)
-                            await self.volumeRepository.commit()
-                            return
-            elif curServerDto.status == ServerStatus.ERROR:
-                return
+        # 1. check status regularly until ACTIVE/ERROR (status watcher가 다른 서버와 묶어서 조회)
+        curServerDto = await status_watcher.watch(WatchComponent.SERVER, id=server.server_id,
+                                                  target_statuses=[ServerStatus.ACTIVE],
+                                                  failure_statuses=[ServerStatus.ERROR],
+                                                  policy=policy or SETTINGS.POLLING_POLICY_CREATE_SERVER)
+        if curServerDto is None:
+            return
+        update_model_status(server, curServerDto.status)
+        if curServerDto.status != ServerStatus.ACTIVE:
+            await self.serverRepository.save_server(server)
+            await self.serverRepository.commit()
+            return
+        _, volume_id_list = await nova_client.show_server_details_with_volume_ids(id=server.server_id, token=token)
+        # 2. NOVA - network interface 정보 요청 & db 수정
+        if ((server.fk_port_id is None)
+                and (serverNetInterfaceDto := await nova_client.show_port_interface_details(id=server.server_id,
+                                                                                            token=token))):
+            server.fk_port_id = serverNetInterfaceDto.port_id
+            server.fixed_address = serverNetInterfaceDto.fixed_address
+        await self.serverRepository.save_server(server)
+        await self.serverRepository.commit()
+        # 3. CINDER - volume 정보로부터 루트 볼륨 여부 판단
+        for volume_id in volume_id_list:
+            volume_created = await cinder_client.show_volume_detail(id=volume_id,
+                                                                    token=token)  # openstack에서 생성된 볼륨 정보
+            if volume_created.fk_image_id is not None:
+                new_volume = Volume(**volume_created.model_dump(exclude={'status'}))
+                update_model_status(new_volume, volume_created.status)
+                # 4. CINDER - volume row update (볼륨 이름 변경)
+                try:
+                    updatedVolumeDto = await cinder_client.update_a_volume(
+                        id=new_volume.volume_id,
+                        volumeUpdateInfoRequest=VolumeUpdateInfoRequest(name=volume_name),
+                        token=token
+                    )
+                    update_model_value(db_model=new_volume, updateDto=updatedVolumeDto)  # 이름 변경 성공시 model 반영
+                except OpenstackClientException:
+                    pass
+                finally:
+                    # 5. 볼륨 정보 db 반영
+                    await self.volumeRepository.save_volume(new_volume)
+                    await self.volumeRepository.commit()
+                    return
 
     async def _task_after_attach_volume(self, server: Server, volume: Volume, token: str,
-                                        interval_time: Optional[int] = 1,
-                                        polling_limit: Optional[int] = 100):
+                                        policy: Optional[BackoffPolicy] = None):
         """
         [TASK]
         check volume status
         - in-use : attach 완료
         """
-        for _ in range(polling_limit):
-            await asyncio.sleep(interval_time)
-            # CINDER : 볼륨 정보 가져와서 상태 확인
-            curVolumeDto = await cinder_client.show_volume_detail(id=volume.volume_id, token=token)
-            if curVolumeDto.status == VolumeStatus.IN_USE:
-                # attach 완료
-                volume.fk_server_id = server.server_id
-                await self.volumeRepository.save_volume(volume)
-                await self.volumeRepository.commit()
-                return
-            elif curVolumeDto.status == VolumeStatus.ERROR:
-                return
+        # CINDER : 볼륨 상태 확인 (status watcher가 다른 볼륨과 묶어서 조회)
+        curVolumeDto = await status_watcher.watch(WatchComponent.VOLUME, id=volume.volume_id,
+                                                  target_statuses=[VolumeStatus.IN_USE],
+                                                  failure_statuses=[VolumeStatus.ERROR],
+                                                  policy=policy or SETTINGS.POLLING_POLICY_ATTACH_VOLUME)
+        if curVolumeDto is None:
+            return
+        update_model_status(volume, curVolumeDto.status)
+        if curVolumeDto.status == VolumeStatus.IN_USE:
+            # attach 완료
+            volume.fk_server_id = server.server_id
+        await self.volumeRepository.save_volume(volume)
+        await self.volumeRepository.commit()
 
     async def _task_after_detach_volume(self, volume: Volume, token: str,
-                                        interval_time: Optional[int] = 1,
-                                        polling_limit: Optional[int] = 100):
+                                        policy: Optional[BackoffPolicy] = None):
         """
         [TASK]
         check volume status
         - availalbe : detach 완료
         """
-        for _ in range(polling_limit):
-            await asyncio.sleep(interval_time)
-            # CINDER : 볼륨 정보 가져와서 상태 확인
-            curVolumeDto = await cinder_client.show_volume_detail(id=volume.volume_id, token=token)
-            if curVolumeDto.status == VolumeStatus.AVAILABLE:
-                # detach 완료
-                volume.fk_server_id = None
-                await self.volumeRepository.save_volume(volume)
-                await self.volumeRepository.commit()
-                return
-            elif curVolumeDto.status == VolumeStatus.ERROR:
-                return
+        # CINDER : 볼륨 상태 확인 (status watcher가 다른 볼륨과 묶어서 조회)
+        curVolumeDto = await status_watcher.watch(WatchComponent.VOLUME, id=volume.volume_id,
+                                                  target_statuses=[VolumeStatus.AVAILABLE],
+                                                  failure_statuses=[VolumeStatus.ERROR],
+                                                  policy=policy or SETTINGS.POLLING_POLICY_DETACH_VOLUME)
+        if curVolumeDto is None:
+            return
+        update_model_status(volume, curVolumeDto.status)
+        if curVolumeDto.status == VolumeStatus.AVAILABLE:
+            # detach 완료
+            volume.fk_server_id = None
+        await self.volumeRepository.save_volume(volume)
+        await self.volumeRepository.commit()
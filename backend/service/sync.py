@@ -0,0 +1,209 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import Depends
+
+from backend.client import nova_client, cinder_client
+from backend.core.config import get_setting
+from backend.core.db import db
+from backend.model.server import Server, ServerStatus
+from backend.model.sync import SyncTarget
+from backend.model.volume import Volume, VolumeStatus
+from backend.repository.server import ServerRepository
+from backend.repository.sync import SyncRepository
+from backend.repository.volume import VolumeRepository
+from backend.schema.server import ServerDto
+from backend.schema.sync import SyncResultDto
+from backend.schema.volume import VolumeDto
+from backend.service.auth import service_token_provider
+from backend.util.func import update_model_value, update_model_status
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+SYNC_LOCK_NAME = 'sync'
+
+SERVER_DELETED_STATUSES = (ServerStatus.DELETED, ServerStatus.SOFT_DELETED)
+# cinder는 삭제된 볼륨을 목록에 포함하지 않으므로, 삭제중인 볼륨을 삭제된 것으로 간주한다 (삭제 실패시 error_deleting으로 다시 반영)
+VOLUME_DELETED_STATUSES = (VolumeStatus.DELETING, VolumeStatus.DELETED)
+
+
+class SyncService:
+    """
+    openstack(nova, cinder)에서 변경된 자원만 조회(changes-since)하여 DB의 server, volume에 반영하는 클래스
+
+    자원별로 마지막으로 반영한 변경의 수정시간(high water mark)을 저장하고, 다음 sync에서는 그 이후의 변경만 조회한다
+    따라서 sync 비용은 전체 자원 수가 아니라 변경된 자원 수에 비례한다 (high water mark가 없다면 전체 조회)
+    """
+
+    def __init__(self, serverRepository: ServerRepository = Depends(), volumeRepository: VolumeRepository = Depends(),
+                 syncRepository: SyncRepository = Depends()):
+        self.serverRepository = serverRepository
+        self.volumeRepository = volumeRepository
+        self.syncRepository = syncRepository
+
+    async def sync_servers(self, token: str) -> SyncResultDto:
+        """
+        high water mark 이후 변경된 서버(삭제 포함)를 DB에 반영하고 commit한다
+        - DB에 없는 서버 : 추가 (삭제된 서버는 제외)
+        - DB에 있는 서버 : 이름, flavor, 상태, 수정시간 반영 / 삭제된 서버는 삭제 처리
+        """
+        high_water_mark = await self.syncRepository.find_high_water_mark(SyncTarget.SERVER)
+        serverDtos = await nova_client.list_servers_with_details(token=token,
+                                                                 filters=self.get_filters(high_water_mark))
+        servers = {server.server_id: server for server in
+                   await self.serverRepository.find_servers_by_ids([serverDto.server_id for serverDto in serverDtos])}
+        result = SyncResultDto(target=SyncTarget.SERVER)
+        for serverDto in serverDtos:
+            server = servers.get(serverDto.server_id)
+            deleted = serverDto.status in SERVER_DELETED_STATUSES
+            if server is None:
+                if deleted:
+                    continue
+                server = Server(**serverDto.model_dump(exclude={'status'}))
+                update_model_status(server, serverDto.status)
+                result.created += 1
+            elif deleted:
+                if server.deleted:
+                    continue
+                server.deleted_at = to_naive_utc(serverDto.updated_at)
+                update_model_status(server, serverDto.status)
+                result.deleted += 1
+            else:
+                update_model_value(server, serverDto)
+                server.deleted_at = None
+                result.updated += 1
+            self.serverRepository.db.add(server)
+        await self.syncRepository.save_high_water_mark(
+            SyncTarget.SERVER, self.get_high_water_mark(high_water_mark, serverDtos))
+        await self.syncRepository.commit()
+        return result
+
+    async def sync_volumes(self, token: str) -> SyncResultDto:
+        """
+        high water mark 이후 변경된 볼륨을 DB에 반영하고 commit한다 (서버를 먼저 sync해야 연결된 서버가 반영된다)
+        - DB에 없는 볼륨 : 추가 (삭제중인 볼륨은 제외)
+        - DB에 있는 볼륨 : 이름, 설명, 용량, 연결된 서버, 상태, 수정시간 반영 / 삭제중인 볼륨은 삭제 처리
+        DB에 없는 서버에 연결된 경우, 연결된 서버는 비워둔다
+        """
+        high_water_mark = await self.syncRepository.find_high_water_mark(SyncTarget.VOLUME)
+        volumeDtos = await cinder_client.list_volumes_with_details(token=token,
+                                                                   filters=self.get_filters(high_water_mark))
+        volumes = {volume.volume_id: volume for volume in
+                   await self.volumeRepository.find_volumes_by_ids([volumeDto.volume_id for volumeDto in volumeDtos])}
+        server_ids = {server.server_id for server in await self.serverRepository.find_servers_by_ids(
+            list({volumeDto.fk_server_id for volumeDto in volumeDtos if volumeDto.fk_server_id is not None}))}
+        result = SyncResultDto(target=SyncTarget.VOLUME)
+        for volumeDto in volumeDtos:
+            volume = volumes.get(volumeDto.volume_id)
+            deleted = volumeDto.status in VOLUME_DELETED_STATUSES
+            fk_server_id = volumeDto.fk_server_id if volumeDto.fk_server_id in server_ids else None
+            if volume is None:
+                if deleted:
+                    continue
+                volume = Volume(**volumeDto.model_dump(exclude={'status'}))
+                update_model_status(volume, volumeDto.status)
+                result.created += 1
+            elif deleted:
+                if volume.deleted:
+                    continue
+                volume.deleted_at = to_naive_utc(volumeDto.updated_at or volumeDto.created_at)
+                update_model_status(volume, volumeDto.status)
+                result.deleted += 1
+            else:
+                update_model_value(volume, volumeDto)
+                volume.deleted_at = None
+                result.updated += 1
+            volume.fk_server_id = fk_server_id  # 연결 해제(None)도 반영
+            self.volumeRepository.db.add(volume)
+        await self.syncRepository.save_high_water_mark(
+            SyncTarget.VOLUME, self.get_high_water_mark(high_water_mark, volumeDtos))
+        await self.syncRepository.commit()
+        return result
+
+    @staticmethod
+    def get_filters(high_water_mark: Optional[datetime]) -> dict:
+        """
+        :return: list api의 query parameter (high water mark 이후 변경된 자원, 페이지 크기)
+        """
+        filters = {'limit': SETTINGS.SYNC_PAGE_SIZE}
+        if high_water_mark is not None:
+            filters['changes-since'] = high_water_mark.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return filters
+
+    @staticmethod
+    def get_high_water_mark(high_water_mark: Optional[datetime], dtos: List[ServerDto | VolumeDto]) -> Optional[datetime]:
+        """
+        :return: 조회한 자원 중 가장 최근의 수정시간 (changes-since는 해당 시간을 포함하므로, 마지막 변경은 다음 sync에서 한 번 더 반영된다)
+        """
+        for dto in dtos:
+            updated_at = to_naive_utc(dto.updated_at or dto.created_at)
+            if high_water_mark is None or updated_at > high_water_mark:
+                high_water_mark = updated_at
+        return high_water_mark
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    openstack의 시간(UTC, timezone 포함 여부는 component마다 다름)을 DB에 저장하는 형식(timezone 없는 UTC)으로 변환
+    """
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+class SyncRunner:
+    """
+    SYNC_INTERVAL마다 서버, 볼륨 순서로 sync하는 background loop를 관리하는 클래스
+    여러 프로세스에서 실행되는 경우, named lock을 얻은 프로세스만 실행한다 (다른 프로세스는 해당 주기를 건너뜀)
+    해당 파일의 sync_runner instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        sync loop를 시작한다 (SYNC_INTERVAL이 0 이하라면 실행하지 않음)
+        """
+        if SETTINGS.SYNC_INTERVAL <= 0:
+            return
+        self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'sync error : {e!r}')
+            await asyncio.sleep(SETTINGS.SYNC_INTERVAL)
+
+    async def run_once(self) -> List[SyncResultDto]:
+        """
+        서버, 볼륨의 변경 내역을 한 번 반영한다
+        :return: 자원별 결과 (다른 프로세스에서 sync중이라면 빈 list)
+        """
+        async with db.named_lock(SYNC_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info('sync is running in another process, skipped')
+                return []
+            token = await service_token_provider.get_token()
+            async with db.create_session() as session:
+                syncService = SyncService(serverRepository=ServerRepository(session=session),
+                                          volumeRepository=VolumeRepository(session=session),
+                                          syncRepository=SyncRepository(session=session))
+                results = [await syncService.sync_servers(token), await syncService.sync_volumes(token)]
+        for result in results:
+            if result.changed:
+                logger.info(f'synced {result.target.value}s : {result!r}')
+        return results
+
+
+sync_runner = SyncRunner()
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import get_setting
+from backend.core.db import db
+from backend.model.task import Task, TaskType
+from backend.repository.server import ServerRepository
+from backend.repository.task import TaskRepository
+from backend.repository.volume import VolumeRepository
+from backend.service.auth import service_token_provider
+from backend.service.server import ServerService
+from backend.service.volume import VolumeService
+
+SETTINGS = get_setting()
+logger = logging.getLogger(__name__)
+
+
+async def run_server_after_create(session: AsyncSession, payload: dict, token: str) -> None:
+    serverRepository, volumeRepository = ServerRepository(session=session), VolumeRepository(session=session)
+    server = await serverRepository.find_server_by_id(UUID(payload['server_id']))
+    if server is None:
+        return
+    await ServerService(serverRepository=serverRepository, volumeRepository=volumeRepository) \
+        ._task_after_create_server(server=server, volume_name=payload['volume_name'], token=token)
+
+
+async def run_server_after_attach_volume(session: AsyncSession, payload: dict, token: str) -> None:
+    serverRepository, volumeRepository = ServerRepository(session=session), VolumeRepository(session=session)
+    server = await serverRepository.find_server_by_id(UUID(payload['server_id']))
+    volume = await volumeRepository.find_volume_by_id(UUID(payload['volume_id']))
+    if server is None or volume is None:
+        return
+    await ServerService(serverRepository=serverRepository, volumeRepository=volumeRepository) \
+        ._task_after_attach_volume(server=server, volume=volume, token=token)
+
+
+async def run_server_after_detach_volume(session: AsyncSession, payload: dict, token: str) -> None:
+    serverRepository, volumeRepository = ServerRepository(session=session), VolumeRepository(session=session)
+    volume = await volumeRepository.find_volume_by_id(UUID(payload['volume_id']))
+    if volume is None:
+        return
+    await ServerService(serverRepository=serverRepository, volumeRepository=volumeRepository) \
+        ._task_after_detach_volume(volume=volume, token=token)
+
+
+async def run_volume_after_extend(session: AsyncSession, payload: dict, token: str) -> None:
+    volumeRepository = VolumeRepository(session=session)
+    volume = await volumeRepository.find_volume_by_id(UUID(payload['volume_id']))
+    if volume is None:
+        return
+    await VolumeService(volumeRepository=volumeRepository)._task_after_extend_volume(token=token, volume=volume)
+
+
+# task 종류별 실행 함수 (session, payload, token)
+TASK_HANDLERS: Dict[TaskType, Callable[[AsyncSession, dict, str], Awaitable[None]]] = {
+    TaskType.SERVER_AFTER_CREATE: run_server_after_create,
+    TaskType.SERVER_AFTER_ATTACH_VOLUME: run_server_after_attach_volume,
+    TaskType.SERVER_AFTER_DETACH_VOLUME: run_server_after_detach_volume,
+    TaskType.VOLUME_AFTER_EXTEND: run_volume_after_extend,
+}
+
+
+class TaskWorkerPool:
+    """
+    DB에 저장된 task를 점유하여 실행하는 worker들을 관리하는 클래스
+
+    worker는 실행 가능한 task를 하나씩 점유(SELECT ... FOR UPDATE SKIP LOCKED)하여 실행하고,
+    실패한 경우 TASK_RETRY_POLICY에 따라 재시도한다. 프로세스가 종료되어 완료하지 못한 task는 점유 시간이 지나면 다시 실행된다
+    실행 중에는 TASK_LEASE_RENEW_INTERVAL마다 점유 시간을 연장하므로, 오래 걸리는 task를 다른 worker가 중복 실행하지 않는다
+    연장/완료/실패 처리는 점유할 때 받은 claim token이 일치하는 경우에만 반영한다 (점유를 잃은 worker의 결과는 무시)
+    사용자 token은 저장하지 않으므로, task는 서비스 계정(OPENSTACK_USERNAME)의 token으로 실행한다
+    해당 파일의 task_worker_pool instance를 생성하여 사용할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.__workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        TASK_WORKER_COUNT개의 worker를 시작한다
+        """
+        loop = asyncio.get_running_loop()
+        self.__workers = [loop.create_task(self.__work()) for _ in range(SETTINGS.TASK_WORKER_COUNT)]
+
+    async def stop(self) -> None:
+        """
+        모든 worker를 종료한다 (실행중이던 task는 점유 시간이 지난 뒤 다시 실행된다)
+        """
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = []
+
+    async def __work(self) -> None:
+        while True:
+            try:
+                executed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'task worker error : {e!r}')
+                executed = False
+            if not executed:
+                await asyncio.sleep(SETTINGS.TASK_POLL_INTERVAL)
+
+    async def run_once(self) -> bool:
+        """
+        task 하나를 점유하여 실행한다
+        :return: 실행한 task가 있는지 여부
+        """
+        async with db.create_session() as session:
+            taskRepository = TaskRepository(session=session)
+            tasks = await taskRepository.claim_tasks(limit=1, lease_seconds=SETTINGS.TASK_LEASE_SECONDS)
+            if not tasks:
+                return False
+            await self.execute(taskRepository, tasks[0])
+            return True
+
+    async def execute(self, taskRepository: TaskRepository, task: Task) -> None:
+        """
+        점유한 task를 실행하고, 결과에 따라 완료/재시도/실패 처리한다
+        """
+        task_id, locked_by = task.task_id, task.locked_by
+        renewer = asyncio.create_task(self.__renew_lease(task_id, locked_by))
+        try:
+            try:
+                token = await self.get_service_token()
+                await TASK_HANDLERS[task.task_type](taskRepository.db, task.payload, token)
+            finally:
+                # 완료/실패 처리 이전에 연장을 멈춘다
+                renewer.cancel()
+        except Exception as e:
+            await taskRepository.rollback()
+            await taskRepository.refresh(task)
+            utcnow, retry_at = datetime.utcnow(), None
+            if (task.attempts < SETTINGS.TASK_MAX_ATTEMPTS
+                    and not SETTINGS.TASK_RETRY_POLICY.is_expired((utcnow - task.created_at).total_seconds())):
+                retry_at = utcnow + timedelta(seconds=SETTINGS.TASK_RETRY_POLICY.get_interval(task.attempts - 1))
+            logger.warning(f'task {task.task_id}({task.task_type.value}) failed '
+                           f'(attempts: {task.attempts}, retry_at: {retry_at}) : {e!r}')
+            updated = await taskRepository.fail_task(task, locked_by, error=repr(e), retry_at=retry_at)
+        else:
+            updated = await taskRepository.complete_task(task, locked_by)
+        if not updated:
+            logger.warning(f'task {task_id}({task.task_type.value}) was claimed by another worker, result ignored')
+
+    async def __renew_lease(self, task_id: int, locked_by: str) -> None:
+        """
+        task를 실행하는 동안 TASK_LEASE_RENEW_INTERVAL마다 점유 시간을 연장한다
+        (handler가 사용하는 session과 별도의 session 사용)
+        """
+        while True:
+            await asyncio.sleep(SETTINGS.TASK_LEASE_RENEW_INTERVAL)
+            try:
+                async with db.create_session() as session:
+                    renewed = await TaskRepository(session=session).renew_lease(task_id, locked_by,
+                                                                                SETTINGS.TASK_LEASE_SECONDS)
+            except Exception as e:
+                logger.error(f'task {task_id} lease renewal error : {e!r}')
+                continue
+            if not renewed:
+                logger.warning(f'task {task_id} lease was lost, stop renewing')
+                return
+
+    async def get_service_token(self) -> str:
+        """
+        서비스 계정의 token을 리턴한다 (만료 1분 전까지 재사용)
+        """
+        return await service_token_provider.get_token()
+
+
+task_worker_pool = TaskWorkerPool()
@@ -1,30 +1,46 @@
-import asyncio
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from fastapi import Depends, BackgroundTasks
+from fastapi import Depends
+from sqlalchemy.orm import selectinload
 
 from backend.client import cinder_client
+from backend.core.config import get_setting
 from backend.core.exception import ApiServerException
+from backend.core.status_cache import volume_status_cache
+from backend.core.watcher import status_watcher, WatchComponent
+from backend.model.task import TaskType
 from backend.model.volume import Volume, VolumeStatus
+from backend.repository.task import TaskRepository
 from backend.repository.volume import VolumeRepository
 from backend.schema.volume import VolumeCreateRequest, VolumeQuery, VolumeUpdateInfoRequest, VolumeSizeUpdateRequest
 from backend.util.constant import (ERR_VOLUME_LIMIT_OVER, ERR_VOLUME_NOT_FOUND,
                                    ERR_VOLUME_ALREADY_DELETED, ERR_VOLUME_NAME_DUPLICATED, ERR_VOLUME_SERVER_CONFLICT,
                                    ERR_VOLUME_STATUS_CONFLICT, ERR_VOLUME_SIZE_UPGRADE_CONFLICT)
-from backend.util.func import update_model_value
+from backend.util.backoff import BackoffPolicy
+from backend.util.func import update_model_value, update_model_status
+
+SETTINGS = get_setting()
 
 
 class VolumeService:
-    def __init__(self, volumeRepository: VolumeRepository = Depends()):
+    def __init__(self, volumeRepository: VolumeRepository = Depends(), taskRepository: TaskRepository = Depends()):
         self.volumeRepository = volumeRepository
+        self.taskRepository = taskRepository
 
     async def get_volumes_by_query(self, queryInput: VolumeQuery):
         """
         모든 volume list를 반환
         :return: volume list
         """
-        return await self.volumeRepository.find_volumes_by_query(queryInput)
+        return await self.volumeRepository.find_volumes_by_query(queryInput, loader=selectinload)
+
+    async def count_volumes_by_query(self, queryInput: VolumeQuery) -> int:
+        """
+        query의 검색조건에 해당하는 volume 수 (DB만 조회)
+        :return: volume 수
+        """
+        return await self.volumeRepository.count_volumes_by_query(queryInput)
 
     async def get_volume_by_id(self, id: UUID):
         """
@@ -33,7 +49,7 @@ class VolumeService:
         :return: volume
         :raises ApiServerException: 404(해당 볼륨 없음)
         """
-        volume = await self.volumeRepository.find_volume_by_id(id=id)
+        volume = await self.volumeRepository.find_volume_by_id(id=id, loader=selectinload)
         if not volume:
             raise ApiServerException(status=404, message=ERR_VOLUME_NOT_FOUND, detail=f'volume (id : {id}) not found')
         return volume
@@ -52,7 +68,9 @@ class VolumeService:
         if volumeRemainLimitDto.remain_cnt <= 0 or volumeRemainLimitDto.remain_size < volumeCreateRequest.size:
             raise ApiServerException(status=409, error_type='error', message=ERR_VOLUME_LIMIT_OVER)
         volumeDto = await cinder_client.create_volume(volumeCreateRequest=volumeCreateRequest, token=token)
-        new_volume = await self.volumeRepository.save_volume(Volume(**volumeDto.model_dump(exclude={'status'})))
+        new_volume = Volume(**volumeDto.model_dump(exclude={'status'}))
+        update_model_status(new_volume, volumeDto.status)
+        new_volume = await self.volumeRepository.save_volume(new_volume)
         await self.volumeRepository.commit()
         return new_volume
 
@@ -62,7 +80,7 @@ class VolumeService:
         :return: updated volume
         :raises: ApiServerException: 404(볼륨 없는 경우), 409(볼륨 삭제된 경우, 이름 중복)
         """
-        volume = await self.volumeRepository.find_volume_by_id(id=id)
+        volume = await self.volumeRepository.find_volume_by_id(id=id, loader=selectinload)
         # 볼륨 없는 경우
         if not volume:
             raise ApiServerException(status=404, message=ERR_VOLUME_NOT_FOUND, detail=f'volume (id : {id}) not found')
@@ -104,27 +122,29 @@ class VolumeService:
         # CINDER : 볼륨 상태 확인: available, in-use, error, error_restoring, error_extending 상태면 삭제 가능
         curVolumeDto = await cinder_client.show_volume_detail(id=id, token=token)
         cur_status = curVolumeDto.status
+        update_model_status(volume, cur_status)
         if cur_status not in (
                 VolumeStatus.AVAILABLE, VolumeStatus.IN_USE, VolumeStatus.ERROR, VolumeStatus.ERROR_RESTORING,
                 VolumeStatus.ERROR_EXTENDING):
             raise ApiServerException(status=409, message=ERR_VOLUME_STATUS_CONFLICT)
         # CINDER : 볼륨 삭제 요청
         await cinder_client.delete_a_volume(id=id, token=token)
+        volume_status_cache.invalidate(id)
         # DB soft delete
         volume.deleted_at = datetime.utcnow()
+        update_model_status(volume, VolumeStatus.DELETED)
         await self.volumeRepository.commit()
         return None
 
-    async def extend_volume_size_by_id(self, id: UUID, volumeSizeUpdateRequest: VolumeSizeUpdateRequest, token: str,
-                                       bg_task: BackgroundTasks):
+    async def extend_volume_size_by_id(self, id: UUID, volumeSizeUpdateRequest: VolumeSizeUpdateRequest, token: str):
         """
-        cinder client 이용하여 볼륨 용량 증가 요청 + polling하며 용량 증가되었다면 업데이트
+        cinder client 이용하여 볼륨 용량 증가 요청 + 용량 증가되었다면 업데이트하는 task 저장 (worker가 실행)
         :param id: volume id
         :param token: 인증 토큰
         :return: None
         :raises: ApiServerException: 404(해당 volume 없음) / 409(해당 volume 이미 삭제됨 , 볼륨 상태 availalbe 아닌 경우 ,  현재보다 작거나 같은 크기로 변경하는 경우, quota 부족한 경우)
         """
-        volume = await self.volumeRepository.find_volume_by_id(id=id)
+        volume = await self.volumeRepository.find_volume_by_id(id=id, loader=selectinload)
         # 볼륨 없는 경우
         if not volume:
             raise ApiServerException(status=404, message=ERR_VOLUME_NOT_FOUND, detail=f'volume (id : {id}) not found')
@@ -133,6 +153,7 @@ class VolumeService:
             raise ApiServerException(status=409, message=ERR_VOLUME_ALREADY_DELETED)
         # CINDER : 볼륨 정보 GET
         curVolumeDto = await cinder_client.show_volume_detail(id=id, token=token)
+        update_model_status(volume, curVolumeDto.status)
         # 볼륨 상태 available 여야함
         if curVolumeDto.status != VolumeStatus.AVAILABLE:
             raise ApiServerException(status=409, message=ERR_VOLUME_STATUS_CONFLICT)
@@ -146,28 +167,32 @@ class VolumeService:
             raise ApiServerException(status=409, message=ERR_VOLUME_LIMIT_OVER)
         # CINDER : 볼륨 용량 증가 요청
         await cinder_client.extend_a_volume_size(id=id, volumeSizeUpdateRequest=volumeSizeUpdateRequest, token=token)
+        volume_status_cache.invalidate(id)
+        update_model_status(volume, VolumeStatus.EXTENDING)  # cinder는 요청을 받으면서 extending으로 변경한다
         # task
-        bg_task.add_task(self._task_after_extend_volume, token, volume)
+        await self.taskRepository.enqueue_task(TaskType.VOLUME_AFTER_EXTEND,
+                                               payload={'volume_id': str(volume.volume_id)})
+        await self.taskRepository.commit()
         return volume
 
     async def _task_after_extend_volume(self, token: str, volume: Volume,
-                                        interval_time: Optional[int] = 1,
-                                        polling_limit: Optional[int] = 100):
+                                        policy: Optional[BackoffPolicy] = None):
         """
         check volume status & set size
         - EXTENDING
         - AVAILABLE : db volume size update
         - ERROR_EXTENDING
         """
-        for _ in range(polling_limit):
-            await asyncio.sleep(interval_time)
-            # CINDER check info regularly until AVAILABLE/ERROR_EXTENDING
-            volumeDto = await cinder_client.show_volume_detail(id=volume.volume_id, token=token)
-            if volumeDto.status == VolumeStatus.AVAILABLE:
-                # DB volume update
-                volume.size = volumeDto.size
-                await self.volumeRepository.save_volume(volume)
-                await self.volumeRepository.commit()
-                return
-            elif volumeDto.status == VolumeStatus.ERROR_EXTENDING:
-                return
+        # CINDER check info regularly until AVAILABLE/ERROR_EXTENDING (status watcher가 다른 볼륨과 묶어서 조회)
+        volumeDto = await status_watcher.watch(WatchComponent.VOLUME, id=volume.volume_id,
+                                               target_statuses=[VolumeStatus.AVAILABLE],
+                                               failure_statuses=[VolumeStatus.ERROR_EXTENDING],
+                                               policy=policy or SETTINGS.POLLING_POLICY_EXTEND_VOLUME)
+        if volumeDto is None:
+            return
+        update_model_status(volume, volumeDto.status)
+        if volumeDto.status == VolumeStatus.AVAILABLE:
+            # DB volume update
+            volume.size = volumeDto.size
+        await self.volumeRepository.save_volume(volume)
+        await self.volumeRepository.commit()
@@ -0,0 +1,35 @@
+import random
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class BackoffPolicy(BaseModel):
+    """
+    polling/재시도 간격을 결정하는 정책 (exponential backoff + jitter)
+
+    n번째(0부터) 간격 = min(max_interval, min_interval * multiplier^n) * (1 ± jitter)
+    deadline이 지나면 더 이상 polling/재시도 하지 않는다
+    Settings에서는 json 문자열로 설정 가능하다 (ex. '{"min_interval": 1, "max_interval": 10}')
+    """
+    min_interval: float = Field(default=1, ge=0, description='첫 간격(초)')
+    max_interval: float = Field(default=10, ge=0, description='최대 간격(초)')
+    multiplier: float = Field(default=2, ge=1, description='간격 증가 배수')
+    jitter: float = Field(default=0.2, ge=0, le=1, description='간격을 무작위로 변경하는 비율 (요청 몰림 방지)')
+    deadline: Optional[float] = Field(default=None, ge=0, description='총 대기 시간(초), None이면 제한 없음')
+
+    def get_interval(self, attempt: int) -> float:
+        """
+        :param attempt: 지금까지 polling/재시도 한 횟수
+        :return: 다음 polling/재시도까지의 간격(초)
+        """
+        interval = min(self.max_interval, self.min_interval * self.multiplier ** attempt)
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return interval
+
+    def is_expired(self, elapsed: float) -> bool:
+        """
+        :param elapsed: 처음 시작한 이후 지난 시간(초)
+        :return: deadline이 지났는지 여부
+        """
+        return self.deadline is not None and elapsed >= self.deadline
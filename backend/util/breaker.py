@@ -0,0 +1,89 @@
+import enum
+import time
+from collections import deque
+from typing import Deque
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = 'closed'  # 정상 : 모든 요청 허용
+    OPEN = 'open'  # 장애 : 모든 요청 즉시 실패
+    HALF_OPEN = 'half_open'  # 복구 확인 : 일부 요청만 허용
+
+
+class CircuitBreaker:
+    """
+    최근 요청의 실패율에 따라 요청을 차단하는 클래스
+
+    - failure_rate : 최근 window_size개의 요청 중 실패 비율이 이 값 이상이면 OPEN (최소 minimum_calls개 이상일 때)
+    - open_seconds : OPEN 상태를 유지하는 시간(초), 지나면 HALF_OPEN
+    - half_open_calls : HALF_OPEN 상태에서 허용하는 요청 수, 모두 성공하면 CLOSED / 하나라도 실패하면 다시 OPEN
+    allow로 요청 가능 여부를 확인하고, 허용된 요청은 반드시 record로 결과를 기록하거나 discard로 기록하지 않음을 알린다
+    """
+
+    def __init__(self, failure_rate: float = 0.5, minimum_calls: int = 10, window_size: int = 20,
+                 open_seconds: float = 30, half_open_calls: int = 3) -> None:
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(half_open_calls, 1)
+        self.__window: Deque[bool] = deque(maxlen=max(window_size, 1))  # 최근 요청의 성공 여부
+        self.__state = CircuitState.CLOSED
+        self.__opened_at = 0.0
+        self.__trials = 0  # HALF_OPEN 상태에서 허용한 요청 수
+        self.__successes = 0  # HALF_OPEN 상태에서 성공한 요청 수
+
+    @property
+    def state(self) -> CircuitState:
+        if self.__state == CircuitState.OPEN and self.get_retry_after() <= 0:
+            self.__state, self.__trials, self.__successes = CircuitState.HALF_OPEN, 0, 0
+        return self.__state
+
+    def get_retry_after(self) -> float:
+        """
+        :return: OPEN 상태가 끝나기까지 남은 시간(초)
+        """
+        return max(0.0, self.__opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        :return: 요청 가능 여부 (HALF_OPEN 상태에서는 half_open_calls개까지만 허용)
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self.__trials < self.half_open_calls:
+            self.__trials += 1
+            return True
+        return False
+
+    def record(self, success: bool) -> None:
+        """
+        허용된 요청의 결과를 기록하고 상태를 변경한다
+        """
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            if not success:
+                self.__open()
+                return
+            self.__successes += 1
+            if self.__successes >= self.half_open_calls:
+                self.__state = CircuitState.CLOSED
+                self.__window.clear()
+        elif state == CircuitState.CLOSED:
+            self.__window.append(success)
+            failures = self.__window.count(False)
+            if len(self.__window) >= self.minimum_calls and failures / len(self.__window) >= self.failure_rate:
+                self.__open()
+
+    def discard(self) -> None:
+        """
+        허용된 요청의 결과를 기록하지 않는다 (요청 취소 등 component의 상태와 무관한 경우)
+        HALF_OPEN 상태라면 허용한 요청 수를 돌려주어 다른 요청으로 복구를 확인한다
+        """
+        if self.state == CircuitState.HALF_OPEN and self.__trials > 0:
+            self.__trials -= 1
+
+    def __open(self) -> None:
+        self.__state = CircuitState.OPEN
+        self.__opened_at = time.monotonic()
+        self.__window.clear()
@@ -0,0 +1,78 @@
+import asyncio
+import enum
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+
+class Lane(str, enum.Enum):
+    INTERACTIVE = 'interactive'  # 사용자 요청 (우선 처리)
+    BACKGROUND = 'background'  # worker, status watcher 등
+
+
+class Bulkhead:
+    """
+    동시 실행 수를 제한하고, 대기하는 요청은 lane의 우선순위(INTERACTIVE -> BACKGROUND) 순서로 실행하는 클래스
+
+    - limit : 최대 동시 실행 수 (0 이하인 경우 제한 없음)
+    - max_queue : lane별 최대 대기 수, 넘는 경우 acquire는 대기하지 않고 False를 리턴한다 (load shedding)
+    - on_queue_change : (optional) lane의 대기 수가 변경될 때 (lane, 대기 수)로 호출하는 함수 (ex. metrics 기록)
+    acquire로 실행 권한을 얻은 경우, 반드시 release로 반환한다
+    """
+
+    def __init__(self, limit: int, max_queue: Dict[Lane, int],
+                 on_queue_change: Optional[Callable[[Lane, int], None]] = None) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.on_queue_change = on_queue_change
+        self.active = 0  # 실행중인 수
+        self.__queues: Dict[Lane, Deque[asyncio.Future]] = {lane: deque() for lane in Lane}
+
+    def get_queue_depth(self, lane: Lane) -> int:
+        return len(self.__queues[lane])
+
+    async def acquire(self, lane: Lane) -> bool:
+        """
+        실행 권한을 얻는다 (없다면 우선순위에 따라 받을 때까지 대기)
+        :return: 실행 권한을 얻었는지 여부 (해당 lane의 대기열이 가득 찬 경우 False)
+        """
+        if self.limit <= 0:
+            return True
+        if self.active < self.limit and not any(self.__queues.values()):
+            self.active += 1
+            return True
+        queue = self.__queues[lane]
+        if len(queue) >= self.max_queue.get(lane, 0):
+            return False
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        self.__notify(lane)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # 권한을 넘겨받은 뒤 취소된 경우 반환
+            elif future in queue:
+                queue.remove(future)
+                self.__notify(lane)
+            raise
+        return True
+
+    def release(self) -> None:
+        """
+        실행 권한을 반환한다 (대기중인 요청이 있다면 우선순위가 높은 lane의 요청에 넘겨준다)
+        """
+        if self.limit <= 0:
+            return
+        for lane in Lane:
+            queue = self.__queues[lane]
+            while queue:
+                future = queue.popleft()
+                if not future.done():
+                    future.set_result(None)  # active 수는 유지한 채로 권한을 넘겨준다
+                    self.__notify(lane)
+                    return
+        self.active -= 1
+
+    def __notify(self, lane: Lane) -> None:
+        if self.on_queue_change is not None:
+            self.on_queue_change(lane, len(self.__queues[lane]))
@@ -0,0 +1,32 @@
+import json
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # orjson이 설치되지 않은 경우 표준 json 사용
+    orjson = None
+    ORJSONResponse = None
+
+# API 응답에 사용하는 response class (orjson이 설치된 경우 ORJSONResponse)
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def dumps(obj: Any) -> str:
+    """
+    obj를 json 문자열로 변환한다 (openstack 요청 body 등)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    json(bytes 혹은 문자열)을 파싱한다 (openstack 응답 body 등)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,6 +3,8 @@ from typing import Final
 USER_TOKEN_HEADER_FIELD: Final[str] = 'token'
 OA_TOKEN_LOGIN_HEADER_FIELD: Final[str] = 'X-Subject-Token'
 OA_TOKEN_HEADER_FIELD: Final[str] = 'X-Auth-Token'
+NEXT_CURSOR_HEADER_FIELD: Final[str] = 'X-Next-Cursor'
+TOTAL_COUNT_HEADER_FIELD: Final[str] = 'X-Total-Count'
 
 # RESPSNSE STRING
 RESPONSE_LOGIN_SUCCESS: Final[str] = '로그인 성공'
@@ -11,6 +13,10 @@ RESPONSE_LOGOUT_SUCCESS: Final[str] = '로그아웃 성공'
 # ERROR STRING
 ERR_NO_TOKEN_IN_HEADER: Final[str] = '요청 헤더에 토큰이 존재하지 않습니다'
 ERR_TOKEN_INVALID: Final[str] = '해당 토큰이 유효하지 않습니다'
+ERR_OPENSTACK_TIMEOUT: Final[str] = 'openstack의 응답 시간이 초과되었습니다'
+ERR_OPENSTACK_UNAVAILABLE: Final[str] = 'openstack 서비스에 장애가 발생하여 요청을 수행할 수 없습니다'
+ERR_OPENSTACK_BUSY: Final[str] = 'openstack 서비스로의 요청이 많아 요청을 수행할 수 없습니다'
+ERR_INVALID_CURSOR: Final[str] = '올바르지 않은 cursor입니다'
 ERR_FLOATINGIP_NOT_FOUND: Final[str] = '해당하는 id의 floating ip가 존재하지 않습니다'
 ERR_FLOATINGIP_LIMIT_OVER: Final[str] = '남아있는 floating ip 할당량이 없습니다'
 ERR_FLOATINGIP_STATUS_CONFLICT: Final[str] = ' floating ip가 요청을 수행할 수 있는 상태가 아닙니다'
@@ -1,9 +1,54 @@
+import asyncio
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, List, TypeVar
+
 from pydantic import BaseModel
 
 from backend.core.db import Base
 
+T = TypeVar('T')
+R = TypeVar('R')
+
 
 def update_model_value(db_model: Base, updateDto: BaseModel) -> None:
     for field, value in dict(updateDto).items():
         if hasattr(db_model, field) and value is not None:  # enable partial update
             setattr(db_model, field, value)
+    if getattr(updateDto, 'status', None) is not None and hasattr(db_model, 'status_checked_at'):
+        db_model.status_checked_at = datetime.utcnow()  # openstack에서 조회한 상태를 반영한 경우
+
+
+def update_model_status(db_model: Base, status: str) -> None:
+    """
+    openstack에서 확인한 자원의 상태와 확인한 시간을 db model에 기록한다 (freshness=db 조회시 응답하는 상태)
+    """
+    db_model.status = status
+    db_model.status_checked_at = datetime.utcnow()
+
+
+async def gather_with_concurrency(func: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int) -> List[R]:
+    """
+    items의 각 원소에 대하여 func를 동시에 실행하되, 최대 limit개까지만 동시에 실행한다 (semaphore)
+
+    :param func: 각 원소에 대하여 실행할 coroutine function
+    :param items: 원소 list
+    :param limit: 최대 동시 실행 수 (0 이하인 경우 제한 없음)
+    :return: 실행 결과 list (items와 같은 순서)
+    :raises: 실행 중 발생한 첫번째 exception (나머지 실행은 취소)
+    """
+    items = list(items)
+    if limit <= 0:
+        limit = max(len(items), 1)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    token bucket 방식으로 초당 요청 수를 제한하는 클래스
+
+    - rate : 초당 허용하는 요청 수 (0 이하인 경우 제한 없음)
+    - burst : 한 번에 허용하는 최대 요청 수 (bucket 크기)
+    acquire시 token이 없다면 token이 채워질 때까지 기다린다
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.__tokens = float(self.burst)
+        self.__updated_at = time.monotonic()
+        self.__lock = None
+
+    async def acquire(self) -> None:
+        """
+        token 하나를 소모한다 (없다면 채워질 때까지 대기)
+        """
+        if self.rate <= 0:
+            return
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:  # 대기 순서 보장
+            while True:
+                now = time.monotonic()
+                self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_at) * self.rate)
+                self.__updated_at = now
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
@@ -3,6 +3,8 @@ import httpx
 from pytest_mock import MockFixture
 
 from backend.client.base import BaseClient
+from backend.core.exception_handler import ErrorContent
+from backend.util.constant import ERR_NO_TOKEN_IN_HEADER
 
 
 @pytest.mark.asyncio
@@ -17,3 +19,45 @@ async def test_health_check(test_client: httpx.AsyncClient, mocker: MockFixture)
     response = await test_client.get("/api/healthcheck/")
     # then
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_health_check_degraded(test_client: httpx.AsyncClient, mocker: MockFixture):
+    """
+    test healthcheck api
+    * 200 (degraded) : keystone 요청이 실패한 경우
+    """
+    # given
+    mocker.patch.object(BaseClient, 'request_openstack', side_effect=TimeoutError())
+    # when
+    response = await test_client.get("/api/healthcheck/")
+    # then
+    assert response.status_code == 200
+    assert response.json()['status'] == 'degraded'
+    assert response.json()['keystone'] == 'error'
+
+
+@pytest.mark.asyncio
+async def test_metrics(test_client_no_token: httpx.AsyncClient):
+    """
+    test metrics api
+    * 200 : 인증된 요청
+    """
+    # when
+    response = await test_client_no_token.get("/api/metrics/")
+    # then
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+
+@pytest.mark.asyncio
+async def test_metrics_no_token(test_client: httpx.AsyncClient):
+    """
+    test metrics api
+    * 401 : 인증 token이 없는 경우
+    """
+    # when
+    response = await test_client.get("/api/metrics/")
+    # then
+    assert response.status_code == 401
+    assert response.json() == ErrorContent(error_type='error', message=ERR_NO_TOKEN_IN_HEADER, detail='').__dict__
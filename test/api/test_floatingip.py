@@ -303,7 +303,7 @@ async def test_floatingip_attach_port_success(test_client_no_token: httpx.AsyncC
     mocked_update_client_response = NeutronClientMock.update_floating_ip_success(floatingip=cur_floatingip)
     mocker.patch.object(NeutronClient, 'update_floating_ip', return_value=mocked_update_client_response)
     mocker.patch.object(NovaClient, 'show_server_details',
-                        return_value=ServerDto(**basic_server_with_port.__dict__, status=ServerStatus.ACTIVE))
+                        return_value=ServerDto(**{**basic_server_with_port.__dict__, 'status': ServerStatus.ACTIVE}))
     mocker.patch.object(FloatingipResponse, 'mapper', FloatingipResponseMock.mapper)
 
     # when
@@ -357,7 +357,7 @@ async def test_floatingip_attach_port_server_status(test_client_no_token: httpx.
     cur_floatingip = basic_floatingip
     request = {'port_id': str(basic_server_with_port.fk_port_id)}
     mocker.patch.object(NovaClient, 'show_server_details',
-                        return_value=ServerDto(**basic_server_with_port.__dict__, status=ServerStatus.ERROR))
+                        return_value=ServerDto(**{**basic_server_with_port.__dict__, 'status': ServerStatus.ERROR}))
     # when
     response = await test_client_no_token.patch(f"/api/floatingips/{cur_floatingip.floatingip_id}/ports/", json=request)
 
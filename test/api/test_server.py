@@ -2,7 +2,7 @@ import uuid
 import httpx
 import pytest
 from pytest_mock import MockFixture
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import get_setting
@@ -16,7 +16,8 @@ from backend.util.constant import (ERR_SERVER_NOT_FOUND, ERR_FLAVOR_NOT_FOUND, E
                                    ERR_IMAGE_SIZE_CONFLICT, ERR_SERVER_NAME_DUPLICATED, ERR_VOLUME_NAME_DUPLICATED,
                                    ERR_SERVER_ALREADY_DELETED,
                                    ERR_VOLUME_NOT_FOUND, ERR_VOLUME_ALREADY_DELETED, ERR_SERVER_ROOT_VOLUME_CANT_DETACH,
-                                   ERR_SERVER_VOLUME_NOT_CONNECTED, ERR_SERVER_LIMIT_OVER, ERR_VOLUME_LIMIT_OVER)
+                                   ERR_SERVER_VOLUME_NOT_CONNECTED, ERR_SERVER_LIMIT_OVER, ERR_VOLUME_LIMIT_OVER,
+                                   TOTAL_COUNT_HEADER_FIELD)
 from test.conftest import generate_string
 from test.mock.cinder import cinder_client_mock
 from test.mock.glance import glance_client_mock
@@ -46,6 +47,29 @@ async def test_server_list_basic(test_client_no_token: httpx.AsyncClient, test_d
     assert response.json() == [el.model_dump(mode='json') for el in expected_response]
 
 
+@pytest.mark.asyncio
+async def test_server_list_total_count(test_client_no_token: httpx.AsyncClient, test_db_session: AsyncSession,
+                                       basic_server: Server, mocker: MockFixture):
+    """
+    test server list api (include_total), server count api (HEAD)
+    * 200: X-Total-Count 헤더에 서버 수
+    * HEAD는 응답 mapper(openstack 조회)를 호출하지 않음
+    """
+    # given
+    total = await test_db_session.scalar(select(func.count()).select_from(Server))
+    mapper_mock = mocker.patch.object(ServerResponse, 'mapper', side_effect=ServerResponseMock.mapper)
+
+    # when
+    response = await test_client_no_token.get('/api/servers/', params={'include_total': 'exact', 'per_page': 1})
+    head_response = await test_client_no_token.head('/api/servers/')
+    # then
+    assert response.status_code == 200
+    assert response.headers[TOTAL_COUNT_HEADER_FIELD] == str(total)
+    assert head_response.status_code == 200
+    assert head_response.headers[TOTAL_COUNT_HEADER_FIELD] == str(total)
+    assert mapper_mock.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_server_get_basic(test_client_no_token: httpx.AsyncClient, test_db_session: AsyncSession,
                                 basic_server: Server, mocker: MockFixture):
@@ -540,13 +564,17 @@ async def test_update_server_power_success(test_client_no_token: httpx.AsyncClie
     }
     # given [MOCK] nova run an action
     mocker.patch('backend.service.server.nova_client.run_an_action', return_value=None)
+    # given [MOCK] status watcher
+    register_mock = mocker.patch('backend.service.server.status_watcher.register')
     # given [MOCK] response
     mocker.patch.object(ServerResponse, 'mapper', ServerResponseMock.mapper)
     # when
     response = await test_client_no_token.patch(f'api/servers/{cur_server.server_id}/power/', json=request)
 
-    # then
+    # then : 변경 이전 상태는 지우고, 변경이 끝날 때까지 추적
     assert response.status_code == 202
+    assert cur_server.status is None and cur_server.status_checked_at is None
+    assert register_mock.call_args.kwargs['target_statuses'] == [ServerStatus.ACTIVE]
 
 
 @pytest.mark.asyncio
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.exception_handler import ErrorContent
+from backend.core.status_cache import CheckedStatus
 from backend.model.server import Server
 from backend.model.volume import Volume, VolumeStatus
 from backend.schema.response import VolumeResponse
@@ -96,7 +97,8 @@ async def test_volume_create_success(test_client_no_token: httpx.AsyncClient, mo
     mocker.patch('backend.service.volume.cinder_client.create_volume',
                  return_value=cinder_client_mock.create_volume_success(volume_created_id, request))
     # given [MOCK] volume status : CREATING
-    mocker.patch('backend.schema.response.get_volume_status_by_id_or_deleted', return_value=VolumeStatus.CREATING)
+    mocker.patch('backend.schema.response.get_volume_status_by_id_or_deleted',
+                 return_value=CheckedStatus(VolumeStatus.CREATING, None))
 
     # when
     response = await test_client_no_token.post('/api/volumes/', json=request)
@@ -0,0 +1,60 @@
+"""
+json codec micro-benchmark (표준 json vs backend.util.codec)
+가장 큰 응답인 glance image list, nova flavor list(detail)의 파싱 & 직렬화 시간을 비교한다
+
+실행 : python -m test.benchmark.codec_benchmark [--images 5000] [--flavors 1000] [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+import uuid
+
+from backend.util import codec
+
+
+def generate_images(count: int) -> bytes:
+    images = [{
+        'id': str(uuid.uuid4()), 'name': f'image-{i}', 'status': 'active', 'visibility': 'public',
+        'disk_format': 'qcow2', 'container_format': 'bare', 'min_disk': 0, 'min_ram': 0,
+        'size': 1 << 30, 'virtual_size': 10 << 30, 'checksum': uuid.uuid4().hex, 'os_hash_algo': 'sha512',
+        'os_hash_value': uuid.uuid4().hex * 4, 'owner': uuid.uuid4().hex, 'protected': False, 'tags': [],
+        'created_at': '2024-01-01T00:00:00Z', 'updated_at': '2024-01-01T00:00:00Z',
+        'self': f'/v2/images/{i}', 'file': f'/v2/images/{i}/file', 'schema': '/v2/schemas/image',
+    } for i in range(count)]
+    return json.dumps({'images': images, 'first': '/v2/images', 'schema': '/v2/schemas/images'}).encode()
+
+
+def generate_flavors(count: int) -> bytes:
+    flavors = [{
+        'id': str(i), 'name': f'flavor-{i}', 'ram': 2048, 'disk': 20, 'vcpus': 2, 'swap': '',
+        'OS-FLV-EXT-DATA:ephemeral': 0, 'OS-FLV-DISABLED:disabled': False, 'rxtx_factor': 1.0,
+        'os-flavor-access:is_public': True, 'description': None, 'extra_specs': {'hw:cpu_policy': 'shared'},
+        'links': [{'rel': 'self', 'href': f'http://openstack/compute/v2.1/flavors/{i}'},
+                  {'rel': 'bookmark', 'href': f'http://openstack/compute/flavors/{i}'}],
+    } for i in range(count)]
+    return json.dumps({'flavors': flavors}).encode()
+
+
+def run(name: str, body: bytes, repeat: int) -> None:
+    data = json.loads(body)
+    results = {
+        'loads(json)': timeit.timeit(lambda: json.loads(body), number=repeat),
+        'loads(codec)': timeit.timeit(lambda: codec.loads(body), number=repeat),
+        'dumps(json)': timeit.timeit(lambda: json.dumps(data), number=repeat),
+        'dumps(codec)': timeit.timeit(lambda: codec.dumps(data), number=repeat),
+    }
+    print(f'{name} ({len(body) / 1024:.0f} KiB, orjson: {codec.orjson is not None})')
+    for key, elapsed in results.items():
+        print(f'  {key:<14} {elapsed / repeat * 1000:8.3f} ms')
+    print(f'  loads x{results["loads(json)"] / results["loads(codec)"]:.1f}, '
+          f'dumps x{results["dumps(json)"] / results["dumps(codec)"]:.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=int, default=5000)
+    parser.add_argument('--flavors', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run('glance image list', generate_images(args.images), args.repeat)
+    run('nova flavor list', generate_flavors(args.flavors), args.repeat)
@@ -0,0 +1,45 @@
+"""
+reconcile micro-benchmark
+openstack 자원(dto) -> 행 변환과 DB 행과의 비교(diff) 시간을 측정한다 (DB, openstack 요청 시간은 제외)
+
+실행 : python -m test.benchmark.reconcile_benchmark [--count 50000] [--changed 0.1]
+"""
+import argparse
+import datetime
+import random
+import timeit
+import uuid
+
+from backend.model.volume import VolumeStatus
+from backend.schema.volume import VolumeDto
+from backend.service.reconcile import ReconcileService, VOLUME_COLUMNS, to_row
+
+
+def generate_volumes(count: int) -> list:
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return [VolumeDto(volume_id=uuid.uuid4(), name=f'volume-{i}', description='', volume_type='lvmdriver-1', size=10,
+                      fk_project_id=uuid.uuid4(), status=VolumeStatus.AVAILABLE, created_at=created_at,
+                      updated_at=created_at) for i in range(count)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--changed', type=float, default=0.1, help='DB와 다른 자원의 비율')
+    args = parser.parse_args()
+
+    volumeDtos = generate_volumes(args.count)
+    start = timeit.default_timer()
+    current = {volumeDto.volume_id: to_row(volumeDto, datetime.datetime.utcnow()) for volumeDto in volumeDtos}
+    to_row_elapsed = timeit.default_timer() - start
+
+    stored = {id: dict(row) for id, row in current.items()}
+    for row in random.sample(list(stored.values()), int(args.count * args.changed)):
+        row['size'] += 1
+    start = timeit.default_timer()
+    created, updated, deleted = ReconcileService.diff(current, stored, VOLUME_COLUMNS, datetime.datetime.utcnow())
+    diff_elapsed = timeit.default_timer() - start
+
+    print(f'volumes : {args.count}, updated : {len(updated)}')
+    print(f'  to_row {to_row_elapsed * 1000:8.1f} ms')
+    print(f'  diff   {diff_elapsed * 1000:8.1f} ms')
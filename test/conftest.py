@@ -6,11 +6,14 @@ import string
 import httpx
 from asgi_lifespan import LifespanManager
 from fastapi import Request
+from pytest_mock import MockFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app import create_app_with_db
 from backend.core.config import get_setting
 from backend.core.dependency import get_token_or_raise
+from backend.core.status_cache import StatusCache, server_status_cache, volume_status_cache, floatingip_status_cache
+from backend.core.watcher import StatusWatcher
 from backend.model.floatingip import Floatingip
 from backend.model.server import Server
 from backend.model.volume import Volume
@@ -48,6 +51,32 @@ async def reset_test_db():
     await db_.disconnect()
 
 
+@pytest.fixture(autouse=True)
+def clear_status_cache():
+    """
+    test마다 mock한 openstack 상태를 다시 조회하도록 자원 상태 cache를 비운다
+    """
+    yield
+    for status_cache in (server_status_cache, volume_status_cache, floatingip_status_cache):
+        status_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_watcher_service_token(mocker: MockFixture):
+    """
+    status watcher가 keystone에 서비스 계정 token을 요청하지 않도록 한다
+    """
+    mocker.patch.object(StatusWatcher, 'get_service_token', return_value='')
+
+
+@pytest.fixture(autouse=True)
+def mock_status_cache_service_token(mocker: MockFixture):
+    """
+    자원 상태 cache의 background 갱신이 keystone에 서비스 계정 token을 요청하지 않도록 한다
+    """
+    mocker.patch.object(StatusCache, 'get_service_token', return_value='')
+
+
 @pytest.fixture
 async def test_client_no_token():
     """
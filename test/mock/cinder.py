@@ -23,10 +23,10 @@ class CinderClientMock(CinderClient):
         volume.name = request['name']
         volume.description = request['description']
 
-        return VolumeDto(
+        return VolumeDto(**{
             **volume.__dict__,
-            status=VolumeStatus.AVAILABLE
-        )
+            'status': VolumeStatus.AVAILABLE
+        })
 
     @staticmethod
     def create_volume_success(volume_id: UUID, request: dict):
@@ -54,7 +54,7 @@ class CinderClientMock(CinderClient):
         """
         해당 status를 갖는 volumedto 리턴
         """
-        return VolumeDto(**volume.__dict__, status=status)
+        return VolumeDto(**{**volume.__dict__, 'status': status})
 
 
 cinder_client_mock = CinderClientMock()
@@ -45,7 +45,7 @@ class NeutronClientMock(NeutronClient):
 
     @staticmethod
     def update_floating_ip_success(floatingip: Floatingip):
-        return FloatingipDto(
+        return FloatingipDto(**{
             **floatingip.__dict__,
-            status=FloatingipStatus.ACTIVE if floatingip.fk_port_id else FloatingipStatus.DOWN
-        )
\ No newline at end of file
+            'status': FloatingipStatus.ACTIVE if floatingip.fk_port_id else FloatingipStatus.DOWN
+        })
\ No newline at end of file
@@ -68,14 +68,14 @@ class NovaClientMock(NovaClient):
         """
         해당 상태의 server dto를 반환
         """
-        return ServerDto(**server.__dict__, status=status)
+        return ServerDto(**{**server.__dict__, 'status': status})
 
     @staticmethod
     def show_server_details_success_with_active_server(server: Server, volume_id: UUID) -> Tuple[ServerDto, List[UUID]]:
         """
         서버를 active 상태로 반환한다
         """
-        serverDto = ServerDto(**server.__dict__, status=ServerStatus.ACTIVE)
+        serverDto = ServerDto(**{**server.__dict__, 'status': ServerStatus.ACTIVE})
         volume_id_list = [volume_id]
         return serverDto, volume_id_list
 
@@ -84,7 +84,7 @@ class NovaClientMock(NovaClient):
         """
         서버를 active 상태로 반환한다
         """
-        serverDto = ServerDto(**server.__dict__, status=ServerStatus.ERROR)
+        serverDto = ServerDto(**{**server.__dict__, 'status': ServerStatus.ERROR})
         return serverDto, None
 
 
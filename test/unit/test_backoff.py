@@ -0,0 +1,31 @@
+from backend.util.backoff import BackoffPolicy
+
+
+def test_backoff_interval():
+    """
+    간격이 multiplier 배로 증가하고, max_interval을 넘지 않는지 확인
+    """
+    policy = BackoffPolicy(min_interval=1, max_interval=5, multiplier=2, jitter=0)
+
+    assert [policy.get_interval(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_backoff_jitter():
+    """
+    jitter 비율 내에서 간격이 변경되는지 확인
+    """
+    policy = BackoffPolicy(min_interval=10, max_interval=10, jitter=0.2)
+
+    intervals = [policy.get_interval(0) for _ in range(100)]
+
+    assert all(8 <= interval <= 12 for interval in intervals)
+    assert len(set(intervals)) > 1
+
+
+def test_backoff_deadline():
+    """
+    deadline이 없다면 만료되지 않음
+    """
+    assert BackoffPolicy(deadline=10).is_expired(10)
+    assert not BackoffPolicy(deadline=10).is_expired(9.9)
+    assert not BackoffPolicy().is_expired(10 ** 6)
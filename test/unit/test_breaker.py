@@ -0,0 +1,64 @@
+import time
+
+from backend.util.breaker import CircuitBreaker, CircuitState
+
+
+def test_breaker_open():
+    """
+    최근 요청의 실패율이 failure_rate 이상이 되면 요청을 차단하는지 확인
+    """
+    breaker = CircuitBreaker(failure_rate=0.5, minimum_calls=4, window_size=4, open_seconds=60)
+
+    for success in (True, False, True):
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == CircuitState.CLOSED  # 최소 요청 수 미만
+
+    breaker.record(False)
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert 59 < breaker.get_retry_after() <= 60
+
+
+def test_breaker_half_open():
+    """
+    차단 시간이 지나면 half_open_calls개의 요청만 허용하고, 모두 성공하면 차단을 해제하는지 확인
+    하나라도 실패하면 다시 차단
+    """
+    breaker = CircuitBreaker(minimum_calls=1, window_size=1, open_seconds=0.01, half_open_calls=2)
+    breaker.record(False)
+    time.sleep(0.02)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow() and breaker.allow() and not breaker.allow()
+    breaker.record(True)
+    breaker.record(True)
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record(False)
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_breaker_discard():
+    """
+    HALF_OPEN 상태에서 결과를 기록하지 않은(discard) 요청은 허용 횟수에서 제외하는지 확인
+    """
+    # given : HALF_OPEN
+    breaker = CircuitBreaker(minimum_calls=1, window_size=1, open_seconds=0, half_open_calls=1)
+    breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # when
+    breaker.discard()
+
+    # then
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CircuitState.CLOSED
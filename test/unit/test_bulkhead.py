@@ -0,0 +1,49 @@
+import asyncio
+
+from backend.util.bulkhead import Bulkhead, Lane
+
+
+async def test_bulkhead_priority():
+    """
+    대기중인 요청은 lane의 우선순위(INTERACTIVE -> BACKGROUND) 순서로 실행되는지 확인
+    """
+    # given : 실행중인 요청 1개
+    bulkhead = Bulkhead(limit=1, max_queue={Lane.INTERACTIVE: 10, Lane.BACKGROUND: 10})
+    assert await bulkhead.acquire(Lane.BACKGROUND)
+    order = []
+
+    async def run(name: str, lane: Lane):
+        await bulkhead.acquire(lane)
+        order.append(name)
+        bulkhead.release()
+
+    # when : background가 먼저 대기
+    tasks = [asyncio.create_task(run('background', Lane.BACKGROUND)),
+             asyncio.create_task(run('interactive', Lane.INTERACTIVE))]
+    await asyncio.sleep(0)
+    assert bulkhead.get_queue_depth(Lane.BACKGROUND) == bulkhead.get_queue_depth(Lane.INTERACTIVE) == 1
+    bulkhead.release()
+    await asyncio.gather(*tasks)
+
+    # then
+    assert order == ['interactive', 'background']
+    assert bulkhead.active == 0
+
+
+async def test_bulkhead_shed():
+    """
+    lane의 대기열이 가득 찬 경우 대기하지 않고 False를 리턴, 대기 중 취소된 요청은 대기열에서 제거되는지 확인
+    """
+    bulkhead = Bulkhead(limit=1, max_queue={Lane.INTERACTIVE: 1, Lane.BACKGROUND: 0})
+    assert await bulkhead.acquire(Lane.INTERACTIVE)
+    waiting = asyncio.create_task(bulkhead.acquire(Lane.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    assert not await bulkhead.acquire(Lane.INTERACTIVE)
+    assert not await bulkhead.acquire(Lane.BACKGROUND)
+
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert bulkhead.get_queue_depth(Lane.INTERACTIVE) == 0
+    bulkhead.release()
+    assert bulkhead.active == 0
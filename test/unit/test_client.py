@@ -0,0 +1,390 @@
+import asyncio
+import json
+import pytest
+import uuid
+from pytest_mock import MockFixture
+
+from backend.client import nova_client, neutron_client, glance_client, cinder_client
+from backend.client.cache import RequestCache, request_cache_scope
+from backend.client.deadline import request_deadline_scope
+from backend.core.exception import OpenstackUnavailableException
+from backend.core.metrics import metrics
+from backend.model.floatingip import FloatingipStatus
+from backend.schema.server import ServerDto
+from backend.schema.oa_base import OpenstackBaseResponse, OpenstackBaseRequest
+from backend.util.breaker import CircuitBreaker, CircuitState
+from backend.util.bulkhead import Bulkhead, Lane
+from backend.core.stream import stream_json_array
+
+
+def generate_server_response(id: uuid.UUID, status: str = 'ACTIVE') -> dict:
+    return {'id': str(id), 'name': f'server-{id}', 'flavor': {'id': '1'}, 'status': status,
+            'created': '2024-01-01T00:00:00Z', 'updated': '2024-01-01T00:00:00Z'}
+
+
+async def test_list_servers_follow_next_page(mocker: MockFixture):
+    """
+    요청한 id를 모두 찾을 때까지 servers_links의 next 페이지를 따라가는지 확인
+    """
+    # given : 2 페이지로 나누어진 응답
+    first_id, second_id, other_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    first_page = OpenstackBaseResponse(status=200, data={
+        'servers': [generate_server_response(first_id), generate_server_response(other_id)],
+        'servers_links': [{'rel': 'next', 'href': f'http://test/compute/v2.1/servers/detail?marker={other_id}'}]})
+    second_page = OpenstackBaseResponse(status=200, data={'servers': [generate_server_response(second_id)]})
+    request_mock = mocker.patch.object(nova_client, 'request_openstack', side_effect=[first_page, second_page])
+
+    # when
+    serverDtos = await nova_client.list_servers_with_details(token='', ids=[first_id, second_id])
+
+    # then
+    assert [serverDto.server_id for serverDto in serverDtos] == [first_id, second_id]
+    assert request_mock.call_count == 2
+    assert request_mock.call_args.kwargs['request'].url.endswith(f'/servers/detail?marker={other_id}')
+
+
+async def test_list_servers_stop_when_all_found(mocker: MockFixture):
+    """
+    요청한 id를 모두 찾았다면 다음 페이지를 요청하지 않는다
+    """
+    server_id = uuid.uuid4()
+    first_page = OpenstackBaseResponse(status=200, data={
+        'servers': [generate_server_response(server_id)],
+        'servers_links': [{'rel': 'next', 'href': f'http://test/compute/v2.1/servers/detail?marker={server_id}'}]})
+    request_mock = mocker.patch.object(nova_client, 'request_openstack', side_effect=[first_page])
+
+    serverDtos = await nova_client.list_servers_with_details(token='', ids=[server_id])
+
+    assert len(serverDtos) == 1
+    assert request_mock.call_count == 1
+
+
+async def test_list_servers_max_pages(mocker: MockFixture):
+    """
+    요청한 id를 모두 찾지 못해도 max_pages개의 페이지까지만 요청하는지 확인
+    """
+    server_id, missing_id = uuid.uuid4(), uuid.uuid4()
+    page = OpenstackBaseResponse(status=200, data={
+        'servers': [generate_server_response(server_id)],
+        'servers_links': [{'rel': 'next', 'href': f'http://test/compute/v2.1/servers/detail?marker={server_id}'}]})
+    request_mock = mocker.patch.object(nova_client, 'request_openstack', return_value=page)
+
+    serverDtos = await nova_client.list_servers_with_details(token='', ids=[server_id, missing_id], max_pages=2)
+
+    assert [serverDto.server_id for serverDto in serverDtos] == [server_id]
+    assert request_mock.call_count == 2
+
+
+async def test_list_volumes_max_pages(mocker: MockFixture):
+    """
+    요청한 id를 모두 찾지 못해도 max_pages개의 페이지까지만 요청하는지 확인
+    """
+    volume_id, missing_id = uuid.uuid4(), uuid.uuid4()
+    page = OpenstackBaseResponse(status=200, data={
+        'volumes': [{'id': str(volume_id), 'name': 'volume', 'description': '', 'volume_type': 'lvmdriver-1',
+                     'size': 1, 'status': 'available', 'created_at': '2024-01-01T00:00:00.000000',
+                     'updated_at': '2024-01-01T00:00:00.000000'}],
+        'volumes_links': [{'rel': 'next', 'href': f'http://test/volume/v3/volumes/detail?marker={volume_id}'}]})
+    request_mock = mocker.patch.object(cinder_client, 'request_openstack', return_value=page)
+
+    volumeDtos = await cinder_client.list_volumes_with_details(token='', ids=[volume_id, missing_id], max_pages=1)
+
+    assert [volumeDto.volume_id for volumeDto in volumeDtos] == [volume_id]
+    assert request_mock.call_count == 1
+
+
+async def test_list_floating_ips_query(mocker: MockFixture):
+    """
+    id filter와 fields projection을 query string으로 한 번에 요청하는지 확인
+    """
+    # given
+    first_id, second_id = uuid.uuid4(), uuid.uuid4()
+    oa_response = OpenstackBaseResponse(status=200, data={'floatingips': [{'id': str(first_id), 'status': 'ACTIVE'}]})
+    request_mock = mocker.patch.object(neutron_client, 'request_openstack', return_value=oa_response)
+
+    # when
+    floatingipStatusDtos = await neutron_client.list_floating_ips(token='', ids=[first_id, second_id])
+
+    # then
+    assert request_mock.call_count == 1
+    assert request_mock.call_args.kwargs['request'].url.endswith(
+        f'/floatingips?fields=id&fields=status&id={first_id}&id={second_id}')
+    assert [(dto.floatingip_id, dto.status) for dto in floatingipStatusDtos] == [(first_id, FloatingipStatus.ACTIVE)]
+
+
+async def test_request_cache_in_request_scope(mocker: MockFixture):
+    """
+    같은 요청 안에서 같은 GET은 한 번만 보내고, 자원을 변경하는 요청 이후에는 다시 보내는지 확인
+    요청 밖에서는 cache 사용 안함
+    """
+    # given
+    server_id = uuid.uuid4()
+    oa_response = OpenstackBaseResponse(status=200, data={'server': generate_server_response(server_id)})
+    send_mock = mocker.patch.object(nova_client, 'send_request', return_value=oa_response)
+
+    # when : 요청 안
+    with request_cache_scope():
+        await nova_client.show_server_details(id=server_id, token='token')
+        await nova_client.show_server_details(id=server_id, token='token')
+        assert send_mock.call_count == 1
+        # 다른 token은 따로 요청
+        await nova_client.show_server_details(id=server_id, token='other')
+        assert send_mock.call_count == 2
+        # 하위 자원 변경 (볼륨 연결) 이후 서버 정보(volumes_attached)도 다시 요청
+        await nova_client.request_openstack('POST', OpenstackBaseRequest(
+            url=f'{nova_client.COMPONENT_URL}/servers/{server_id}/os-volume_attachments'))
+        await nova_client.show_server_details(id=server_id, token='token')
+        assert send_mock.call_count == 4
+        # 서버 변경(action) 이후 다시 요청
+        await nova_client.request_openstack('POST', OpenstackBaseRequest(
+            url=f'{nova_client.COMPONENT_URL}/servers/{server_id}/action'))
+        await nova_client.show_server_details(id=server_id, token='token')
+        assert send_mock.call_count == 6
+
+    # when : 요청 밖
+    await nova_client.show_server_details(id=server_id, token='token')
+    await nova_client.show_server_details(id=server_id, token='token')
+    assert send_mock.call_count == 8
+
+
+def test_request_cache_invalidate_list():
+    """
+    자원을 변경하면 해당 자원과 상위 목록의 cache가 제거되는지 확인
+    """
+    volume_id, other_id = uuid.uuid4(), uuid.uuid4()
+    root = '/volume/v3/project'
+    cache = RequestCache()
+    for url in (f'{root}/volumes/{volume_id}', f'{root}/volumes/{other_id}', f'{root}/volumes/detail?marker=1'):
+        cache.set('GET', url, '', OpenstackBaseResponse(status=200))
+
+    cache.invalidate(f'{root}/volumes/{volume_id}/action')
+
+    assert cache.get('GET', f'{root}/volumes/{volume_id}', '') is None
+    assert cache.get('GET', f'{root}/volumes/detail?marker=1', '') is None
+    assert cache.get('GET', f'{root}/volumes/{other_id}', '') is not None
+
+
+def test_request_cache_invalidate_parent():
+    """
+    하위 자원을 변경하면(볼륨 연결/해제) 상위 자원(서버)의 cache도 제거되는지 확인
+    """
+    server_id, other_id, volume_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    root = '/compute/v2.1'
+    cache = RequestCache()
+
+    for url in (f'{root}/servers/{server_id}/os-volume_attachments/{volume_id}', f'{root}/servers/{server_id}'):
+        for cached_url in (f'{root}/servers/{server_id}', f'{root}/servers/{other_id}'):
+            cache.set('GET', cached_url, '', OpenstackBaseResponse(status=200))
+
+        cache.invalidate(url)
+
+        assert cache.get('GET', f'{root}/servers/{server_id}', '') is None
+        assert cache.get('GET', f'{root}/servers/{other_id}', '') is not None
+
+
+async def test_single_flight_concurrent_get(mocker: MockFixture):
+    """
+    동시에 진행중인 같은 GET(url, token)은 한 번만 보내고 응답을 공유하는지 확인
+    """
+    # given : 응답이 늦게 오는 openstack
+    server_id = uuid.uuid4()
+    oa_response = OpenstackBaseResponse(status=200, data={'server': generate_server_response(server_id)})
+
+    async def send_request(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return oa_response
+
+    send_mock = mocker.patch.object(nova_client, 'send_request', side_effect=send_request)
+    hits = metrics.get('openstack_singleflight_hits_total', component=nova_client.COMPONENT_URL)
+    misses = metrics.get('openstack_singleflight_misses_total', component=nova_client.COMPONENT_URL)
+
+    # when : 같은 token 3번, 다른 token 1번
+    serverDtos = await asyncio.gather(*[nova_client.show_server_details(id=server_id, token=token)
+                                        for token in ('token', 'token', 'token', 'other')])
+
+    # then
+    assert send_mock.call_count == 2
+    assert {serverDto.server_id for serverDto in serverDtos} == {server_id}
+    assert metrics.get('openstack_singleflight_hits_total', component=nova_client.COMPONENT_URL) == hits + 2
+    assert metrics.get('openstack_singleflight_misses_total', component=nova_client.COMPONENT_URL) == misses + 2
+
+
+async def test_retry_idempotent_request(mocker: MockFixture):
+    """
+    멱등한 GET은 일시적인 오류 응답(Retry-After 포함) 이후 재시도하고, POST는 재시도하지 않는지 확인
+    """
+    # given
+    server_id = uuid.uuid4()
+    unavailable = OpenstackBaseResponse(status=503, headers={'Retry-After': '0'}, data={})
+    oa_response = OpenstackBaseResponse(status=200, data={'server': generate_server_response(server_id)})
+    send_mock = mocker.patch.object(nova_client, 'send_request', side_effect=[unavailable, oa_response])
+    retries = metrics.get('openstack_retries_total', component=nova_client.COMPONENT_URL, method='GET')
+
+    # when
+    serverDto = await nova_client.show_server_details(id=server_id, token='token')
+
+    # then
+    assert serverDto.server_id == server_id
+    assert send_mock.call_count == 2
+    assert metrics.get('openstack_retries_total', component=nova_client.COMPONENT_URL, method='GET') == retries + 1
+
+    # when : POST
+    send_mock = mocker.patch.object(nova_client, 'send_request', return_value=unavailable)
+    oa_response = await nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers'))
+    assert oa_response.status == 503
+    assert send_mock.call_count == 1
+
+
+async def test_request_deadline(mocker: MockFixture):
+    """
+    응답이 없는 경우, 사용자 요청의 deadline이 지나면 더 이상 재시도하지 않고 TimeoutError(504)를 발생시키는지 확인
+    """
+    # given
+    async def send_request(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    mocker.patch.object(nova_client, 'send_request', side_effect=send_request)
+    loop = asyncio.get_running_loop()
+
+    # when
+    start = loop.time()
+    with request_deadline_scope(0.1), pytest.raises(asyncio.TimeoutError):
+        await nova_client.show_server_details(id=uuid.uuid4(), token='token')
+
+    # then
+    assert loop.time() - start < 0.5
+
+
+def test_get_retry_after():
+    assert nova_client.get_retry_after({'retry-after': '2'}) == 2
+    assert nova_client.get_retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 0
+    assert nova_client.get_retry_after({}) is None
+
+
+async def test_circuit_breaker_fast_fail(mocker: MockFixture):
+    """
+    component의 요청이 계속 실패하면, 이후 요청은 보내지 않고 바로 503(Retry-After) 발생시키는지 확인
+    """
+    # given
+    mocker.patch.object(nova_client, 'breaker', CircuitBreaker(minimum_calls=2, window_size=2, open_seconds=60))
+    send_mock = mocker.patch.object(nova_client, 'send_request',
+                                    return_value=OpenstackBaseResponse(status=500, data={}))
+
+    # when : 2번 실패 (POST는 재시도 안함)
+    for _ in range(2):
+        await nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers'))
+
+    # then
+    with pytest.raises(OpenstackUnavailableException) as exc_info:
+        await nova_client.show_server_details(id=uuid.uuid4(), token='token')
+    assert exc_info.value.status == 503
+    assert exc_info.value.headers == {'Retry-After': '60'}
+    assert send_mock.call_count == 2
+
+
+async def test_circuit_breaker_ignore_deadline_and_cancel(mocker: MockFixture):
+    """
+    사용자 요청의 deadline으로 짧아진 timeout, 취소된 요청은 component 장애로 기록하지 않는지 확인
+    """
+    # given
+    mocker.patch.object(nova_client, 'breaker', CircuitBreaker(minimum_calls=1, window_size=1, open_seconds=60))
+
+    async def send_request(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    mocker.patch.object(nova_client, 'send_request', side_effect=send_request)
+
+    # when : deadline 초과
+    with request_deadline_scope(0.05), pytest.raises(asyncio.TimeoutError):
+        await nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers'))
+    # when : 요청 취소
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers')), 0.05)
+
+    # then
+    assert nova_client.breaker.state == CircuitState.CLOSED
+
+
+async def test_bulkhead_shed_load(mocker: MockFixture):
+    """
+    component의 동시 요청 대기열이 가득 찬 경우, 대기하지 않고 503(Retry-After) 발생시키는지 확인
+    """
+    # given : 동시 요청 1개, 대기열 없음
+    mocker.patch.object(nova_client, 'bulkhead', Bulkhead(limit=1, max_queue={Lane.INTERACTIVE: 0, Lane.BACKGROUND: 0}))
+    release = asyncio.Event()
+
+    async def send_request(*args, **kwargs):
+        await release.wait()
+        return OpenstackBaseResponse(status=202)
+
+    mocker.patch.object(nova_client, 'send_request', side_effect=send_request)
+    running = asyncio.create_task(nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers')))
+    await asyncio.sleep(0)
+
+    # when & then
+    with pytest.raises(OpenstackUnavailableException) as exc_info:
+        await nova_client.send_with_retry('POST', OpenstackBaseRequest(url='/servers'))
+    assert exc_info.value.headers == {'Retry-After': '1'}
+    release.set()
+    assert (await running).status == 202
+
+
+def test_response_body_read_only():
+    """
+    deserialize는 파싱된 body를 복사하지 않고 읽으며, body는 수정할 수 없는지 확인
+    """
+    server_id = uuid.uuid4()
+    data = {'servers': [generate_server_response(server_id)]}
+    oa_response = OpenstackBaseResponse.model_construct(status=200, headers=None, data=data)
+
+    serverDtos = ServerDto.deserialize(oa_response, many=True)
+
+    assert [serverDto.server_id for serverDto in serverDtos] == [server_id]
+    assert oa_response.data is data
+    with pytest.raises(TypeError):
+        oa_response.body['servers'] = []
+
+
+def generate_image_response(id: uuid.UUID) -> dict:
+    return {'id': str(id), 'name': f'image-{id}', 'status': 'active', 'disk_format': 'qcow2'}
+
+
+async def test_iter_images_follow_next_page(mocker: MockFixture):
+    """
+    next가 없을 때까지 page_size 단위로 페이지를 따라가며 dto를 yield하는지 확인
+    """
+    # given : 2 페이지로 나누어진 응답
+    image_ids = [uuid.uuid4() for _ in range(3)]
+    first_page = OpenstackBaseResponse(status=200, data={
+        'images': [generate_image_response(image_id) for image_id in image_ids[:2]],
+        'next': f'/v2/images?marker={image_ids[1]}&limit=2'})
+    second_page = OpenstackBaseResponse(status=200, data={'images': [generate_image_response(image_ids[2])]})
+    request_mock = mocker.patch.object(glance_client, 'request_openstack', side_effect=[first_page, second_page])
+
+    # when
+    imageDtos = [imageDto async for imageDto in glance_client.iter_images(token='', page_size=2)]
+
+    # then
+    assert [imageDto.id for imageDto in imageDtos] == image_ids
+    assert request_mock.call_args_list[0].kwargs['request'].url.endswith('/images?limit=2')
+    assert request_mock.call_args_list[1].kwargs['request'].url.endswith(f'/images?limit=2&marker={image_ids[1]}')
+
+
+async def test_stream_json_array(mocker: MockFixture):
+    """
+    flavor를 받는 대로 json 배열로 내보내는지 확인
+    """
+    # given
+    pages = [OpenstackBaseResponse(status=200, data={
+        'flavors': [{'id': '1', 'name': 'small', 'ram': 1024, 'disk': 10, 'vcpus': 1}],
+        'flavors_links': [{'rel': 'next', 'href': 'http://test/compute/v2.1/flavors/detail?marker=1'}]}),
+        OpenstackBaseResponse(status=200, data={
+            'flavors': [{'id': '2', 'name': 'large', 'ram': 4096, 'disk': 40, 'vcpus': 4}]})]
+    mocker.patch.object(nova_client, 'request_openstack', side_effect=pages)
+
+    # when
+    response = await stream_json_array(nova_client.iter_flavors_with_details(token=''))
+    body = b''.join([chunk async for chunk in response.body_iterator])
+
+    # then
+    assert [flavor['id'] for flavor in json.loads(body)] == ['1', '2']
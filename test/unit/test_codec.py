@@ -0,0 +1,28 @@
+import json
+from pytest_mock import MockFixture
+
+from backend.util import codec
+
+
+def test_codec_round_trip():
+    """
+    bytes/문자열 json을 파싱하고, 표준 json과 같은 값으로 직렬화하는지 확인
+    """
+    data = {'server': {'name': '서버', 'networks': [{'uuid': 'id'}], 'min_count': 1, 'description': None}}
+
+    serialized = codec.dumps(data)
+
+    assert isinstance(serialized, str)
+    assert json.loads(serialized) == data
+    assert codec.loads(serialized.encode()) == codec.loads(serialized) == data
+
+
+def test_codec_fallback(mocker: MockFixture):
+    """
+    orjson이 없는 경우 표준 json을 사용하는지 확인
+    """
+    mocker.patch.object(codec, 'orjson', None)
+    data = {'flavors': [{'id': '1', 'ram': 2048}]}
+
+    assert codec.dumps(data) == json.dumps(data)
+    assert codec.loads(json.dumps(data).encode()) == data
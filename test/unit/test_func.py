@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from backend.util.func import gather_with_concurrency
+
+
+async def test_gather_with_concurrency():
+    """
+    최대 limit개까지만 동시에 실행되고, 결과는 입력 순서를 유지하는지 확인
+    """
+    running, max_running = 0, 0
+
+    async def func(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (5 - i % 5))  # 나중 원소가 먼저 끝나도록
+        running -= 1
+        return i * 2
+
+    result = await gather_with_concurrency(func, range(10), limit=3)
+
+    assert result == [i * 2 for i in range(10)]
+    assert max_running == 3
+
+
+async def test_gather_with_concurrency_raise():
+    """
+    실행 중 예외가 발생하면 그대로 전파
+    """
+
+    async def func(i: int) -> int:
+        if i == 1:
+            raise ValueError()
+        return i
+
+    with pytest.raises(ValueError):
+        await gather_with_concurrency(func, range(3), limit=2)
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import delete, inspect, text
+
+from backend.core.config import get_setting
+from backend.core.db import Database
+from backend.core.db import Base
+from backend.core.migration import MIGRATIONS, V3_INDEXES, schema_migrator
+from backend.model import floatingip, server, sync, task, volume  # noqa: F401 (Base.metadata에 table 등록)
+from backend.model.schema_version import SchemaVersion
+
+SETTINGS = get_setting()
+
+
+def test_migration_versions():
+    """
+    migration version이 1부터 1씩 증가하는지 확인
+    """
+    assert [migration.version for migration in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
+    assert schema_migrator.latest_version == len(MIGRATIONS)
+
+
+def test_migration_indexes_match_models():
+    """
+    migration으로 추가하는 index가 model에 정의한 index와 같은지 확인
+    """
+    model_indexes = {(index.table.name, index.name, *[column.name for column in index.columns])
+                     for table in Base.metadata.tables.values() for index in table.indexes
+                     if table.name != 'task'}
+    assert set(V3_INDEXES) == model_indexes
+
+
+async def test_migrate():
+    """
+    적용하지 않은 migration만 실행하여 없는 column, index를 추가하는지 확인
+    * 최신 version이 된 이후에는 check를 통과하고, 다시 migrate해도 적용하는 migration 없음
+    """
+    db_ = Database()
+    db_.init_db(SETTINGS.TEST_DB_URL)
+    try:
+        # given : status column, index가 추가되기 이전의 schema (version 1)
+        await schema_migrator.migrate(db_.engine)
+        async with db_.engine.begin() as conn:
+            await conn.execute(text('DROP INDEX ix_volume_name_deleted_at ON volume'))
+            await conn.execute(text('ALTER TABLE volume DROP COLUMN status_checked_at'))
+            await conn.execute(delete(SchemaVersion).where(SchemaVersion.version > 1))
+        with pytest.raises(RuntimeError):
+            await schema_migrator.check(db_.engine)
+
+        # when
+        applied = await schema_migrator.migrate(db_.engine)
+
+        # then
+        assert applied == [migration.version for migration in MIGRATIONS[1:]]
+        async with db_.engine.connect() as conn:
+            columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns('volume'))
+            indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes('volume'))
+        assert 'status_checked_at' in {column['name'] for column in columns}
+        assert 'ix_volume_name_deleted_at' in {index['name'] for index in indexes}
+        await schema_migrator.check(db_.engine)
+        assert await schema_migrator.migrate(db_.engine) == []
+    finally:
+        await db_.disconnect()
+
+
+async def test_migrate_from_empty_db():
+    """
+    빈 DB에 모든 migration을 적용하면 model과 같은 column, index가 생성되는지 확인
+    """
+    db_ = Database()
+    db_.init_db(SETTINGS.TEST_DB_URL)
+    try:
+        # given
+        async with db_.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+        # when
+        applied = await schema_migrator.migrate(db_.engine)
+
+        # then
+        assert applied == [migration.version for migration in MIGRATIONS]
+
+        def get_schema(sync_conn):
+            inspector = inspect(sync_conn)
+            return {table_name: ({column['name'] for column in inspector.get_columns(table_name)},
+                                 {index['name'] for index in inspector.get_indexes(table_name)})
+                    for table_name in Base.metadata.tables}
+
+        async with db_.engine.connect() as conn:
+            schema = await conn.run_sync(get_schema)
+        for table in Base.metadata.tables.values():
+            columns, indexes = schema[table.name]
+            assert columns == {column.name for column in table.columns}
+            assert {index.name for index in table.indexes} <= indexes
+    finally:
+        await db_.disconnect()
+
@@ -1,15 +1,21 @@
 import pytest
 import random
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 from typing import Optional
 from pydantic import Field, ValidationError
-from sqlalchemy import Uuid, Column, String, DateTime, select, desc
+from sqlalchemy import Uuid, Column, String, DateTime, select, desc, and_, or_
 
 from backend.core.db import Base
 from backend.core.exception import ApiServerException
-from backend.schema.query import PaginationQueryBasic, SortQueryBasic, FilterBasic
+from backend.model.server import Server
+from backend.model.volume import Volume
+from backend.schema.query import (PaginationQueryBasic, SortQueryBasic, FilterBasic, CREATED_AT_FILTER_PATTERN,
+                                  get_filter_plan, encode_cursor)
+from backend.schema.server import ServerQuery
+from backend.schema.volume import VolumeQuery
+from backend.util.constant import ERR_INVALID_CURSOR
 from test.conftest import generate_string
 
 
@@ -33,6 +39,7 @@ class TestModelQuery(PaginationQueryBasic, SortQueryBasic, FilterBasic):
     sort_by: Optional[str] = Field(default=None, pattern=f'^(created_at)$')
     id: Optional[str] = Field(default=None, pattern=f'^(eq|in|not):.+', isFilter=True)
     name: Optional[str] = Field(default=None, pattern=f'^(eq|like):.+', isFilter=True)
+    created_at: Optional[str] = Field(default=None, pattern=CREATED_AT_FILTER_PATTERN, isFilter=True)
 
 
 def test_default_value():
@@ -47,6 +54,7 @@ def test_default_value():
     assert defaultQueryInput.order_by is None
     assert defaultQueryInput.id is None
     assert defaultQueryInput.name is None
+    assert defaultQueryInput.created_at is None
 
 
 def test_pagination_basic():
@@ -256,3 +264,113 @@ def test_composite_query():
     expected_query = expected_query.offset((page - 1) * per_page).limit(per_page)
 
     assert str(actual_query) == str(expected_query)
+
+
+def test_cursor_pagination_query():
+    """
+    cursor mode에서 정렬 기준이 같은 행을 PK 순서로 정렬하고, per_page + 1개를 조회하는지 확인
+    다음 cursor로 조회하면 (정렬 기준, PK)가 마지막 행 이후인 행만 조회
+    """
+    per_page = random.randint(1, 10)
+    queryInput = TestModelQuery(sort_by='created_at', per_page=per_page, cursor='')
+    list_query = queryInput.get_sorted_query(select(TestModel), TestModel)
+
+    actual_query = queryInput.get_paginated_query(list_query, TestModel)
+    expected_query = select(TestModel).order_by(TestModel.created_at).order_by(TestModel.id).limit(per_page + 1)
+
+    assert str(actual_query) == str(expected_query)
+
+    rows = [TestModel(id=uuid.uuid4(), created_at=datetime(2024, 1, 1) + timedelta(days=i)) for i in range(per_page + 1)]
+    assert queryInput.get_paginated_result(rows, TestModel) == rows[:per_page]
+    assert queryInput.next_cursor
+
+    nextQueryInput = TestModelQuery(sort_by='created_at', per_page=per_page, cursor=queryInput.next_cursor)
+    actual_query = nextQueryInput.get_paginated_query(list_query, TestModel)
+    last = rows[per_page - 1]
+    expected_query = list_query.filter(or_(TestModel.created_at > last.created_at,
+                                           and_(TestModel.created_at == last.created_at, TestModel.id > last.id)))
+    expected_query = expected_query.order_by(TestModel.id).limit(per_page + 1)
+
+    assert str(actual_query) == str(expected_query)
+    assert actual_query.compile().params == expected_query.compile().params
+    # 마지막 페이지
+    assert nextQueryInput.get_paginated_result(rows[:per_page], TestModel) == rows[:per_page]
+    assert nextQueryInput.next_cursor is None
+
+
+def test_cursor_pagination_validation():
+    """
+    올바르지 않은 cursor, 정렬 조건이 바뀐 cursor는 400 에러가 발생하는지 확인
+    """
+    queryInput = TestModelQuery(sort_by='created_at', order_by='desc', per_page=1, cursor='')
+    queryInput.get_paginated_result([TestModel(id=uuid.uuid4(), created_at=datetime(2024, 1, 1)),
+                                     TestModel(id=uuid.uuid4(), created_at=datetime(2024, 1, 2))], TestModel)
+
+    for queryInput in (TestModelQuery(cursor='wrong_cursor'),
+                       TestModelQuery(sort_by='created_at', cursor=queryInput.next_cursor)):
+        with pytest.raises(ApiServerException) as exc_info:
+            queryInput.get_paginated_query(select(TestModel), TestModel)
+        assert exc_info.value.status == 400
+
+
+@pytest.mark.parametrize('values', [
+    ['created_at:asc', '2024-01-01T00:00:00', 1],  # 숫자 PK (UUID 아님)
+    ['created_at:asc', {'a': 1}, str(uuid.uuid4())],  # object 정렬 기준 값
+    ['created_at:asc', ['2024-01-01T00:00:00'], str(uuid.uuid4())],  # array 정렬 기준 값
+    ['created_at:asc', 1, str(uuid.uuid4())],  # 문자열이 아닌 datetime 값
+    [1, '2024-01-01T00:00:00', str(uuid.uuid4())],  # 문자열이 아닌 정렬 조건
+    ['created_at:asc', '2024-01-01T00:00:00', None],  # PK 없음
+])
+def test_cursor_pagination_tampered(values: list):
+    """
+    구조는 맞지만 값의 type이 다른(변조된) cursor는 500이 아닌 400 에러가 발생하는지 확인
+    """
+    queryInput = TestModelQuery(sort_by='created_at', cursor=encode_cursor(values))
+
+    with pytest.raises(ApiServerException) as exc_info:
+        queryInput.get_paginated_query(select(TestModel), TestModel)
+    assert exc_info.value.status == 400
+    assert exc_info.value.message == ERR_INVALID_CURSOR
+
+
+def test_filter_query_range():
+    """
+    datetime 필드의 범위 query를 잘 반환하는지 확인 (timezone이 있는 값은 UTC로 변환)
+    """
+    list_query = select(TestModel)
+    # &created_at=gte:2024-01-01T09:00:00+09:00;lt:2024-02-01T00:00:00
+    actual_query = TestModelQuery(created_at='gte:2024-01-01T09:00:00+09:00;lt:2024-02-01T00:00:00') \
+        .get_filtered_query(list_query, TestModel)
+    expected_query = list_query.filter(TestModel.created_at >= datetime(2024, 1, 1),
+                                       TestModel.created_at < datetime(2024, 2, 1))
+
+    assert str(actual_query) == str(expected_query)
+    assert actual_query.compile().params == expected_query.compile().params
+
+    with pytest.raises(ValidationError):
+        # 범위 조건이 아닌 연산자를 이어서 사용하는 경우
+        TestModelQuery(created_at='gte:2024-01-01;eq:2024-02-01')
+    with pytest.raises(ApiServerException):
+        # 올바르지 않은 datetime
+        TestModelQuery(created_at='gt:yesterday').get_filtered_query(list_query, TestModel)
+
+
+def test_filter_query_value_with_colon():
+    """
+    value에 ':'가 포함된 경우 첫번째 ':'로만 연산자와 구분하는지 확인
+    """
+    list_query = select(TestModel)
+    actual_query = TestModelQuery(name='eq:a:b').get_filtered_query(list_query, TestModel)
+    expected_query = list_query.filter(TestModel.name == 'a:b')
+
+    assert str(actual_query) == str(expected_query)
+    assert actual_query.compile().params == expected_query.compile().params
+
+
+def test_filter_plan():
+    """
+    query class별 filter plan을 한 번만 만들고, 모든 filter 필드를 포함하는지 확인
+    """
+    assert get_filter_plan(TestModelQuery, TestModel) is get_filter_plan(TestModelQuery, TestModel)
+    assert [el.name for el in get_filter_plan(ServerQuery, Server)] == ['server_id', 'name', 'created_at']
+    assert [el.name for el in get_filter_plan(VolumeQuery, Volume)] == ['volume_id', 'name', 'created_at']
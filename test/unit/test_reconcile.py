@@ -0,0 +1,108 @@
+import datetime
+import uuid
+import pytest
+from pytest_mock import MockFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.client import nova_client, cinder_client, neutron_client
+from backend.core.config import get_setting
+from backend.model.floatingip import FloatingipStatus
+from backend.model.server import Server, ServerStatus
+from backend.model.sync import SyncTarget
+from backend.model.volume import Volume, VolumeStatus
+from backend.repository.floatingip import FloatingipRepository
+from backend.repository.sync import SyncRepository
+from backend.schema.floatingip import FloatingipDto
+from backend.service.reconcile import ReconcileService, SERVER_COLUMNS, to_db_datetime
+from test.mock.cinder import cinder_client_mock
+from test.mock.nova import nova_client_mock
+
+SETTINGS = get_setting()
+
+
+async def test_reconcile(mocker: MockFixture, test_db_session: AsyncSession, basic_server: Server,
+                         basic_server_with_port: Server, basic_volume: Volume):
+    """
+    전체 자원을 DB에 반영하는지 확인
+    * 이름 변경 반영, openstack에 없는 서버 삭제 처리, 볼륨 연결 반영, 새로운 floatingip 추가 (DB에 없는 포트는 비워둔다)
+    """
+    # given
+    renamed = nova_client_mock.show_server_details_with_status(basic_server, ServerStatus.ACTIVE).model_copy(
+        update={'name': 'reconciled_server'})
+    attached = cinder_client_mock.show_volume_detail_with_status(basic_volume, VolumeStatus.IN_USE).model_copy(
+        update={'fk_server_id': basic_server.server_id})
+    floatingipDto = FloatingipDto(floatingip_id=uuid.uuid4(), ip_address='10.0.0.1',
+                                  fk_project_id=uuid.UUID(SETTINGS.OPENSTACK_PROJECT_ID), fk_port_id=uuid.uuid4(),
+                                  fk_network_id=uuid.UUID(SETTINGS.OPENSTACK_PUBLIC_NETWORK_ID),
+                                  status=FloatingipStatus.DOWN, description='',
+                                  created_at=datetime.datetime(2024, 1, 1), updated_at=datetime.datetime(2024, 1, 1))
+    mocker.patch.object(nova_client, 'list_servers_with_details', return_value=[renamed])
+    mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[attached])
+    mocker.patch.object(neutron_client, 'list_floating_ips_with_details', return_value=[floatingipDto])
+    mocker.patch.object(SETTINGS, 'RECONCILE_MAX_DELETE_RATIO', 1)  # test DB에 남아있는 다른 행도 삭제 처리될 수 있음
+
+    # when
+    results = await ReconcileService(syncRepository=SyncRepository(session=test_db_session)).reconcile(token='')
+
+    # then
+    assert [result.target for result in results] == [SyncTarget.SERVER, SyncTarget.VOLUME, SyncTarget.FLOATINGIP]
+    await test_db_session.refresh(basic_server)
+    await test_db_session.refresh(basic_server_with_port)
+    await test_db_session.refresh(basic_volume)
+    assert basic_server.name == 'reconciled_server' and not basic_server.deleted
+    assert basic_server.status == ServerStatus.ACTIVE and basic_server.status_checked_at is not None
+    assert basic_server_with_port.deleted and basic_server_with_port.status == ServerStatus.DELETED
+    assert basic_volume.fk_server_id == basic_server.server_id
+    floatingip = await FloatingipRepository(session=test_db_session).find_floatingip_by_id(floatingipDto.floatingip_id)
+    assert floatingip.ip_address == '10.0.0.1' and floatingip.fk_port_id is None
+
+
+def test_reconcile_diff():
+    """
+    추가/수정/삭제할 행을 구분하는지 확인
+    * 같은 행은 수정하지 않고, 삭제된 행이 다시 조회되면 복구, 조회를 시작한 뒤 생성된 행은 삭제하지 않음
+    """
+    started_at = datetime.datetime(2024, 1, 1)
+    ids = [uuid.uuid4() for _ in range(6)]
+
+    def row(name: str, created_at: datetime.datetime = datetime.datetime(2023, 1, 1),
+            deleted_at: datetime.datetime = None) -> dict:
+        return {'name': name, 'fk_flavor_id': '1', 'status': ServerStatus.ACTIVE, 'created_at': created_at,
+                'updated_at': created_at, 'deleted_at': deleted_at}
+
+    current = {ids[0]: row('same'), ids[1]: row('renamed'), ids[2]: row('revived'), ids[3]: row('new')}
+    stored = {ids[0]: row('same'), ids[1]: row('name'), ids[2]: row('revived', deleted_at=datetime.datetime(2023, 6, 1)),
+              ids[4]: row('missing'), ids[5]: row('just created', created_at=started_at)}
+
+    created, updated, deleted = ReconcileService.diff(current, stored, SERVER_COLUMNS, started_at)
+
+    assert [el['name'] for el in created] == ['new']
+    assert [el['name'] for el in updated] == ['renamed', 'revived']
+    assert deleted == [ids[4]]
+
+
+def test_reconcile_check_deletions(mocker: MockFixture):
+    """
+    조회 결과가 비었거나, 삭제 처리할 행이 RECONCILE_MAX_DELETE_RATIO를 넘으면 반영하지 않는지 확인
+    """
+    mocker.patch.object(SETTINGS, 'RECONCILE_MAX_DELETE_RATIO', 0.5)
+    ids = [uuid.uuid4() for _ in range(4)]
+    stored = {id: {'deleted_at': None} for id in ids}
+    stored[uuid.uuid4()] = {'deleted_at': datetime.datetime(2023, 1, 1)}
+
+    ReconcileService.check_deletions(SyncTarget.SERVER, {ids[0]: {}, ids[1]: {}}, stored, ids[2:])
+    ReconcileService.check_deletions(SyncTarget.SERVER, {}, {}, [])
+    with pytest.raises(RuntimeError):
+        ReconcileService.check_deletions(SyncTarget.SERVER, {}, stored, ids)
+    with pytest.raises(RuntimeError):
+        ReconcileService.check_deletions(SyncTarget.SERVER, {ids[0]: {}}, stored, ids[1:])
+
+
+def test_to_db_datetime():
+    """
+    DateTime column과 같이 초 단위로 반올림한 timezone 없는 UTC로 변환하는지 확인
+    """
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    assert to_db_datetime(datetime.datetime(2024, 1, 1, 9, 0, 0, 600000, tzinfo=kst)) == \
+           datetime.datetime(2024, 1, 1, 0, 0, 1)
+    assert to_db_datetime(datetime.datetime(2024, 1, 1, 0, 0, 0, 400000)) == datetime.datetime(2024, 1, 1)
@@ -1,8 +1,13 @@
 import httpx
+from sqlalchemy import func, inspect, select
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from backend.model.server import Server
+from backend.repository.base import Explain
 from backend.repository.server import ServerRepository
+from backend.schema.server import ServerQuery
 
 
 async def test_find_by_name(test_client_no_token: httpx.AsyncClient, basic_server: Server,
@@ -23,3 +28,37 @@ async def test_find_deleted_by_name(test_client_no_token: httpx.AsyncClient, del
     serverRepository = ServerRepository(session=test_db_session)
     server = await serverRepository.find_server_by_name(name=deleted_server.name, check_alive=True)
     assert server is None
+
+
+async def test_find_by_id_with_loader(test_client_no_token: httpx.AsyncClient, basic_server_with_root_volume,
+                                      test_db_session: AsyncSession):
+    """
+    loader strategy를 주면 연관된 volumes, floatingip을 함께 조회 (lazy loading x)
+    """
+    server, volume = basic_server_with_root_volume
+    serverRepository = ServerRepository(session=test_db_session)
+    server = await serverRepository.find_server_by_id(id=server.server_id, loader=selectinload)
+    unloaded = inspect(server).unloaded
+    assert 'volumes' not in unloaded and 'floatingip' not in unloaded
+    assert [el.volume_id for el in server.volumes] == [volume.volume_id]
+
+
+async def test_count_by_query(test_client_no_token: httpx.AsyncClient, basic_server: Server,
+                              test_db_session: AsyncSession):
+    """
+    query에 해당하는 행 수를 세는지 확인 (estimate는 optimizer의 예상 행 수)
+    """
+    serverRepository = ServerRepository(session=test_db_session)
+    total = await test_db_session.scalar(select(func.count()).select_from(Server))
+    assert await serverRepository.count_servers_by_query(ServerQuery()) == total
+    assert await serverRepository.count_servers_by_query(ServerQuery(include_total='estimate')) >= 0
+
+
+def test_explain():
+    """
+    EXPLAIN 문이 bind parameter를 유지하는지 확인
+    """
+    query = select(Server.server_id).filter(Server.name == 'server')
+    compiled = Explain(query).compile(dialect=mysql.dialect())
+    assert str(compiled) == f'EXPLAIN {query.compile(dialect=mysql.dialect())}'
+    assert compiled.params == {'name_1': 'server'}
@@ -0,0 +1,292 @@
+import asyncio
+import pytest
+import uuid
+from datetime import datetime
+from pytest_mock import MockFixture
+
+from backend.client import nova_client, cinder_client, neutron_client
+from backend.core.config import get_setting
+from backend.core.exception import OpenstackClientException, OpenstackUnavailableException
+from backend.core.status_cache import server_status_cache
+from backend.model.floatingip import Floatingip, FloatingipStatus
+from backend.model.server import Server, ServerStatus
+from backend.model.volume import Volume, VolumeStatus
+from backend.schema.floatingip import FloatingipStatusDto
+from backend.schema.oa_base import OpenstackBaseResponse
+from backend.schema import response as response_module
+from backend.schema.response import ServerResponse, VolumeResponse, FloatingipResponse
+from backend.util.func import update_model_status
+from test.mock.cinder import cinder_client_mock
+from test.mock.nova import nova_client_mock
+
+SETTINGS = get_setting()
+
+
+def generate_server(name: str) -> Server:
+    return Server(
+        server_id=uuid.uuid4(),
+        name=name,
+        description='',
+        fk_project_id=uuid.UUID(SETTINGS.OPENSTACK_PROJECT_ID),
+        fk_flavor_id='1',
+        fk_network_id=uuid.UUID(SETTINGS.OPENSTACK_PRIVATE_NETWORK_ID),
+        fk_port_id=None,
+        fixed_address=None,
+        created_at=datetime.now().replace(microsecond=0),
+        updated_at=datetime.now().replace(microsecond=0),
+        deleted_at=None,
+    )
+
+
+async def test_server_list_mapper_batched(mocker: MockFixture):
+    """
+    서버 list를 mapping할 때, 한 번의 list 요청으로 모든 서버의 상태를 조회하는지 확인
+    list 결과에서 찾지 못한 서버만 개별 조회하고, openstack에 없는 서버(404)는 DELETED로 간주
+    """
+    # given
+    alive_server, deleted_server = generate_server('alive'), generate_server('deleted')
+    list_mock = mocker.patch.object(nova_client, 'list_servers_with_details', return_value=[
+        nova_client_mock.show_server_details_with_status(alive_server, ServerStatus.ACTIVE)])
+    show_mock = mocker.patch.object(nova_client, 'show_server_details',
+                                    side_effect=OpenstackClientException(OpenstackBaseResponse(status=404)))
+
+    # when
+    response = await ServerResponse.mapper(el=[alive_server, deleted_server], token='')
+
+    # then
+    assert list_mock.call_count == 1
+    assert list_mock.call_args.kwargs['max_pages'] == SETTINGS.RESPONSE_STATUS_LIST_MAX_PAGES
+    assert show_mock.call_count == 1 and show_mock.call_args.kwargs['id'] == deleted_server.server_id
+    assert [el.server_id for el in response] == [alive_server.server_id, deleted_server.server_id]
+    assert [el.status for el in response] == [ServerStatus.ACTIVE, ServerStatus.DELETED]
+
+
+async def test_server_list_mapper_skip_db_deleted(mocker: MockFixture):
+    """
+    DB에서 삭제된 서버는 openstack에 조회하지 않고 DELETED로 응답하는지 확인
+    """
+    # given
+    alive_server, deleted_server = generate_server('alive'), generate_server('deleted')
+    deleted_server.deleted_at = datetime.now()
+    list_mock = mocker.patch.object(nova_client, 'list_servers_with_details', return_value=[
+        nova_client_mock.show_server_details_with_status(alive_server, ServerStatus.ACTIVE)])
+    show_mock = mocker.patch.object(nova_client, 'show_server_details')
+
+    # when
+    response = await ServerResponse.mapper(el=[deleted_server, alive_server], token='')
+
+    # then
+    assert list_mock.call_args.kwargs['ids'] == [alive_server.server_id]
+    assert show_mock.call_count == 0
+    assert [el.status for el in response] == [ServerStatus.DELETED, ServerStatus.ACTIVE]
+
+
+async def test_server_list_mapper_db_freshness(mocker: MockFixture):
+    """
+    freshness=db인 경우, openstack 요청 없이 DB에 기록된 상태를 응답하는지 확인
+    상태를 기록한 적 없는 서버는 UNKNOWN, 삭제된 서버는 DELETED
+    """
+    # given
+    checked_server, unchecked_server, deleted_server = (generate_server('checked'), generate_server('unchecked'),
+                                                        generate_server('deleted'))
+    update_model_status(checked_server, ServerStatus.SHUTOFF)
+    deleted_server.deleted_at = datetime.now()
+    request_mock = mocker.patch.object(nova_client, 'request_openstack')
+
+    # when
+    response = await ServerResponse.mapper(el=[checked_server, unchecked_server, deleted_server], token='',
+                                           freshness='db')
+
+    # then
+    assert request_mock.call_count == 0
+    assert [el.status for el in response] == [ServerStatus.SHUTOFF, ServerStatus.UNKNOWN, ServerStatus.DELETED]
+    assert response[0].status_checked_at == checked_server.status_checked_at
+    assert response[1].status_checked_at is None
+
+
+async def test_server_list_mapper_empty(mocker: MockFixture):
+    """
+    빈 list인 경우 openstack 요청 없이 빈 list 리턴
+    """
+    request_mock = mocker.patch.object(nova_client, 'request_openstack')
+
+    response = await ServerResponse.mapper(el=[], token='')
+
+    assert response == []
+    assert request_mock.call_count == 0
+
+
+def generate_volume(name: str) -> Volume:
+    return Volume(
+        volume_id=uuid.uuid4(),
+        name=name,
+        description='',
+        volume_type=SETTINGS.OPENSTACK_DEFAULT_VOLUME_TYPE,
+        size=1,
+        fk_server_id=None,
+        fk_project_id=uuid.UUID(SETTINGS.OPENSTACK_PROJECT_ID),
+        fk_image_id=None,
+        created_at=datetime.now().replace(microsecond=0),
+        updated_at=datetime.now().replace(microsecond=0),
+        deleted_at=None,
+    )
+
+
+async def test_volume_list_mapper_batched(mocker: MockFixture):
+    """
+    볼륨 list를 mapping할 때, 한 번의 list 요청으로 모든 볼륨의 상태를 조회하는지 확인
+    list 결과에서 찾지 못한 볼륨만 개별 조회하고, openstack에 없는 볼륨(404)은 DELETED로 간주
+    DB에서 삭제된 볼륨은 조회하지 않음
+    """
+    # given
+    alive_volume, deleted_volume, db_deleted_volume = (generate_volume('alive'), generate_volume('deleted'),
+                                                       generate_volume('db deleted'))
+    db_deleted_volume.deleted_at = datetime.now()
+    list_mock = mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[
+        cinder_client_mock.show_volume_detail_with_status(alive_volume, VolumeStatus.AVAILABLE)])
+    show_mock = mocker.patch.object(cinder_client, 'show_volume_detail',
+                                    side_effect=OpenstackClientException(OpenstackBaseResponse(status=404)))
+
+    # when
+    response = await VolumeResponse.mapper(el=[alive_volume, deleted_volume, db_deleted_volume], token='')
+
+    # then
+    assert list_mock.call_count == 1
+    assert list_mock.call_args.kwargs['ids'] == [alive_volume.volume_id, deleted_volume.volume_id]
+    assert list_mock.call_args.kwargs['max_pages'] == SETTINGS.RESPONSE_STATUS_LIST_MAX_PAGES
+    assert show_mock.call_count == 1 and show_mock.call_args.kwargs['id'] == deleted_volume.volume_id
+    assert [el.volume_id for el in response] == [alive_volume.volume_id, deleted_volume.volume_id,
+                                                 db_deleted_volume.volume_id]
+    assert [el.status for el in response] == [VolumeStatus.AVAILABLE, VolumeStatus.DELETED, VolumeStatus.DELETED]
+
+
+def generate_floatingip() -> Floatingip:
+    return Floatingip(
+        floatingip_id=uuid.uuid4(),
+        ip_address='321.321.321.321',
+        fk_project_id=uuid.UUID(SETTINGS.OPENSTACK_PROJECT_ID),
+        fk_port_id=None,
+        fk_network_id=uuid.UUID(SETTINGS.OPENSTACK_PUBLIC_NETWORK_ID),
+        description='',
+        created_at=datetime.now().replace(microsecond=0),
+        updated_at=datetime.now().replace(microsecond=0)
+    )
+
+
+async def test_floatingip_list_mapper_batched(mocker: MockFixture):
+    """
+    floatingip list를 mapping할 때, 한 번의 list 요청으로 모든 floatingip의 상태를 조회하는지 확인
+    openstack에 없는 floatingip은 DELETED로 간주
+    """
+    # given
+    alive_floatingip, deleted_floatingip = generate_floatingip(), generate_floatingip()
+    list_mock = mocker.patch.object(neutron_client, 'list_floating_ips', return_value=[
+        FloatingipStatusDto(floatingip_id=alive_floatingip.floatingip_id, status=FloatingipStatus.DOWN)])
+    show_mock = mocker.patch.object(neutron_client, 'show_floating_ip_details')
+
+    # when
+    response = await FloatingipResponse.mapper(el=[alive_floatingip, deleted_floatingip], token='')
+
+    # then
+    assert list_mock.call_count == 1
+    assert show_mock.call_count == 0
+    assert [el.status for el in response] == [FloatingipStatus.DOWN, FloatingipStatus.DELETED]
+
+
+async def test_server_list_mapper_fallback_unknown(mocker: MockFixture):
+    """
+    list 요청을 처리하지 못한 경우(ex. URI 길이 초과) 서버별로 상태를 조회하고, 실패한 서버는 UNKNOWN으로 간주 (unknown 정책)
+    응답 순서는 유지
+    """
+    # given
+    servers = [generate_server(f'server{i}') for i in range(5)]
+    failed_server = servers[2]
+
+    async def show_server_details(id, token):
+        if id == failed_server.server_id:
+            raise OpenstackClientException(OpenstackBaseResponse(status=500))
+        return nova_client_mock.show_server_details_with_status(
+            next(server for server in servers if server.server_id == id), ServerStatus.ACTIVE)
+
+    mocker.patch.object(response_module.SETTINGS, 'RESPONSE_STATUS_FAILURE_POLICY', 'unknown')
+    mocker.patch.object(nova_client, 'list_servers_with_details',
+                        side_effect=OpenstackClientException(OpenstackBaseResponse(status=414)))
+    show_mock = mocker.patch.object(nova_client, 'show_server_details', side_effect=show_server_details)
+
+    # when
+    response = await ServerResponse.mapper(el=servers, token='')
+
+    # then
+    assert show_mock.call_count == len(servers)
+    assert [el.server_id for el in response] == [server.server_id for server in servers]
+    assert [el.status for el in response] == [ServerStatus.ACTIVE, ServerStatus.ACTIVE, ServerStatus.UNKNOWN,
+                                              ServerStatus.ACTIVE, ServerStatus.ACTIVE]
+
+
+async def test_volume_list_mapper_fallback_raise(mocker: MockFixture):
+    """
+    list 요청을 처리하지 못하고 볼륨별 조회도 실패한 경우 예외 발생 (raise 정책)
+    """
+    # given
+    volumes = [generate_volume('volume1'), generate_volume('volume2')]
+    mocker.patch.object(response_module.SETTINGS, 'RESPONSE_STATUS_FAILURE_POLICY', 'raise')
+    mocker.patch.object(cinder_client, 'list_volumes_with_details',
+                        side_effect=OpenstackClientException(OpenstackBaseResponse(status=400)))
+    mocker.patch.object(cinder_client, 'show_volume_detail',
+                        side_effect=OpenstackClientException(OpenstackBaseResponse(status=500)))
+
+    # when, then
+    with pytest.raises(OpenstackClientException):
+        await VolumeResponse.mapper(el=volumes, token='')
+
+
+@pytest.mark.parametrize('error', [OpenstackClientException(OpenstackBaseResponse(status=503)),
+                                   OpenstackUnavailableException(message='unavailable', retry_after=30),
+                                   asyncio.TimeoutError()])
+async def test_server_list_mapper_no_fallback_on_outage(mocker: MockFixture, error: Exception):
+    """
+    component 장애로 list 요청이 실패한 경우 서버별로 조회하지 않고, 모든 서버를 UNKNOWN으로 간주 (unknown 정책)
+    """
+    # given
+    servers = [generate_server(f'server{i}') for i in range(3)]
+    mocker.patch.object(response_module.SETTINGS, 'RESPONSE_STATUS_FAILURE_POLICY', 'unknown')
+    mocker.patch.object(nova_client, 'list_servers_with_details', side_effect=error)
+    show_mock = mocker.patch.object(nova_client, 'show_server_details')
+
+    # when
+    response = await ServerResponse.mapper(el=servers, token='')
+
+    # then
+    assert show_mock.call_count == 0
+    assert [el.status for el in response] == [ServerStatus.UNKNOWN] * len(servers)
+
+
+async def test_server_status_map_skip_invalidated(mocker: MockFixture):
+    """
+    list 요청 도중 invalidate된(상태를 변경한) 서버의 상태는 cache에 저장하지 않고,
+    응답의 status_checked_at은 상태를 조회한 시간인지 확인
+    """
+    # given
+    changed_server, other_server = generate_server('changed'), generate_server('other')
+
+    async def list_servers_with_details(token, ids, max_pages):
+        server_status_cache.invalidate(changed_server.server_id)
+        return [nova_client_mock.show_server_details_with_status(server, ServerStatus.ACTIVE)
+                for server in (changed_server, other_server)]
+
+    mocker.patch.object(nova_client, 'list_servers_with_details', side_effect=list_servers_with_details)
+    show_mock = mocker.patch.object(nova_client, 'show_server_details', return_value=(
+        nova_client_mock.show_server_details_with_status(changed_server, ServerStatus.SHUTOFF)))
+    started_at = datetime.utcnow()
+
+    # when
+    response = await ServerResponse.mapper(el=[changed_server, other_server], token='')
+    changed = await ServerResponse.mapper(el=changed_server, token='')
+    other = await ServerResponse.mapper(el=other_server, token='')
+
+    # then
+    assert all(el.status_checked_at >= started_at for el in response)
+    assert show_mock.call_count == 1
+    assert changed.status == ServerStatus.SHUTOFF
+    assert other.status == ServerStatus.ACTIVE
+    assert other.status_checked_at == response[1].status_checked_at
@@ -0,0 +1,137 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from pytest_mock import MockFixture
+
+from backend.core.metrics import metrics
+from backend.core.status_cache import CheckedStatus, StatusCache
+
+
+class Loader:
+    """
+    호출 횟수와 token을 기록하고, 호출할 때마다 value를 리턴하는 상태 조회 함수
+    """
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+        self.count = 0
+        self.tokens = []
+
+    async def __call__(self, token: str) -> str:
+        self.count += 1
+        self.tokens.append(token)
+        return self.value
+
+
+async def test_status_cache_hit_and_stale():
+    """
+    ttl 이내에는 저장된 상태를 리턴하고, ttl이 지나면 저장된 상태를 리턴하면서 background에서 갱신하는지 확인
+    stale_ttl까지 지나면 다시 조회
+    """
+    status_cache = StatusCache(name=f'test-{uuid.uuid4()}', ttl=0.05, stale_ttl=0.05, max_size=10)
+    loader = Loader('BUILD')
+
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'BUILD'  # miss
+    loader.value = 'ACTIVE'
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'BUILD'  # hit
+    assert loader.count == 1
+
+    await asyncio.sleep(0.06)
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'BUILD'  # stale (background 갱신)
+    await asyncio.sleep(0)
+    assert loader.count == 2
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'ACTIVE'  # 갱신된 상태 hit
+
+    await asyncio.sleep(0.11)
+    loader.value = 'SHUTOFF'
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'SHUTOFF'  # miss
+    assert loader.count == 3
+
+
+async def test_status_cache_refresh_with_service_token(mocker: MockFixture):
+    """
+    background 갱신은 처음 조회한 사용자의 token이 아닌 서비스 계정의 token으로 조회하는지 확인
+    """
+    status_cache = StatusCache(name=f'test-{uuid.uuid4()}', ttl=0.05, stale_ttl=60, max_size=10)
+    mocker.patch.object(status_cache, 'get_service_token', return_value='service')
+    loader = Loader('ACTIVE')
+
+    await status_cache.get_or_load('id', loader, 'user')  # miss
+    await asyncio.sleep(0.06)
+    await status_cache.get_or_load('id', loader, 'other user')  # stale (background 갱신)
+    await asyncio.sleep(0.01)
+
+    assert loader.tokens == ['user', 'service']
+
+
+async def test_status_cache_invalidate():
+    """
+    invalidate한 항목은 다시 조회하고, invalidate 이전에 시작한 조회 결과는 저장하지 않는지 확인
+    """
+    status_cache = StatusCache(name=f'test-{uuid.uuid4()}', ttl=60, stale_ttl=60, max_size=10)
+    loader = Loader('ACTIVE')
+    await status_cache.get_or_load('id', loader, 'token')
+
+    status_cache.invalidate('id')
+    loader.value = 'SHUTOFF'
+    assert (await status_cache.get_or_load('id', loader, 'token')).status == 'SHUTOFF'
+    assert loader.count == 2
+
+    async def invalidated_loader(token: str) -> str:
+        status_cache.invalidate('other')
+        return 'ACTIVE'
+
+    await status_cache.get_or_load('other', invalidated_loader, 'token')
+    assert (await status_cache.get_or_load('other', loader, 'token')).status == 'SHUTOFF'
+
+
+async def test_status_cache_invalidate_per_key():
+    """
+    다른 key가 invalidate 되어도 조회 결과를 저장하고, 조회 시작 이후 invalidate된 key의 결과만 저장하지 않는지 확인
+    조회한 시간을 함께 저장하여 리턴
+    """
+    status_cache = StatusCache(name=f'test-{uuid.uuid4()}', ttl=60, stale_ttl=60, max_size=10)
+    version = status_cache.get_version()
+    status_cache.invalidate('b')
+    checked_at = datetime.utcnow() - timedelta(seconds=3)
+
+    status_cache.set('a', CheckedStatus('ACTIVE', checked_at), version)
+    status_cache.set('b', CheckedStatus('ACTIVE', checked_at), version)
+
+    loader = Loader('SHUTOFF')
+    assert await status_cache.get_or_load('a', loader, 'token') == CheckedStatus('ACTIVE', checked_at)
+    assert (await status_cache.get_or_load('b', loader, 'token')).status == 'SHUTOFF'
+    assert loader.count == 1
+
+
+async def test_status_cache_lru():
+    """
+    max_size를 넘으면 가장 오래 사용하지 않은 항목부터 제거하는지 확인
+    """
+    status_cache = StatusCache(name=f'test-{uuid.uuid4()}', ttl=60, stale_ttl=60, max_size=2)
+    loader = Loader('ACTIVE')
+    await status_cache.get_or_load('a', loader, 'token')
+    await status_cache.get_or_load('b', loader, 'token')
+    await status_cache.get_or_load('a', loader, 'token')  # b가 가장 오래 사용하지 않은 항목
+    await status_cache.get_or_load('c', loader, 'token')
+
+    assert len(status_cache) == 2
+    await status_cache.get_or_load('a', loader, 'token')
+    assert loader.count == 3
+    await status_cache.get_or_load('b', loader, 'token')
+    assert loader.count == 4
+
+
+async def test_status_cache_hit_ratio():
+    """
+    hit(stale 포함) / 전체 요청 비율을 metrics에 기록하는지 확인
+    """
+    name = f'test-{uuid.uuid4()}'
+    status_cache = StatusCache(name=name, ttl=60, stale_ttl=60, max_size=10)
+    loader = Loader('ACTIVE')
+    for key in ('a', 'a', 'a', 'b'):
+        await status_cache.get_or_load(key, loader, 'token')
+
+    assert metrics.get('status_cache_requests_total', component=name, result='hit') == 2
+    assert metrics.get('status_cache_requests_total', component=name, result='miss') == 2
+    assert metrics.get('status_cache_hit_ratio', component=name) == 0.5
@@ -0,0 +1,51 @@
+import asyncio
+import json
+from typing import AsyncIterator
+import pytest
+from pydantic import BaseModel
+from pytest_mock import MockFixture
+
+from backend.client.deadline import request_deadline_scope, get_remaining
+from backend.core import stream
+
+
+class Item(BaseModel):
+    id: int
+    remaining: float
+
+
+async def test_stream_json_array_deadline_per_item(mocker: MockFixture):
+    """
+    응답을 시작한 뒤에는 요청의 deadline 대신 item(페이지)마다 REQUEST_DEADLINE을 새로 적용하는지 확인
+    """
+    mocker.patch.object(stream.SETTINGS, 'REQUEST_DEADLINE', 10)
+
+    async def items() -> AsyncIterator[Item]:
+        for i in range(3):
+            yield Item(id=i, remaining=get_remaining())
+
+    with request_deadline_scope(0.01):
+        response = await stream.stream_json_array(items())
+    await asyncio.sleep(0.02)  # 요청의 deadline이 지난 뒤 body를 내보냄
+    body = b''.join([chunk async for chunk in response.body_iterator])
+
+    result = json.loads(body)
+    assert [el['id'] for el in result] == [0, 1, 2]
+    assert all(el['remaining'] > 9 for el in result[1:])
+
+
+async def test_stream_json_array_abort_mid_stream():
+    """
+    응답을 시작한 뒤 발생한 오류는 그대로 전파되어, 닫히지 않은 json 배열로 끝나는지 확인
+    """
+    async def items() -> AsyncIterator[Item]:
+        yield Item(id=0, remaining=0)
+        raise RuntimeError('page failed')
+
+    response = await stream.stream_json_array(items())
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+
+    assert b''.join(chunks) == b'[{"id":0,"remaining":0.0}'
@@ -0,0 +1,107 @@
+import datetime
+import uuid
+from pytest_mock import MockFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.client import nova_client, cinder_client
+from backend.model.server import Server, ServerStatus
+from backend.model.sync import SyncTarget
+from backend.model.volume import Volume, VolumeStatus
+from backend.repository.server import ServerRepository
+from backend.repository.sync import SyncRepository
+from backend.repository.volume import VolumeRepository
+from backend.service.sync import SyncService
+from test.mock.cinder import cinder_client_mock
+from test.mock.nova import nova_client_mock
+
+
+def get_sync_service(session: AsyncSession) -> SyncService:
+    return SyncService(serverRepository=ServerRepository(session=session),
+                       volumeRepository=VolumeRepository(session=session),
+                       syncRepository=SyncRepository(session=session))
+
+
+async def test_sync_servers(mocker: MockFixture, test_db_session: AsyncSession, basic_server: Server,
+                            basic_server_with_port: Server):
+    """
+    변경된 서버를 반영하는지 확인
+    * 이름 변경 반영, 외부에서 삭제된 서버 삭제 처리, 외부에서 생성된 서버 추가
+    * 두번째 sync는 high water mark 이후의 변경만 조회
+    """
+    # given : basic_server 이름 변경, basic_server_with_port 삭제, 새로운 서버 생성
+    updated_at = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+    renamed = nova_client_mock.show_server_details_with_status(basic_server, ServerStatus.ACTIVE).model_copy(
+        update={'name': 'renamed_server', 'updated_at': updated_at})
+    deleted = nova_client_mock.show_server_details_with_status(basic_server_with_port, ServerStatus.DELETED)
+    created = renamed.model_copy(update={'server_id': uuid.uuid4(), 'name': 'external_server'})
+    list_mock = mocker.patch.object(nova_client, 'list_servers_with_details', return_value=[renamed, deleted, created])
+    syncService = get_sync_service(test_db_session)
+
+    # when
+    result = await syncService.sync_servers(token='')
+
+    # then
+    assert (result.created, result.updated, result.deleted) == (1, 1, 1)
+    await test_db_session.refresh(basic_server)
+    await test_db_session.refresh(basic_server_with_port)
+    assert basic_server.name == 'renamed_server' and basic_server.status == ServerStatus.ACTIVE
+    assert basic_server_with_port.deleted and basic_server_with_port.status == ServerStatus.DELETED
+    assert (await ServerRepository(session=test_db_session).find_server_by_id(created.server_id)) is not None
+    assert 'changes-since' not in list_mock.call_args.kwargs['filters']
+
+    # when : 변경 없음
+    list_mock = mocker.patch.object(nova_client, 'list_servers_with_details', return_value=[])
+    result = await syncService.sync_servers(token='')
+
+    # then
+    assert result.changed == 0
+    assert list_mock.call_args.kwargs['filters']['changes-since'] == '2030-01-01T00:00:00Z'
+    assert await SyncRepository(session=test_db_session).find_high_water_mark(SyncTarget.SERVER) == \
+           datetime.datetime(2030, 1, 1)
+
+
+async def test_sync_volumes(mocker: MockFixture, test_db_session: AsyncSession, basic_volume: Volume,
+                            basic_server: Server):
+    """
+    볼륨의 서버 연결, 삭제중인 볼륨을 반영하는지 확인 (DB에 없는 서버와의 연결은 비워둔다)
+    """
+    # given
+    attached = cinder_client_mock.show_volume_detail_with_status(basic_volume, VolumeStatus.IN_USE).model_copy(
+        update={'fk_server_id': basic_server.server_id})
+    unknown_server_volume = attached.model_copy(update={'volume_id': uuid.uuid4(), 'fk_server_id': uuid.uuid4()})
+    mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[attached, unknown_server_volume])
+    syncService = get_sync_service(test_db_session)
+
+    # when
+    result = await syncService.sync_volumes(token='')
+
+    # then
+    assert (result.created, result.updated, result.deleted) == (1, 1, 0)
+    await test_db_session.refresh(basic_volume)
+    assert basic_volume.fk_server_id == basic_server.server_id
+    new_volume = await VolumeRepository(session=test_db_session).find_volume_by_id(unknown_server_volume.volume_id)
+    assert new_volume.fk_server_id is None
+
+    # when : 외부에서 삭제
+    deleting = attached.model_copy(update={'status': VolumeStatus.DELETING})
+    mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[deleting])
+    result = await syncService.sync_volumes(token='')
+
+    # then
+    assert result.deleted == 1
+    await test_db_session.refresh(basic_volume)
+    assert basic_volume.deleted
+
+
+def test_sync_high_water_mark():
+    """
+    조회한 자원 중 가장 최근의 수정시간(timezone 없는 UTC)을 high water mark로 사용하는지 확인
+    """
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    dtos = [nova_client_mock.show_server_details_success(uuid.uuid4(), {'name': 'a', 'flavor_id': '1'})[0]
+            .model_copy(update={'updated_at': datetime.datetime(2024, 1, 1, 9, tzinfo=kst)}),
+            nova_client_mock.show_server_details_success(uuid.uuid4(), {'name': 'b', 'flavor_id': '1'})[0]
+            .model_copy(update={'updated_at': datetime.datetime(2023, 12, 31)})]
+
+    assert SyncService.get_high_water_mark(None, dtos) == datetime.datetime(2024, 1, 1)
+    assert SyncService.get_high_water_mark(datetime.datetime(2025, 1, 1), dtos) == datetime.datetime(2025, 1, 1)
@@ -8,17 +8,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.client import nova_client as nova_client_from_server, cinder_client as cinder_client_from_server
 from backend.model.server import Server
+from backend.model.task import TaskType, TaskStatus
 from backend.model.volume import VolumeStatus, Volume
 from backend.repository.server import ServerRepository
+from backend.repository.task import TaskRepository
 from backend.repository.volume import VolumeRepository
 from backend.schema.server import ServerNetInterfaceDto
 from backend.schema.volume import VolumeDto
 from backend.service.server import ServerService
+from backend.service.task import TASK_HANDLERS, task_worker_pool
 from backend.service.volume import VolumeService
+from backend.util.backoff import BackoffPolicy
 from test.api.test_server import SETTINGS
 from test.mock.cinder import cinder_client_mock
 from test.mock.nova import nova_client_mock
 
+IMMEDIATE_POLICY = BackoffPolicy(min_interval=0, jitter=0, deadline=0)  # 바로 한 번만 조회
+
 
 @pytest.mark.asyncio
 async def test_task_server_volume_created(test_client_no_token: httpx.AsyncClient, mocker: MockFixture,
@@ -37,6 +43,7 @@ async def test_task_server_volume_created(test_client_no_token: httpx.AsyncClien
     # given [MOCK] show server & volume details : 서버 생성 & 볼륨 연결 완료
     curServerDto, volume_id_list = nova_client_mock.show_server_details_success_with_active_server(cur_server,
                                                                                                    new_volume_id)
+    mocker.patch.object(nova_client_from_server, 'list_servers_with_details', return_value=[curServerDto])
     mocker.patch.object(nova_client_from_server, 'show_server_details_with_volume_ids',
                         return_value=(curServerDto, volume_id_list))
     # given [MOCK] show port interface : 네트워크 연결 완료
@@ -55,15 +62,16 @@ async def test_task_server_volume_created(test_client_no_token: httpx.AsyncClien
     mocker.patch.object(cinder_client_from_server, 'update_a_volume', return_value=volume_updated)
 
     # when
-    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='',
+                                                   policy=IMMEDIATE_POLICY)
     # then check volume
     actual_volume = await test_db_session.scalar(select(Volume).filter(Volume.volume_id == new_volume_id))
     assert isinstance(actual_volume, Volume)
     actual_volume_dict = actual_volume.__dict__
-    expected_volume_dict = Volume(**volume_updated.model_dump(exclude={'status'})).__dict__
+    expected_volume_dict = Volume(**volume_updated.model_dump()).__dict__
     actual_volume_dict.pop('_sa_instance_state')  # db session instance값 제거한 모든 필드 비교
     expected_volume_dict.pop('_sa_instance_state')
+    assert actual_volume_dict.pop('status_checked_at') is not None
     assert actual_volume_dict == expected_volume_dict
 
 
@@ -82,12 +90,13 @@ async def test_task_volume_not_created(test_client_no_token: httpx.AsyncClient,
                                    volumeRepository=VolumeRepository(session=test_db_session))
     # given [MOCK] show server & volume details : 서버 생성 완료 & 볼륨 생성 실패
     curServerDto, volume_id_list = nova_client_mock.show_server_details_fail_with_error_server(cur_server)
+    mocker.patch.object(nova_client_from_server, 'list_servers_with_details', return_value=[curServerDto])
     mocker.patch.object(nova_client_from_server, 'show_server_details_with_volume_ids',
                         return_value=(curServerDto, volume_id_list))
 
     # when
-    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='',
+                                                   policy=IMMEDIATE_POLICY)
 
     # then check root volume is not created
     volumes = await basic_server.awaitable_attrs.volumes
@@ -111,6 +120,7 @@ async def test_task_volume_update_failed(test_client_no_token: httpx.AsyncClient
     # given [MOCK] show server & volume details : 서버 생성 & 볼륨 연결 완료
     curServerDto, volume_id_list = nova_client_mock.show_server_details_success_with_active_server(cur_server,
                                                                                                    new_volume_id)
+    mocker.patch.object(nova_client_from_server, 'list_servers_with_details', return_value=[curServerDto])
     mocker.patch.object(nova_client_from_server, 'show_server_details_with_volume_ids',
                         return_value=(curServerDto, volume_id_list))
     # given [MOCK] show port interface : 네트워크 연결 완료
@@ -126,8 +136,8 @@ async def test_task_volume_update_failed(test_client_no_token: httpx.AsyncClient
     mocker.patch.object(cinder_client_from_server, 'update_a_volume',
                         callable=cinder_client_mock.update_a_volume_failed)  # 볼륨 이름 변경시 오류 발생 (500)
     # when
-    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_create_server(cur_server, volume_name=new_volume_name, token='',
+                                                   policy=IMMEDIATE_POLICY)
 
     # then 서버와 연결된 볼륨 존재
     volumes = await cur_server.awaitable_attrs.volumes
@@ -137,7 +147,8 @@ async def test_task_volume_update_failed(test_client_no_token: httpx.AsyncClient
     # then 볼륨의 이름은 변경되지 않은 상태
     actual_db_volume = root_volume.__dict__
     actual_db_volume.pop('_sa_instance_state')
-    expected_volume = volume_created.model_dump(exclude={'status'})
+    assert actual_db_volume.pop('status_checked_at') is not None
+    expected_volume = volume_created.model_dump()
     assert actual_db_volume == expected_volume
 
 
@@ -155,11 +166,11 @@ async def test_task_volume_extend_success(test_client_no_token: httpx.AsyncClien
     # given volume service
     volume_service = VolumeService(volumeRepository=VolumeRepository(session=test_db_session))
     # given [MOCK] cinder 볼륨 정보 확인 (상태 AVAILABLE & 볼륨 용량 증가 완료)
-    mocker.patch('backend.service.volume.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.AVAILABLE))
+    mocker.patch('backend.service.volume.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.AVAILABLE)])
 
     # when
-    await volume_service._task_after_extend_volume(volume=cur_volume, token='', interval_time=0, polling_limit=1)
+    await volume_service._task_after_extend_volume(volume=cur_volume, token='', policy=IMMEDIATE_POLICY)
 
     # then check db
     actual_volume = await test_db_session.scalar(select(Volume).filter(Volume.volume_id == cur_volume.volume_id))
@@ -177,12 +188,12 @@ async def test_task_volume_extend_fail(test_client_no_token: httpx.AsyncClient,
     # given volume service
     volume_service = VolumeService(volumeRepository=VolumeRepository(session=test_db_session))
     # given [MOCK] cinder 볼륨 정보 확인 (상태 error_extending & 볼륨 용량 증가 실패)
-    mocker.patch('backend.service.volume.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume,
-                                                                                VolumeStatus.ERROR_EXTENDING))
+    mocker.patch('backend.service.volume.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume,
+                                                                                VolumeStatus.ERROR_EXTENDING)])
 
     # when
-    await volume_service._task_after_extend_volume(volume=cur_volume, token='', interval_time=0, polling_limit=1)
+    await volume_service._task_after_extend_volume(volume=cur_volume, token='', policy=IMMEDIATE_POLICY)
 
     # then check db
     actual_volume = await test_db_session.scalar(select(Volume).filter(Volume.volume_id == cur_volume.volume_id))
@@ -203,12 +214,12 @@ async def test_task_volume_attach_success(test_client_no_token: httpx.AsyncClien
     server_service = ServerService(volumeRepository=VolumeRepository(session=test_db_session),
                                    serverRepository=ServerRepository(session=test_db_session))
     # given [MOCK] CINDER : 볼륨 상태 IN_USE
-    mocker.patch('backend.service.server.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.IN_USE))
+    mocker.patch('backend.service.server.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.IN_USE)])
 
     # when
-    await server_service._task_after_attach_volume(server=cur_server, volume=cur_volume, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_attach_volume(server=cur_server, volume=cur_volume, token='',
+                                                   policy=IMMEDIATE_POLICY)
     # then
     assert cur_volume.fk_server_id == cur_server.server_id
     assert cur_volume.is_root_volume == False
@@ -228,12 +239,12 @@ async def test_task_volume_attach_error(test_client_no_token: httpx.AsyncClient,
     server_service = ServerService(volumeRepository=VolumeRepository(session=test_db_session),
                                    serverRepository=ServerRepository(session=test_db_session))
     # given [MOCK] CINDER : 볼륨 상태 ERROR
-    mocker.patch('backend.service.server.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.ERROR))
+    mocker.patch('backend.service.server.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.ERROR)])
 
     # when
-    await server_service._task_after_attach_volume(server=cur_server, volume=cur_volume, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_attach_volume(server=cur_server, volume=cur_volume, token='',
+                                                   policy=IMMEDIATE_POLICY)
     # then
     assert cur_volume.fk_server_id is None
 
@@ -257,12 +268,11 @@ async def test_task_volume_detach_success(test_client_no_token: httpx.AsyncClien
                                    serverRepository=ServerRepository(session=test_db_session))
 
     # given [MOCK] CINDER: 볼륨 상태 AVAILABLE
-    mocker.patch('backend.service.server.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.AVAILABLE))
+    mocker.patch('backend.service.server.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.AVAILABLE)])
 
     # when
-    await server_service._task_after_detach_volume(volume=cur_volume, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_detach_volume(volume=cur_volume, token='', policy=IMMEDIATE_POLICY)
 
     # then
     assert cur_volume.fk_server_id is None
@@ -287,12 +297,100 @@ async def test_task_volume_detach_error(test_client_no_token: httpx.AsyncClient,
                                    serverRepository=ServerRepository(session=test_db_session))
 
     # given [MOCK] CINDER: 볼륨 상태 ERROR
-    mocker.patch('backend.service.server.cinder_client.show_volume_detail',
-                 return_value=cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.ERROR))
+    mocker.patch('backend.service.server.cinder_client.list_volumes_with_details',
+                 return_value=[cinder_client_mock.show_volume_detail_with_status(cur_volume, VolumeStatus.ERROR)])
 
     # when
-    await server_service._task_after_detach_volume(volume=cur_volume, token='', interval_time=0,
-                                                   polling_limit=1)
+    await server_service._task_after_detach_volume(volume=cur_volume, token='', policy=IMMEDIATE_POLICY)
 
     # then
     assert cur_volume.fk_server_id == all_connected_server.server_id
+
+
+async def test_task_queue_claim_and_retry(test_client_no_token: httpx.AsyncClient, mocker: MockFixture,
+                                          test_db_session: AsyncSession):
+    """
+    test task queue
+    1. 저장된 task를 점유하여 실행하고, 실패시 backoff 이후 재시도하도록 저장
+    """
+    # given : 가장 먼저 실행될 task
+    taskRepository = TaskRepository(session=test_db_session)
+    task = await taskRepository.enqueue_task(TaskType.VOLUME_AFTER_EXTEND, payload={'volume_id': str(uuid.uuid4())},
+                                             run_at=datetime.datetime(2000, 1, 1))
+    await taskRepository.commit()
+    # given [MOCK] 실행 실패
+    mocker.patch.dict(TASK_HANDLERS, {TaskType.VOLUME_AFTER_EXTEND: mocker.AsyncMock(side_effect=RuntimeError())})
+    mocker.patch.object(task_worker_pool, 'get_service_token', return_value='')
+
+    # when
+    claimed_tasks = await taskRepository.claim_tasks(limit=1, lease_seconds=60)
+    await task_worker_pool.execute(taskRepository, claimed_tasks[0])
+
+    # then : 재시도 대기
+    assert claimed_tasks[0].task_id == task.task_id
+    await test_db_session.refresh(task)
+    assert task.status == TaskStatus.PENDING
+    assert task.attempts == 1
+    assert task.run_at > datetime.datetime.utcnow()
+    assert 'RuntimeError' in task.last_error
+
+
+async def test_task_queue_resume_expired_lease(test_client_no_token: httpx.AsyncClient, mocker: MockFixture,
+                                               test_db_session: AsyncSession):
+    """
+    test task queue
+    2. 실행 도중 worker가 종료된 task(점유 시간 만료)는 다시 점유하여 완료
+    """
+    # given : 점유 시간이 지난 RUNNING task
+    taskRepository = TaskRepository(session=test_db_session)
+    task = await taskRepository.enqueue_task(TaskType.SERVER_AFTER_DETACH_VOLUME,
+                                             payload={'volume_id': str(uuid.uuid4())},
+                                             run_at=datetime.datetime(2000, 1, 1))
+    task.status, task.attempts = TaskStatus.RUNNING, 1
+    task.locked_until = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+    await taskRepository.commit()
+    handler = mocker.AsyncMock(return_value=None)
+    mocker.patch.dict(TASK_HANDLERS, {TaskType.SERVER_AFTER_DETACH_VOLUME: handler})
+    mocker.patch.object(task_worker_pool, 'get_service_token', return_value='')
+
+    # when
+    claimed_tasks = await taskRepository.claim_tasks(limit=1, lease_seconds=60)
+    await task_worker_pool.execute(taskRepository, claimed_tasks[0])
+
+    # then
+    assert claimed_tasks[0].task_id == task.task_id
+    assert handler.call_count == 1
+    await test_db_session.refresh(task)
+    assert task.status == TaskStatus.DONE
+    assert task.attempts == 2
+
+
+async def test_task_queue_ignore_result_after_lost_claim(test_client_no_token: httpx.AsyncClient, mocker: MockFixture,
+                                                         test_db_session: AsyncSession):
+    """
+    test task queue
+    3. 실행 도중 점유 시간이 지나 다른 worker가 다시 점유한 task는 이전 worker가 연장/완료 처리하지 않음
+    """
+    # given : 점유한 task
+    taskRepository = TaskRepository(session=test_db_session)
+    task = await taskRepository.enqueue_task(TaskType.VOLUME_AFTER_EXTEND, payload={'volume_id': str(uuid.uuid4())},
+                                             run_at=datetime.datetime(2000, 1, 1))
+    await taskRepository.commit()
+    claimed_task = (await taskRepository.claim_tasks(limit=1, lease_seconds=60))[0]
+    locked_by = claimed_task.locked_by
+    assert await taskRepository.renew_lease(task.task_id, locked_by, lease_seconds=120)
+
+    # given : 다른 worker가 다시 점유 (claim token 변경)
+    claimed_task.locked_by = uuid.uuid4().hex
+    await taskRepository.commit()
+
+    # when
+    renewed = await taskRepository.renew_lease(task.task_id, locked_by, lease_seconds=120)
+    completed = await taskRepository.complete_task(claimed_task, locked_by)
+
+    # then
+    assert not renewed
+    assert not completed
+    await test_db_session.refresh(task)
+    assert task.status == TaskStatus.RUNNING
+    assert task.locked_by != locked_by
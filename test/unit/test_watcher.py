@@ -0,0 +1,126 @@
+import asyncio
+
+from pytest_mock import MockFixture
+
+from backend.client import cinder_client
+from backend.core.exception import OpenstackClientException
+from backend.core.watcher import StatusWatcher, WatchComponent
+from backend.model.volume import VolumeStatus
+from backend.schema.oa_base import OpenstackBaseResponse
+from backend.util.backoff import BackoffPolicy
+from test.mock.cinder import cinder_client_mock
+from test.unit.test_response import generate_volume
+
+IMMEDIATE_POLICY = BackoffPolicy(min_interval=0, jitter=0, deadline=0)  # 바로 한 번만 조회
+
+
+async def test_watcher_batched(mocker: MockFixture):
+    """
+    같은 시점에 조회할 볼륨들은 한 페이지의 list 요청으로 조회하는지 확인
+    완료/실패 상태의 dto를 리턴하고, 첫 페이지에 없는 볼륨은 개별 조회하여 openstack에 없다면(404) None
+    """
+    # given
+    attached_volume, error_volume, deleted_volume = (generate_volume('attached'), generate_volume('error'),
+                                                     generate_volume('deleted'))
+    list_mock = mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[
+        cinder_client_mock.show_volume_detail_with_status(attached_volume, VolumeStatus.IN_USE),
+        cinder_client_mock.show_volume_detail_with_status(error_volume, VolumeStatus.ERROR)])
+    show_mock = mocker.patch.object(cinder_client, 'show_volume_detail',
+                                    side_effect=OpenstackClientException(OpenstackBaseResponse(status=404)))
+    watcher = StatusWatcher()
+
+    # when
+    futures = [watcher.register(WatchComponent.VOLUME, id=volume.volume_id,
+                                target_statuses=[VolumeStatus.IN_USE], failure_statuses=[VolumeStatus.ERROR],
+                                policy=IMMEDIATE_POLICY) for volume in (attached_volume, error_volume, deleted_volume)]
+    results = await asyncio.gather(*futures)
+    await watcher.stop()
+
+    # then
+    assert list_mock.call_count == 1 and list_mock.call_args.kwargs['max_pages'] == 1
+    assert show_mock.call_count == 1 and show_mock.call_args.kwargs['id'] == deleted_volume.volume_id
+    assert [el.status if el else None for el in results] == [VolumeStatus.IN_USE, VolumeStatus.ERROR, None]
+
+
+async def test_watcher_deadline(mocker: MockFixture):
+    """
+    deadline이 지나도록 완료되지 않으면 None 리턴, 완료시 callback 호출
+    """
+    # given
+    volume = generate_volume('extending')
+    list_mock = mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[
+        cinder_client_mock.show_volume_detail_with_status(volume, VolumeStatus.EXTENDING)])
+    callback_results = []
+
+    async def callback(result):
+        callback_results.append(result)
+
+    watcher = StatusWatcher()
+
+    # when
+    future = watcher.register(WatchComponent.VOLUME, id=volume.volume_id,
+                              target_statuses=[VolumeStatus.AVAILABLE], callback=callback,
+                              policy=BackoffPolicy(min_interval=0.05, max_interval=0.05, jitter=0, deadline=0.125))
+    result = await future
+    await asyncio.sleep(0)  # callback 실행
+    await watcher.stop()
+
+    # then
+    assert result is None
+    assert list_mock.call_count == 3  # 0.05, 0.1, 0.15초에 조회
+    assert callback_results == [None]
+
+
+async def test_watcher_rate_limit(mocker: MockFixture):
+    """
+    조회할 시점이 서로 다른 경우, 초당 list 요청 수를 넘지 않는지 확인
+    """
+    # given
+    volumes = [generate_volume(f'volume{i}') for i in range(4)]
+    mocker.patch.object(cinder_client, 'list_volumes_with_details', side_effect=lambda token, ids, max_pages: [
+        cinder_client_mock.show_volume_detail_with_status(volume, VolumeStatus.AVAILABLE) for volume in volumes
+        if volume.volume_id in ids])
+    watcher = StatusWatcher()
+    watcher.start()
+    watcher.limiter.rate, watcher.limiter.burst = 20, 1
+    loop = asyncio.get_running_loop()
+
+    # when : 순서대로 등록 -> 4번의 list 요청
+    start = loop.time()
+    for volume in volumes:
+        await watcher.watch(WatchComponent.VOLUME, id=volume.volume_id, target_statuses=[VolumeStatus.AVAILABLE],
+                            policy=IMMEDIATE_POLICY)
+    elapsed = loop.time() - start
+    await watcher.stop()
+
+    # then : 첫 요청 이후 3번은 1/20초씩 대기
+    assert elapsed >= 3 / 20 - 0.01
+
+
+async def test_watcher_show_missing_rate_limit(mocker: MockFixture):
+    """
+    첫 페이지에서 찾지 못한 자원의 개별 조회도 요청마다 limiter를 거치는지 확인
+    """
+    # given
+    volumes = [generate_volume(f'volume{i}') for i in range(3)]
+    mocker.patch.object(cinder_client, 'list_volumes_with_details', return_value=[])
+    show_mock = mocker.patch.object(cinder_client, 'show_volume_detail', side_effect=lambda id, token: (
+        cinder_client_mock.show_volume_detail_with_status(
+            next(volume for volume in volumes if volume.volume_id == id), VolumeStatus.AVAILABLE)))
+    watcher = StatusWatcher()
+    watcher.start()
+    watcher.limiter.rate, watcher.limiter.burst = 20, 1
+    loop = asyncio.get_running_loop()
+
+    # when : list 1번 + 개별 조회 3번
+    start = loop.time()
+    results = await asyncio.gather(*[watcher.register(WatchComponent.VOLUME, id=volume.volume_id,
+                                                      target_statuses=[VolumeStatus.AVAILABLE],
+                                                      policy=IMMEDIATE_POLICY) for volume in volumes])
+    elapsed = loop.time() - start
+    await watcher.stop()
+
+    # then
+    assert show_mock.call_count == 3
+    assert [el.status for el in results] == [VolumeStatus.AVAILABLE] * 3
+    assert elapsed >= 3 / 20 - 0.01